@@ -1,12 +1,17 @@
 from .utils.API_Request_Async import request_async as request
+from .utils.Batch_Async import get_batch_loader
+from .utils.Bulk_Async import fetch_many as _fetch_many, request_chunked_async
+from ModrinthAPI.utils.Chunking import merge_in_order
+from ModrinthAPI.utils.Models import Project, as_model, decode_as, returns
+from ModrinthAPI.utils.Result_Cache import cached, mark_incomplete
 
 import json
-import asyncio
 
 api_version = 'v2'
 base_url = f'https://api.modrinth.com/{api_version}'
 
 
+@cached('projects.search')
 async def search(query: str, limit: int = 5, offset: int = 0, facets: list = None):
     """
         The function searches for data based on a query and returns a list of results.
@@ -49,7 +54,7 @@ async def search(query: str, limit: int = 5, offset: int = 0, facets: list = Non
         'query': query,
         'limit': limit,
         'offset': offset,
-        'facets': json.dumps(facets) if facets is not None else [],
+        'facets': json.dumps(facets) if facets is not None else None,
     }
 
     # make request
@@ -61,6 +66,91 @@ async def search(query: str, limit: int = 5, offset: int = 0, facets: list = Non
     return response
 
 
+async def search_all(query: str = '', facets: list = None, index: str = None, page_size: int = 100,
+                     max_results: int = None, concurrency: int = 4, ordered: bool = True):
+    """
+        The function walks every result of a search query. After the first page reports `total_hits`, the
+        remaining pages are fetched concurrently, with at most `concurrency` pages in flight.
+
+        ---
+
+        ### ---Parameters---
+
+        :param query: The search query string, defaults to ""
+        :type query: str (optional)
+
+        :param facets: Facets are filters that can be applied to a search query to narrow down the results
+        based on specific criteria, defaults to None
+        :type facets: list (optional)
+
+        :param index: The sorting method of the results, e.g. "relevance", "downloads" or "newest". Defaults
+        to the API's default
+        :type index: str (optional)
+
+        :param page_size: The number of results fetched per request, at most 100, defaults to 100
+        :type page_size: int (optional)
+
+        :param max_results: The maximum number of results to return. If None, every result is returned,
+        defaults to None
+        :type max_results: int (optional)
+
+        :param concurrency: The maximum number of pages fetched at once, defaults to 4
+        :type concurrency: int (optional)
+
+        :param ordered: If True, results are yielded in search order. If False, each page is yielded as soon
+        as it arrives, defaults to True
+        :type ordered: bool (optional)
+
+        :return: An async iterator of results, each represented as a dictionary of the project's search data.
+    """
+
+    # set API endpoint
+    api_search_url = f'{base_url}/search'
+
+    # the API returns at most 100 results per page
+    page_size = min(max(page_size, 1), 100)
+
+    async def fetch_page(offset):
+        limit = page_size
+        if max_results is not None:
+            limit = min(limit, max_results - offset)
+        params = {
+            'query': query,
+            'limit': limit,
+            'offset': offset,
+            'facets': json.dumps(facets) if facets is not None else None,
+            'index': index,
+        }
+        return await request(api_search_url, params=params)
+
+    # the first page tells how many results there are
+    response, status_code = await fetch_page(0)
+    if status_code != 200:
+        print(f'Error: {response}')
+        return
+
+    hits = response.get('hits', [])
+    for hit in hits:
+        yield hit
+    if not hits:
+        return
+
+    total = response.get('total_hits', 0)
+    if max_results is not None:
+        total = min(total, max_results)
+
+    # fan the remaining pages out
+    offsets = range(len(hits), total, page_size)
+    async for page in _fetch_many(fetch_page, offsets, concurrency=concurrency, ordered=ordered):
+        if not page.ok:
+            print(f'Error: {page.error}')
+            continue
+        for hit in page.data.get('hits', []):
+            yield hit
+
+
+@cached('projects.get')
+@returns(Project)
 async def get(id: str = None, slug: str = None):
     """
         The function retrieves a project by its ID or slug and returns a dictionary of the project's data.
@@ -86,8 +176,12 @@ async def get(id: str = None, slug: str = None):
     if id is None and slug is None:
         return "Error: No user_id or slug provided"
 
-    # make request
-    response, status_code = await request(api_project_url)
+    # make request, batched with other lookups when a batch loader is set
+    loader = get_batch_loader()
+    if loader is not None:
+        response, status_code = await loader.load(f'{base_url}/projects', id or slug, keys=('id', 'slug'))
+    else:
+        response, status_code = await request(api_project_url)
 
     if status_code != 200:
         print(f'Error: {response}')
@@ -122,6 +216,7 @@ async def validate(id: str):
     return response, status_code
 
 
+@cached('projects.dependencies')
 async def dependencies(id: str):
     """
         The function retrieves a list of dependencies for a project with the given ID and returns a list of
@@ -156,45 +251,55 @@ async def dependencies(id: str):
         return response['dependencies']
 
 
-async def get_multiple(ids: list):
+@cached('projects.get_multiple')
+@returns(Project)
+async def get_multiple(ids: list, concurrency: int = 8, return_missing: bool = False):
     """
-        The function retrieves multiple projects by their IDs and returns a list of dictionaries containing the
-        projects' data.
+        The function retrieves multiple projects by their IDs or slugs and returns a list of dictionaries containing
+        the projects' data. Large ID lists are split into URL-length-safe chunks which are requested
+        concurrently.
 
         ---
 
         ### ---Parameters---
 
-        :param ids: A list of project IDs to retrieve
+        :param ids: A list of project IDs or slugs to retrieve
         :type ids: list
 
-        :return: A list of dictionaries containing the projects' data. Each dictionary represents a project and
-        contains keys representing the project's data and their corresponding values.
+        :param concurrency: The maximum number of chunks requested at once, defaults to 8
+        :type concurrency: int (optional)
+
+        :param return_missing: If True, also return the IDs or slugs that were not found, defaults to False
+        :type return_missing: bool (optional)
+
+        :return: A list of dictionaries containing the projects' data, in the same order as `ids`. Each
+        dictionary represents a project and contains keys representing the project's data and their
+        corresponding values. If `return_missing` is True, a tuple of that list and a list of the IDs or slugs
+        that were not found.
     """
 
     # set API endpoint
     api_multiple_projects_url = f'{base_url}/projects'
 
-    # return error if no user_id or slug provided
+    # return error if no ids provided
     if ids is None:
         return "Error: No user_id or slug provided"
 
-    # params
-    params = {
-        'user_ids': json.dumps(ids)
-    }
+    # make requests
+    projects = []
+    for response, status_code in await request_chunked_async(api_multiple_projects_url, ids, concurrency=concurrency):
+        if status_code != 200:
+            print(f'Error: {response}')
+            mark_incomplete()
+        else:
+            projects.extend(response)
 
-    # make request
-    response, status_code = await request(api_multiple_projects_url, params=params)
-
-    if status_code != 200:
-        print(f'Error: {response}')
-
-    else:
-        # return data
-        return response['projects']
+    # return data in input order
+    projects, missing = merge_in_order(ids, projects, keys=('id', 'slug'))
+    return (projects, missing) if return_missing else projects
 
 
+@returns(Project)
 async def get_random(count: int):
     """
     The function retrieves a random selection of projects and returns a list of dictionaries containing the
@@ -232,3 +337,35 @@ async def get_random(count: int):
     else:
         # return data
         return response
+
+
+async def fetch_many(ids, concurrency: int = 10, ordered: bool = False):
+    """
+    The function fetches many projects by their IDs with at most `concurrency` requests in flight, yielding
+    a result for each ID as it completes. IDs are consumed lazily, so `ids` may be a generator of any size.
+
+    ---
+
+    ### ---Parameters---
+
+    :param ids: The IDs of the projects to retrieve
+    :type ids: Iterable[str]
+
+    :param concurrency: The maximum number of requests in flight at once, defaults to 10
+    :type concurrency: int (optional)
+
+    :param ordered: If True, results are yielded in the same order as `ids` instead of as they complete,
+    defaults to False
+    :type ordered: bool (optional)
+
+    :return: An async iterator of `FetchResult`, one per ID. `result.ok` tells whether the fetch succeeded,
+    `result.data` holds the project's data and `result.error` holds the error otherwise.
+    """
+
+    async def fetch(id):
+        with decode_as(Project):
+            data, status = await request(f'{base_url}/project/{id}')
+        return as_model(Project, data), status
+
+    async for result in _fetch_many(fetch, ids, concurrency=concurrency, ordered=ordered):
+        yield result
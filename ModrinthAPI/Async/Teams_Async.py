@@ -1,4 +1,6 @@
 from .utils.API_Request_Async import request_async as request
+from ModrinthAPI.utils.Models import TeamMember, returns
+from ModrinthAPI.utils.Result_Cache import cached
 
 import json
 import asyncio
@@ -7,6 +9,8 @@ api_version = 'v2'
 base_url = f'https://api.modrinth.com/{api_version}'
 
 
+@cached('teams.get_project_members')
+@returns(TeamMember)
 async def get_project_members(id: str = None, slug: str = None):
     """
     The function retrieves a list of members in a project's team and returns a list of dictionaries
@@ -1,12 +1,16 @@
 from .utils.API_Request_Async import request_async as request
-
-import json
-import asyncio
+from .utils.Batch_Async import get_batch_loader
+from .utils.Bulk_Async import fetch_many as _fetch_many, request_chunked_async
+from ModrinthAPI.utils.Chunking import merge_in_order
+from ModrinthAPI.utils.Models import Project, User, as_model, decode_as, returns
+from ModrinthAPI.utils.Result_Cache import cached, mark_incomplete
 
 api_version = 'v2'
 base_url = f'https://api.modrinth.com/{api_version}'
 
 
+@cached('users.get')
+@returns(User)
 async def get(id: str = None, username: str = None):
     """
         The function retrieves a user's data by their ID or username and returns a dictionary of the user's data.
@@ -32,8 +36,12 @@ async def get(id: str = None, username: str = None):
     if id is None and username is None:
         return "Error: No user_id or username provided"
 
-    # make request
-    response, status_code = await request(api_user_url)
+    # make request, batched with other lookups when a batch loader is set
+    loader = get_batch_loader()
+    if loader is not None and id is not None:
+        response, status_code = await loader.load(f'{base_url}/users', id, keys=('id',))
+    else:
+        response, status_code = await request(api_user_url)
 
     if status_code != 200:
         print(f'Error: {response}')
@@ -43,6 +51,7 @@ async def get(id: str = None, username: str = None):
         return response
 
 
+@returns(User)
 async def get_authenticated():
     """
         The function retrieves the authenticated user's data and returns a dictionary of the user's data.
@@ -69,44 +78,56 @@ async def get_authenticated():
         return response
 
 
-async def get_multiple(ids: list = None):
+@cached('users.get_multiple')
+@returns(User)
+async def get_multiple(ids: list = None, concurrency: int = 8, return_missing: bool = False):
     """
-        The function retrieves multiple users' data by their IDs and returns a list of dictionaries containing
-        the users' data.
+        The function retrieves multiple users by their IDs or usernames and returns a list of dictionaries containing
+        the users' data. Large ID lists are split into URL-length-safe chunks which are requested
+        concurrently.
 
         ---
 
         ### ---Parameters---
 
-        :param ids: A list of user IDs to retrieve
+        :param ids: A list of user IDs or usernames to retrieve
         :type ids: list (optional)
 
-        :return: A list of dictionaries containing the users' data. Each dictionary represents a user and
-        contains keys representing the user's data and their corresponding values.
+        :param concurrency: The maximum number of chunks requested at once, defaults to 8
+        :type concurrency: int (optional)
+
+        :param return_missing: If True, also return the IDs or usernames that were not found, defaults to False
+        :type return_missing: bool (optional)
+
+        :return: A list of dictionaries containing the users' data, in the same order as `ids`. Each
+        dictionary represents a user and contains keys representing the user's data and their
+        corresponding values. If `return_missing` is True, a tuple of that list and a list of the IDs or usernames
+        that were not found.
     """
 
     # set API endpoint
     api_multiple_users_url = f'{base_url}/users'
 
-    # return error if no user_ids provided
+    # return error if no ids provided
     if ids is None:
         return "Error: No user_ids provided"
 
-    params = {
-        'user_ids': json.dumps(ids)
-    }
-
-    # make request
-    response, status_code = await request(api_multiple_users_url, params=params)
-
-    if status_code != 200:
-        print(f'Error: {response}')
+    # make requests
+    users = []
+    for response, status_code in await request_chunked_async(api_multiple_users_url, ids, concurrency=concurrency):
+        if status_code != 200:
+            print(f'Error: {response}')
+            mark_incomplete()
+        else:
+            users.extend(response)
 
-    else:
-        # return data
-        return response
+    # return data in input order
+    users, missing = merge_in_order(ids, users, keys=('id', 'username'))
+    return (users, missing) if return_missing else users
 
 
+@cached('users.get_projects')
+@returns(Project)
 async def get_projects(id: str = None, username: str = None):
     """
         The function retrieves a list of projects for a user with the given ID or username and returns a list of
@@ -181,6 +202,8 @@ async def get_notifications(id: str = None, username: str = None):
         return response
 
 
+@cached('users.get_followed_projects')
+@returns(Project)
 async def get_followed_projects(username: str = None, id: str = None):
     """
         The function retrieves a list of projects followed by a user with the given ID or username and returns a
@@ -253,3 +276,35 @@ async def get_payout_history(id: str = None, username: str = None):
     elif response is not None:
         # return data
         return response
+
+
+async def fetch_many(ids, concurrency: int = 10, ordered: bool = False):
+    """
+    The function fetches many users by their IDs with at most `concurrency` requests in flight, yielding
+    a result for each ID as it completes. IDs are consumed lazily, so `ids` may be a generator of any size.
+
+    ---
+
+    ### ---Parameters---
+
+    :param ids: The IDs of the users to retrieve
+    :type ids: Iterable[str]
+
+    :param concurrency: The maximum number of requests in flight at once, defaults to 10
+    :type concurrency: int (optional)
+
+    :param ordered: If True, results are yielded in the same order as `ids` instead of as they complete,
+    defaults to False
+    :type ordered: bool (optional)
+
+    :return: An async iterator of `FetchResult`, one per ID. `result.ok` tells whether the fetch succeeded,
+    `result.data` holds the user's data and `result.error` holds the error otherwise.
+    """
+
+    async def fetch(id):
+        with decode_as(User):
+            data, status = await request(f'{base_url}/user/{id}')
+        return as_model(User, data), status
+
+    async for result in _fetch_many(fetch, ids, concurrency=concurrency, ordered=ordered):
+        yield result
@@ -1,12 +1,20 @@
 from .utils.API_Request_Async import request_async as request
+from .utils.Batch_Async import get_batch_loader
+from .utils.Bulk_Async import fetch_many as _fetch_many, post_chunked_async, request_chunked_async
+from ModrinthAPI.utils.Chunking import merge_in_order
+from ModrinthAPI.utils.Hash_Store import get_hash_store
+from ModrinthAPI.utils.Models import Version, as_model, decode_as, returns
+from ModrinthAPI.utils.Result_Cache import cached, mark_incomplete
 
-import json
 import asyncio
+import json
 
 api_version = 'v2'
 base_url = f'https://api.modrinth.com/{api_version}'
 
 
+@cached('versions.get')
+@returns(Version)
 async def get(id: str):
     """
         The function retrieves a version of a project by its ID and returns a dictionary of the version's data.
@@ -29,8 +37,12 @@ async def get(id: str):
     if id is None:
         return "Error: No user_id or slug provided"
 
-    # make request
-    response, status_code = await request(api_version_url)
+    # make request, batched with other lookups when a batch loader is set
+    loader = get_batch_loader()
+    if loader is not None:
+        response, status_code = await loader.load(f'{base_url}/versions', id, keys=('id',))
+    else:
+        response, status_code = await request(api_version_url)
 
     if status_code != 200:
         print(f'Error: {response}')
@@ -40,6 +52,8 @@ async def get(id: str):
         return response
 
 
+@cached('versions.get_list')
+@returns(Version)
 async def get_list(id: str, loaders: list = None, game_versions: list = None,
                    featured: bool = False):
     """
@@ -73,8 +87,8 @@ async def get_list(id: str, loaders: list = None, game_versions: list = None,
 
     # params
     params = {
-        'loaders': json.dumps(loaders),
-        'game_versions': json.dumps(game_versions),
+        'loaders': json.dumps(loaders) if loaders is not None else None,
+        'game_versions': json.dumps(game_versions) if game_versions is not None else None,
         'featured': 'true' if featured else 'false',
     }
 
@@ -93,10 +107,13 @@ async def get_list(id: str, loaders: list = None, game_versions: list = None,
         return response
 
 
-async def get_multiple(ids: list):
+@cached('versions.get_multiple')
+@returns(Version)
+async def get_multiple(ids: list, concurrency: int = 8, return_missing: bool = False):
     """
-        The function retrieves multiple versions of a project by their IDs and returns a list of dictionaries
-        containing the versions' data.
+        The function retrieves multiple versions by their IDs and returns a list of dictionaries containing
+        the versions' data. Large ID lists are split into URL-length-safe chunks which are requested
+        concurrently.
 
         ---
 
@@ -105,36 +122,46 @@ async def get_multiple(ids: list):
         :param ids: A list of version IDs to retrieve
         :type ids: list
 
-        :return: A list of dictionaries containing the versions' data. Each dictionary represents a version and
-        contains keys representing the version's data and their corresponding values.
+        :param concurrency: The maximum number of chunks requested at once, defaults to 8
+        :type concurrency: int (optional)
+
+        :param return_missing: If True, also return the IDs that were not found, defaults to False
+        :type return_missing: bool (optional)
+
+        :return: A list of dictionaries containing the versions' data, in the same order as `ids`. Each
+        dictionary represents a version and contains keys representing the version's data and their
+        corresponding values. If `return_missing` is True, a tuple of that list and a list of the IDs
+        that were not found.
     """
 
     # set API endpoint
     api_multiple_versions_url = f'{base_url}/versions'
 
-    # return error if no user_id or slug provided
+    # return error if no ids provided
     if ids is None:
         return "Error: No user_id or slug provided"
 
-    # params
-    params = {
-        'user_ids': json.dumps(ids)
-    }
-
-    # make request
-    response, status_code = await request(api_multiple_versions_url, params=params)
-
-    if status_code != 200:
-        print(f'Error: {response}')
+    # make requests
+    versions = []
+    for response, status_code in await request_chunked_async(api_multiple_versions_url, ids, concurrency=concurrency):
+        if status_code != 200:
+            print(f'Error: {response}')
+            mark_incomplete()
+        else:
+            versions.extend(response)
 
-    else:
-        # return data
-        return response
+    # return data in input order
+    versions, missing = merge_in_order(ids, versions, keys=('id',))
+    return (versions, missing) if return_missing else versions
 
 
-async def get_from_hash(hash: str):
+@cached('versions.get_from_hash')
+@returns(Version)
+async def get_from_hash(hash: str, algorithm: str = 'sha1'):
     """
         The function retrieves a version of a project by its version_hash and returns a dictionary of the version's data.
+        If a hash store is installed, it is consulted first and updated with the result, in a worker thread so
+        its disk access does not block the event loop.
 
         ---
 
@@ -143,6 +170,9 @@ async def get_from_hash(hash: str):
         :param hash: The version_hash of the version to retrieve
         :type hash: str
 
+        :param algorithm: The algorithm of the hash, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
         :return: the result of a version query based on the provided parameters. The function returns a
         dictionary of version data, with each key representing a piece of data and its corresponding value.
     """
@@ -154,12 +184,196 @@ async def get_from_hash(hash: str):
     if hash is None:
         return "Error: No version_hash provided"
 
+    # check the hash store
+    store = get_hash_store()
+    if store is not None:
+        found = await asyncio.to_thread(store.get_many, [hash], algorithm)
+        if hash in found:
+            return found[hash]
+
+    # params
+    params = {
+        'algorithm': algorithm
+    }
+
     # make request
-    response, status_code = await request(api_project_versions_hash_url)
+    response, status_code = await request(api_project_versions_hash_url, params=params)
 
     if status_code != 200:
+        if store is not None and status_code == 404:
+            await asyncio.to_thread(store.put_missing, [hash], algorithm)
         print(f'Error: {response}')
 
     else:
+        if store is not None:
+            await asyncio.to_thread(store.put, hash, response, algorithm)
         # return data
         return response
+
+
+@returns(Version, keyed=True)
+async def get_from_hashes(hashes: list, algorithm: str = 'sha1', chunk_size: int = 1000, concurrency: int = 4):
+    """
+        The function retrieves the versions of many files by their hashes in bulk and returns a dictionary
+        mapping each hash to its version's data. Large hash lists are split into chunks which are requested
+        concurrently. If a hash store is installed, it is consulted first and updated with the results, in a
+        worker thread so its disk access does not block the event loop.
+
+        ---
+
+        ### ---Parameters---
+
+        :param hashes: The hashes of the files to retrieve versions for
+        :type hashes: list
+
+        :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
+        :param chunk_size: The maximum number of hashes sent per request, defaults to 1000
+        :type chunk_size: int (optional)
+
+        :param concurrency: The maximum number of chunks requested at once, defaults to 4
+        :type concurrency: int (optional)
+
+        :return: A dictionary mapping each hash that has a version to a dictionary of the version's data, in
+        the same order as `hashes`. Hashes without a version are left out.
+    """
+
+    # set API endpoint
+    api_versions_from_hashes_url = f'{base_url}/version_files'
+
+    # return error if no hashes provided
+    if hashes is None:
+        return "Error: No hashes provided"
+
+    # check the hash store
+    store = get_hash_store()
+    known = await asyncio.to_thread(store.get_many, hashes, algorithm) if store is not None else {}
+    unknown = [hash for hash in hashes if hash not in known]
+
+    # make requests
+    found = {}
+    failed = False
+    responses = await post_chunked_async(api_versions_from_hashes_url, unknown, 'hashes',
+                                         data={'algorithm': algorithm}, chunk_size=chunk_size,
+                                         concurrency=concurrency)
+    for response, status_code in responses:
+        if status_code != 200:
+            failed = True
+            print(f'Error: {response}')
+        else:
+            found.update(response)
+
+    if store is not None:
+        await asyncio.to_thread(store.put_many, found, algorithm)
+        if not failed:
+            await asyncio.to_thread(store.put_missing, [hash for hash in unknown if hash not in found], algorithm)
+
+    # return data in input order
+    versions = known | found
+    return {hash: versions[hash] for hash in hashes if versions.get(hash) is not None}
+
+
+@returns(Version, keyed=True)
+async def get_latest_from_hashes(hashes: list, loaders: list = None, game_versions: list = None,
+                                 algorithm: str = 'sha1', outdated_only: bool = False, chunk_size: int = 1000,
+                                 concurrency: int = 4):
+    """
+        The function retrieves the latest versions of the projects of many files by their hashes in bulk, for
+        checking many mods for updates at once. Large hash lists are split into chunks which are requested
+        concurrently.
+
+        ---
+
+        ### ---Parameters---
+
+        :param hashes: The hashes of the files to check for updates
+        :type hashes: list
+
+        :param loaders: The loaders the latest versions must support, e.g. ["fabric"], defaults to None
+        :type loaders: list (optional)
+
+        :param game_versions: The game versions the latest versions must support, e.g. ["1.20.1"], defaults
+        to None
+        :type game_versions: list (optional)
+
+        :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
+        :param outdated_only: If True, leave out the hashes whose file is already in its latest version,
+        defaults to False
+        :type outdated_only: bool (optional)
+
+        :param chunk_size: The maximum number of hashes sent per request, defaults to 1000
+        :type chunk_size: int (optional)
+
+        :param concurrency: The maximum number of chunks requested at once, defaults to 4
+        :type concurrency: int (optional)
+
+        :return: A dictionary mapping each hash that has a matching latest version to a dictionary of that
+        version's data, in the same order as `hashes`. Hashes without one are left out.
+    """
+
+    # set API endpoint
+    api_latest_versions_url = f'{base_url}/version_files/update'
+
+    # return error if no hashes provided
+    if hashes is None:
+        return "Error: No hashes provided"
+
+    # params
+    data = {'algorithm': algorithm}
+    if loaders is not None:
+        data['loaders'] = loaders
+    if game_versions is not None:
+        data['game_versions'] = game_versions
+
+    # make requests
+    found = {}
+    responses = await post_chunked_async(api_latest_versions_url, hashes, 'hashes', data=data,
+                                         chunk_size=chunk_size, concurrency=concurrency)
+    for response, status_code in responses:
+        if status_code != 200:
+            print(f'Error: {response}')
+        else:
+            found.update(response)
+
+    # return data in input order
+    return {hash: found[hash] for hash in hashes
+            if found.get(hash) is not None and not (outdated_only and _has_file(found[hash], hash, algorithm))}
+
+
+def _has_file(version: dict, hash: str, algorithm: str) -> bool:
+    return any(file.get('hashes', {}).get(algorithm) == hash for file in version.get('files') or [])
+
+
+async def fetch_many(ids, concurrency: int = 10, ordered: bool = False):
+    """
+    The function fetches many versions by their IDs with at most `concurrency` requests in flight, yielding
+    a result for each ID as it completes. IDs are consumed lazily, so `ids` may be a generator of any size.
+
+    ---
+
+    ### ---Parameters---
+
+    :param ids: The IDs of the versions to retrieve
+    :type ids: Iterable[str]
+
+    :param concurrency: The maximum number of requests in flight at once, defaults to 10
+    :type concurrency: int (optional)
+
+    :param ordered: If True, results are yielded in the same order as `ids` instead of as they complete,
+    defaults to False
+    :type ordered: bool (optional)
+
+    :return: An async iterator of `FetchResult`, one per ID. `result.ok` tells whether the fetch succeeded,
+    `result.data` holds the version's data and `result.error` holds the error otherwise.
+    """
+
+    async def fetch(id):
+        with decode_as(Version):
+            data, status = await request(f'{base_url}/version/{id}')
+        return as_model(Version, data), status
+
+    async for result in _fetch_many(fetch, ids, concurrency=concurrency, ordered=ordered):
+        yield result
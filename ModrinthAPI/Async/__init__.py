@@ -15,4 +15,8 @@ from . import Projects_Async
 from . import Teams_Async
 from . import Users_Async
 from . import Versions_Async
-from .utils.Auth_Async import set_auth
\ No newline at end of file
+from .utils.Auth_Async import set_auth
+from .utils.Batch_Async import BatchLoader, set_batch_loader
+from .utils.Bulk_Async import FetchResult
+from .utils.Hedge_Async import Hedger, set_hedger
+from .utils.Session_Async import SessionAsync, close_default_session_async
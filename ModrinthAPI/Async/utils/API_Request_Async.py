@@ -1,18 +1,150 @@
 """
-This module provides a function for making HTTP GET requests using the `requests` library.
+This module provides a function for making HTTP GET and POST requests using the `aiohttp` library.
 """
 
+import asyncio
+
 import aiohttp
-from ModrinthAPI.Async.utils.Auth_Async import All_Auth
+from ModrinthAPI.Async.utils import Auth_Async
+from ModrinthAPI.Async.utils.Hedge_Async import get_hedger
+from ModrinthAPI.Async.utils.Session_Async import default_session_async, get_session_async
+from ModrinthAPI.utils.HTTP_Cache import HTTPCache, get_http_cache
+from ModrinthAPI.utils.Json import loads
+from ModrinthAPI.utils.Metrics import endpoint_template, get_metrics
+from ModrinthAPI.utils.Rate_Limit import get_rate_limiter
+from ModrinthAPI.utils.Retry import CircuitOpenError, get_circuit_breaker, get_retry_policy
+from ModrinthAPI.utils.Single_Flight import get_single_flight
+from ModrinthAPI.utils.Tracing import get_tracer
+
+
+async def request_async(url, params: dict[str, ...] | None = None, method: str = 'GET',
+                        data: dict[str, ...] | None = None):
+    """
+    Sends an HTTP request to the specified URL through the active `SessionAsync`. If no session is
+    active, the default session of the running event loop is used.
+
+    Args:
+        url (str): The URL to send the request to.
+        params (dict[str, ...], optional): The query parameters to include in the request. Defaults to {}.
+        method (str, optional): The HTTP method to use for the request, GET or POST. Defaults to GET.
+        data (dict[str, ...] | None, optional): The JSON data to include in the request body. Defaults to None.
+
+    Returns:
+        tuple: A tuple containing the response data (if successful) or error message (if unsuccessful) and the HTTP status code.
+    """
+    # drop unset parameters, as requests does for the sync API
+    params = {key: value for key, value in (params or {}).items() if value is not None}
+
+    async def attempt(on_send=None):
+        client = get_session_async() or await default_session_async()
+        return await _send(client.session, method, url, params, data, on_send)
+
+    # slow GETs are hedged with a duplicate request when a hedger is set
+    hedger = get_hedger() if method == 'GET' else None
+    if hedger is None:
+        send = attempt
+    else:
+        async def send():
+            return await hedger.run(endpoint_template(url), attempt)
+
+    # identical GETs in flight at the same time share one response
+    flight = get_single_flight() if method == 'GET' else None
+    if flight is None:
+        body, status = await send()
+    else:
+        body, status = await flight.do_async(HTTPCache.key(url, params, Auth_Async.auth), send)
+    if isinstance(body, Exception):
+        return body, status
+    if not isinstance(body, bytes):
+        # a revalidated response is answered with its already decoded body
+        return body, status
+    tracer = get_tracer()
+    if tracer is None:
+        return loads(body), status
+    with tracer.span('decode', size=len(body)):
+        return loads(body), status
 
 
-async def request_async(url, params: dict[str, ...] = {}):
-    auth = auth
-    async with aiohttp.ClientSession() as session:
+async def _send(session: aiohttp.ClientSession, method, url, params, data, on_send=None):
+    limiter = get_rate_limiter()
+    policy = get_retry_policy()
+    breaker = get_circuit_breaker()
+    metrics = get_metrics()
+    tracer = get_tracer()
+    endpoint = endpoint_template(url) if metrics is not None or tracer is not None else None
+    # revalidate cached responses instead of downloading them again
+    cache = get_http_cache() if method == 'GET' else None
+    entry = None
+    headers = Auth_Async.auth
+    if cache is not None:
+        cache_key = cache.key(url, params, headers)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            headers = headers | entry.validators()
+    if policy is not None:
+        policy.record_request()
+    attempt = 0
+    while True:
+        status = None
+        size = 0
+        error = None
+        event = span = None
         try:
-            async with session.get(url, params=params, headers=auth, timeout=10) as response:
-                response.raise_for_status()
-                json_response = await response.text()
-                return json_response, response.status
+            if breaker is not None:
+                breaker.check()
+            if limiter is not None:
+                waited = await limiter.acquire_async()
+                if metrics is not None and waited > 0:
+                    metrics.count('rate_limit_waits', endpoint)
+                    metrics.count('rate_limit_wait_seconds', endpoint, waited)
+            if on_send is not None:
+                # the attempt is sent now that the rate limiter let it through
+                on_send()
+            if metrics is not None:
+                event = metrics.start(method, url, attempt, endpoint)
+            if tracer is not None:
+                span = tracer.start(f'{method} {endpoint}', 'request', method=method, url=url, attempt=attempt)
+            async with session.request(method, url, params=params, json=data, headers=headers) as response:
+                status = response.status
+                if limiter is not None:
+                    limiter.update(response.headers, status)
+                if breaker is not None:
+                    breaker.record(status < 500)
+                delay = policy.should_retry(method, attempt, status, response.headers) if policy is not None else None
+                if delay is None:
+                    if entry is not None and status == 304:
+                        if metrics is not None:
+                            metrics.count('http_cache_revalidations', endpoint)
+                        return cache.decoded(cache_key, entry, loads), 200
+                    response.raise_for_status()
+                    body = await response.read()
+                    size = len(body)
+                    if cache is not None:
+                        cache.store(cache_key, response.headers, body)
+                    return body, status
+        except CircuitOpenError as err:
+            return err, None
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as err:
+            # the connection failed before a response was received, or while reading its body
+            error = err
+            if breaker is not None and status is None:
+                breaker.record(False)
+            delay = policy.should_retry(method, attempt) if policy is not None else None
+            if delay is None:
+                return err, status
         except aiohttp.ClientError as err:
-            return err, response.status
+            error = err
+            return err, status
+        except asyncio.CancelledError as err:
+            # e.g. the losing request of a hedged pair
+            error = err
+            raise
+        finally:
+            if event is not None:
+                metrics.finish(event, status, size, error)
+            if span is not None:
+                tracer.finish(span, status=status, size=size, error=repr(error) if error is not None else None)
+        if metrics is not None:
+            metrics.count('retries', endpoint)
+        await asyncio.sleep(delay)
+        attempt += 1
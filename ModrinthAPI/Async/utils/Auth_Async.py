@@ -27,8 +27,8 @@ def set_auth(Token: str = None, GithubUsername: str = None, ProjectName: str = N
 
     global auth
     # set authentication
-    user_auth = {'Authorization': Token}
+    user_auth = {'Authorization': Token} if Token is not None else {}
     # set user agent
     user_agent = {'User-Agent': f"{GithubUsername}/{ProjectName} ({Email})"}
     # combine headers
-    All_Auth = user_auth | user_agent
+    auth = user_auth | user_agent
@@ -0,0 +1,165 @@
+"""
+This module provides opt-in automatic batching of single-item lookups for the Async API modules. Lookups made
+within a short window are collected and sent as one multi-get request.
+"""
+
+import asyncio
+import json
+import threading
+import weakref
+
+from ModrinthAPI.Async.utils.API_Request_Async import request_async
+from ModrinthAPI.utils.Chunking import chunk_ids
+
+
+class BatchLoader:
+    """
+    A DataLoader-style batcher. Every `load` made on an event loop within `window` seconds of the first one
+    is collected, and each multi-get endpoint involved is then requested once with all of its IDs, split
+    into URL-length-safe chunks. Each caller receives the item for its own ID.
+
+    `loads` counts the lookups and `batches` the requests sent for them.
+
+    ---
+
+    ### ---Parameters---
+
+    :param window: How long in seconds lookups are collected before a batch is sent. With 0, lookups made
+    in the same event loop iteration are batched, defaults to 0
+    :type window: float (optional)
+
+    :param concurrency: The maximum number of chunks of one batch requested at once, defaults to 8
+    :type concurrency: int (optional)
+    """
+
+    def __init__(self, window: float = 0, concurrency: int = 8):
+        self.window = window
+        self.concurrency = concurrency
+        self.loads = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+        # event loop → multi-get URL → (keys, ID → futures)
+        self._pending = weakref.WeakKeyDictionary()
+        # the event loop only keeps weak references to tasks, so running batches are kept here
+        self._tasks = set()
+
+    async def load(self, url: str, id: str, keys: tuple = ('id',)) -> tuple:
+        """
+        The function looks an item up by its ID as part of the next batch sent to `url`.
+
+        ---
+
+        ### ---Parameters---
+
+        :param url: The URL of the multi-get endpoint, e.g. "https://api.modrinth.com/v2/projects"
+        :type url: str
+
+        :param id: The ID of the item
+        :type id: str
+
+        :param keys: The item fields an ID may match, e.g. ("id", "slug"), defaults to ("id",)
+        :type keys: tuple (optional)
+
+        :return: A `(response, status_code)` tuple, as returned by `request_async` for a single item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self.loads += 1
+            pending = self._pending.get(loop)
+            if pending is None:
+                pending = self._pending[loop] = {}
+                if self.window > 0:
+                    loop.call_later(self.window, self._dispatch, loop)
+                else:
+                    loop.call_soon(self._dispatch, loop)
+            _, waiters = pending.setdefault(url, (keys, {}))
+            waiters.setdefault(id, []).append(future)
+        return await future
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop):
+        with self._lock:
+            pending = self._pending.pop(loop, {})
+        for url, (keys, waiters) in pending.items():
+            task = loop.create_task(self._send(url, keys, waiters))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, url: str, keys: tuple, waiters: dict):
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+
+        async def fetch(chunk):
+            async with semaphore:
+                return chunk, await request_async(url, params={'ids': json.dumps(chunk)})
+
+        chunks = chunk_ids(list(waiters))
+        with self._lock:
+            self.batches += len(chunks)
+        try:
+            results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        except asyncio.CancelledError as err:
+            # the callers are cancelled with the batch
+            _resolve(waiters, waiters, lambda id, error=err: error)
+            raise
+        except Exception as err:
+            # every caller receives the error, so it is not raised again from the task, where nothing would
+            # retrieve it; `err` is bound as a default so the callback does not depend on the except scope
+            _resolve(waiters, waiters, lambda id, error=err: error)
+            return
+
+        for chunk, (response, status_code) in results:
+            if status_code != 200:
+                _resolve(waiters, chunk, lambda id: (response, status_code))
+                continue
+            index = {}
+            for item in response:
+                for key in keys:
+                    if item.get(key) is not None:
+                        index.setdefault(item[key], item)
+            _resolve(waiters, chunk, lambda id: (index[id], 200) if id in index
+                     else (LookupError(f'{id} was not found'), 404))
+
+
+def _resolve(waiters: dict, ids, outcome):
+    for id in ids:
+        for future in waiters[id]:
+            # callers that were cancelled have stopped waiting
+            if future.done():
+                continue
+            result = outcome(id)
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+batch_loader: BatchLoader | None = None
+
+
+def get_batch_loader() -> BatchLoader | None:
+    """
+    The function returns the batch loader used by the async get-by-ID functions.
+
+    :return: The active `BatchLoader`, or None if batching is disabled.
+    """
+    return batch_loader
+
+
+def set_batch_loader(loader: BatchLoader | None):
+    """
+    The function sets the batch loader used by `Projects_Async.get`, `Users_Async.get` and
+    `Versions_Async.get`. While one is set, their lookups by ID are batched into multi-get requests.
+
+    ---
+
+    ### ---Parameters---
+
+    :param loader: The batch loader to use, or None to request every item on its own
+    :type loader: BatchLoader
+
+    :return: None
+    """
+    global batch_loader
+    batch_loader = loader
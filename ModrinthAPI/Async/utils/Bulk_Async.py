@@ -0,0 +1,192 @@
+"""
+This module provides bounded-concurrency bulk fetching for the Async API modules.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple
+
+from ModrinthAPI.Async.utils.API_Request_Async import request_async
+from ModrinthAPI.utils.Chunking import chunk_ids, chunk_list
+from ModrinthAPI.utils.Tracing import traced
+
+
+class FetchResult(NamedTuple):
+    """
+    The outcome of fetching a single ID. `data` holds the decoded response when the fetch succeeded, and
+    `error` holds the error when it did not.
+    """
+
+    id: str
+    data: Any
+    status_code: int | None
+    error: BaseException | None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fetch_many(fetch: Callable[[str], Awaitable[tuple]], ids: Iterable[str], concurrency: int = 10,
+                     ordered: bool = False) -> AsyncIterator[FetchResult]:
+    """
+    The function fetches every ID with at most `concurrency` requests in flight and yields a `FetchResult`
+    per ID. IDs are pulled from `ids` lazily, so memory stays flat even for very large or unbounded inputs.
+
+    ---
+
+    ### ---Parameters---
+
+    :param fetch: A coroutine function taking an ID and returning a `(response, status_code)` tuple
+    :type fetch: Callable[[str], Awaitable[tuple]]
+
+    :param ids: The IDs to fetch. May be any iterable, including a generator
+    :type ids: Iterable[str]
+
+    :param concurrency: The maximum number of requests in flight at once, defaults to 10
+    :type concurrency: int (optional)
+
+    :param ordered: If True, results are yielded in the same order as `ids`. If False, results are yielded
+    as soon as they complete, defaults to False
+    :type ordered: bool (optional)
+
+    :return: An async iterator of `FetchResult`.
+    """
+    concurrency = max(concurrency, 1)
+    if ordered:
+        iterator = _fetch_ordered(fetch, ids, concurrency)
+    else:
+        iterator = _fetch_as_completed(fetch, ids, concurrency)
+    async for result in iterator:
+        yield result
+
+
+async def _fetch_one(fetch, id) -> FetchResult:
+    try:
+        response, status_code = await fetch(id)
+    except Exception as err:  # pylint: disable=broad-except
+        return FetchResult(id, None, None, err)
+    if status_code != 200:
+        error = response if isinstance(response, BaseException) else RuntimeError(f'Error: {response}')
+        return FetchResult(id, None, status_code, error)
+    return FetchResult(id, response, status_code, None)
+
+
+async def _fetch_ordered(fetch, ids, concurrency):
+    # a sliding window of tasks: the head is awaited while up to `concurrency` requests run behind it
+    window = deque()
+    iterator = iter(ids)
+    try:
+        for id in iterator:
+            window.append(asyncio.ensure_future(_fetch_one(fetch, id)))
+            if len(window) >= concurrency:
+                yield await window.popleft()
+        while window:
+            yield await window.popleft()
+    finally:
+        for task in window:
+            task.cancel()
+        await asyncio.gather(*window, return_exceptions=True)
+
+
+async def _fetch_as_completed(fetch, ids, concurrency):
+    # a fixed pool of workers share the input iterator and hand results over a bounded queue
+    iterator = iter(ids)
+    results = asyncio.Queue(maxsize=concurrency)
+    done = object()
+
+    async def worker():
+        try:
+            for id in iterator:
+                await results.put(await _fetch_one(fetch, id))
+        except Exception as err:  # pylint: disable=broad-except
+            # errors raised by the input iterator itself are re-raised to the consumer
+            await results.put(err)
+        await results.put(done)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            result = await results.get()
+            if result is done:
+                remaining -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+@traced('request_chunked')
+async def request_chunked_async(url: str, ids: list, concurrency: int = 8) -> list[tuple]:
+    """
+    The function requests `url` once per URL-length-safe chunk of `ids`, passing each chunk as the `ids`
+    query parameter, with up to `concurrency` chunks in flight at once.
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL of the multi-get endpoint
+    :type url: str
+
+    :param ids: The IDs to request
+    :type ids: list
+
+    :param concurrency: The maximum number of chunks requested at once, defaults to 8
+    :type concurrency: int (optional)
+
+    :return: A list of `(response, status_code)` tuples, one per chunk.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(chunk):
+        async with semaphore:
+            return await request_async(url, params={'ids': json.dumps(chunk)})
+
+    return await asyncio.gather(*(fetch(chunk) for chunk in chunk_ids(ids)))
+
+
+@traced('post_chunked')
+async def post_chunked_async(url: str, items: list, field: str, data: dict | None = None, chunk_size: int = 1000,
+                             concurrency: int = 4) -> list[tuple]:
+    """
+    The function sends one POST request per chunk of `items`, with each chunk placed under `field` in the
+    JSON body alongside `data`, and up to `concurrency` chunks in flight at once.
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL of the bulk endpoint
+    :type url: str
+
+    :param items: The items to send
+    :type items: list
+
+    :param field: The body field that holds each chunk, e.g. "hashes"
+    :type field: str
+
+    :param data: Additional fields sent with every chunk, defaults to None
+    :type data: dict (optional)
+
+    :param chunk_size: The maximum number of items per request, defaults to 1000
+    :type chunk_size: int (optional)
+
+    :param concurrency: The maximum number of chunks requested at once, defaults to 4
+    :type concurrency: int (optional)
+
+    :return: A list of `(response, status_code)` tuples, one per chunk.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(chunk):
+        async with semaphore:
+            return await request_async(url, method='POST', data=(data or {}) | {field: chunk})
+
+    return await asyncio.gather(*(fetch(chunk) for chunk in chunk_list(items, chunk_size)))
@@ -0,0 +1,228 @@
+"""
+This module provides opt-in request hedging for the async GET requests. When a request is slower than nearly
+all recent requests to the same endpoint, a duplicate is sent on another pooled connection and whichever
+responds first is used, so a single slow connection no longer sets the tail latency.
+"""
+
+import asyncio
+import collections
+import threading
+
+from ModrinthAPI.utils.Metrics import get_metrics
+
+# endpoints whose latencies are tracked; the least recently used are forgotten beyond this
+MAX_ENDPOINTS = 256
+
+
+class Hedger:
+    """
+    A hedger of slow GET requests.
+
+    The latencies of the last `window` requests to each endpoint are kept, and a request still running
+    after their `percentile` is hedged: a duplicate is sent, the first successful response wins and the
+    other request is cancelled. No request is hedged before `min_samples` latencies are known for its
+    endpoint. Hedges are limited by a budget: every request earns `budget` hedges, so at most that share of
+    extra requests is sent, plus a burst of up to `burst` hedges saved up while traffic was fast.
+
+    `requests` counts the requests made through the hedger, `hedged` the duplicates sent, `hedge_wins` the
+    requests answered by their duplicate and `over_budget` the requests not hedged for lack of budget.
+
+    ---
+
+    ### ---Parameters---
+
+    :param percentile: The latency percentile after which a request is hedged, defaults to 0.95
+    :type percentile: float (optional)
+
+    :param budget: The maximum share of extra requests sent as hedges, defaults to 0.05
+    :type budget: float (optional)
+
+    :param burst: The maximum number of hedges that can be saved up, defaults to 10
+    :type burst: float (optional)
+
+    :param window: The number of latencies kept per endpoint, defaults to 200
+    :type window: int (optional)
+
+    :param min_samples: The number of latencies needed before an endpoint is hedged, defaults to 20
+    :type min_samples: int (optional)
+
+    :param min_delay: The minimum hedging delay in seconds, defaults to 0.01
+    :type min_delay: float (optional)
+    """
+
+    def __init__(self, percentile: float = 0.95, budget: float = 0.05, burst: float = 10, window: int = 200,
+                 min_samples: int = 20, min_delay: float = 0.01):
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+        self._lock = threading.Lock()
+        self._tokens = burst
+        # endpoint → (latencies, threshold or None when it must be recomputed)
+        self._latencies = collections.OrderedDict()
+
+    def threshold(self, endpoint: str) -> float | None:
+        """
+        The function returns how long a request to an endpoint may run before it is hedged.
+
+        ---
+
+        ### ---Parameters---
+
+        :param endpoint: The endpoint, as returned by `endpoint_template`
+        :type endpoint: str
+
+        :return: The delay in seconds, or None if too few latencies are known to hedge the endpoint.
+        """
+        with self._lock:
+            entry = self._latencies.get(endpoint)
+            if entry is None or len(entry[0]) < self.min_samples:
+                return None
+            latencies, threshold = entry
+            if threshold is None:
+                ordered = sorted(latencies)
+                threshold = max(ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)],
+                                self.min_delay)
+                self._latencies[endpoint] = (latencies, threshold)
+            return threshold
+
+    def observe(self, endpoint: str, latency: float):
+        """
+        The function records the latency of a request to an endpoint.
+
+        ---
+
+        ### ---Parameters---
+
+        :param endpoint: The endpoint, as returned by `endpoint_template`
+        :type endpoint: str
+
+        :param latency: The latency in seconds
+        :type latency: float
+
+        :return: None
+        """
+        with self._lock:
+            entry = self._latencies.pop(endpoint, None)
+            latencies = entry[0] if entry is not None else collections.deque(maxlen=self.window)
+            latencies.append(latency)
+            self._latencies[endpoint] = (latencies, None)
+            if len(self._latencies) > MAX_ENDPOINTS:
+                self._latencies.popitem(last=False)
+
+    async def run(self, endpoint: str, function):
+        """
+        The function awaits `function()`, hedging it with a second call if it is slow. The hedging delay and
+        the recorded latency run from when a call is sent, so time spent waiting for the rate limiter or
+        backing off before a retry does not count.
+
+        ---
+
+        ### ---Parameters---
+
+        :param endpoint: The endpoint requested, as returned by `endpoint_template`
+        :type endpoint: str
+
+        :param function: The coroutine function sending the request, returning a `(response, status)` tuple.
+        It is called with a function to call whenever an attempt of the request is sent
+        :type function: Callable[[Callable[[], None]], Awaitable[tuple]]
+
+        :return: The `(response, status)` tuple of the first successful call, or of the last failed one.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self._tokens + self.budget, self.burst)
+        delay = self.threshold(endpoint)
+        # call → when its latest attempt was sent
+        sent = {}
+        first_sent = loop.create_future()
+
+        def sender(call: int):
+            def on_send():
+                sent[call] = loop.time()
+                if not first_sent.done():
+                    first_sent.set_result(None)
+
+            return on_send
+
+        primary = loop.create_task(function(sender(0)))
+        calls = {primary: 0}
+        tasks = {primary}
+        try:
+            # the hedging delay starts once the request is sent
+            await asyncio.wait({primary, first_sent}, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._spend():
+                hedge = loop.create_task(function(sender(1)))
+                calls[hedge] = 1
+                tasks.add(hedge)
+                metrics = get_metrics()
+                if metrics is not None:
+                    metrics.count('hedges', endpoint)
+            result = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    # a failed call only wins if there is no other call left to wait for
+                    if not isinstance(result[0], Exception) or not tasks:
+                        if task is not primary:
+                            with self._lock:
+                                self.hedge_wins += 1
+                            metrics = get_metrics()
+                            if metrics is not None:
+                                metrics.count('hedge_wins', endpoint)
+                        # a call that failed before it was sent, e.g. on an open circuit, has no latency
+                        if calls[task] in sent:
+                            self.observe(endpoint, loop.time() - sent[calls[task]])
+                        return result
+            return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.over_budget += 1
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+
+
+request_hedger: Hedger | None = None
+
+
+def get_hedger() -> Hedger | None:
+    """
+    The function returns the hedger used by the async GET requests.
+
+    :return: The active `Hedger`, or None if hedging is disabled.
+    """
+    return request_hedger
+
+
+def set_hedger(hedger: Hedger | None):
+    """
+    The function sets the hedger used by the async GET requests. While one is set, slow GET requests are
+    hedged with a duplicate request.
+
+    ---
+
+    ### ---Parameters---
+
+    :param hedger: The hedger to use, or None to never hedge requests
+    :type hedger: Hedger
+
+    :return: None
+    """
+    global request_hedger
+    request_hedger = hedger
@@ -0,0 +1,154 @@
+"""
+This module provides a shared `aiohttp.ClientSession` for the Async API modules.
+"""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+
+import aiohttp
+from ModrinthAPI.Async.utils.Trace_Async import trace_config
+from ModrinthAPI.utils.Tracing import get_tracer
+
+_active_session = contextvars.ContextVar('modrinth_session_async', default=None)
+
+_lock = threading.Lock()
+# event loop → (default session, async generator closing it when the loop shuts down)
+_default_sessions = weakref.WeakKeyDictionary()
+
+
+class SessionAsync:
+    """
+    An async HTTP client that owns a single `aiohttp.ClientSession` and a tuned `TCPConnector`, so every
+    request made while it is active reuses the same pool of keep-alive connections.
+
+    ---
+
+    ### ---Parameters---
+
+    :param limit: The maximum number of open connections in total, defaults to 100
+    :type limit: int (optional)
+
+    :param limit_per_host: The maximum number of open connections to a single host, defaults to 30
+    :type limit_per_host: int (optional)
+
+    :param ttl_dns_cache: How long resolved DNS entries are cached, in seconds, defaults to 300
+    :type ttl_dns_cache: int (optional)
+
+    :param keepalive_timeout: How long idle connections are kept alive, in seconds, defaults to 30
+    :type keepalive_timeout: float (optional)
+
+    :param timeout: The total timeout in seconds for each request, defaults to 10
+    :type timeout: float (optional)
+
+    ---
+
+    Using the client with `async with` makes it the active session for every Async module call made inside
+    the block, including calls in tasks started from it:
+
+        async with SessionAsync(limit_per_host=50):
+            await asyncio.gather(*(Projects_Async.get(id) for id in ids))
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 30, ttl_dns_cache: int = 300,
+                 keepalive_timeout: float = 30, timeout: float = 10):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+        self._token = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The underlying `aiohttp.ClientSession`, created on first use. Must be accessed from a running
+        event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                # request phases are only reported while tracing, so untraced sessions pay nothing for it
+                trace_configs=[trace_config()] if get_tracer() is not None else None,
+            )
+        return self._session
+
+    async def close(self):
+        """
+        The function closes the session and every pooled connection.
+
+        :return: None
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        self._token = _active_session.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        _active_session.reset(self._token)
+        self._token = None
+        await self.close()
+
+
+def get_session_async() -> SessionAsync | None:
+    """
+    The function returns the session active in the current context, or None if no session is active.
+
+    :return: The active `SessionAsync`, or None.
+    """
+    return _active_session.get()
+
+
+async def default_session_async() -> SessionAsync:
+    """
+    The function returns the default session of the running event loop, used by requests made while no
+    session is active, creating it on first use. It is closed when the loop shuts down its async
+    generators, as `asyncio.run` does before returning, or by `close_default_session_async`.
+
+    :return: The default `SessionAsync` of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _default_sessions.get(loop)
+    if entry is None:
+        client = SessionAsync()
+        # the loop finalizes its unfinished async generators at shutdown, which closes the session; the
+        # generator runs to its yield without suspending, so no other task can create a second session
+        closer = _close_at_shutdown(client)
+        await closer.asend(None)
+        entry = (client, closer)
+        with _lock:
+            _default_sessions[loop] = entry
+    return entry[0]
+
+
+async def close_default_session_async():
+    """
+    The function closes the default session of the running event loop, if it has one. Needed only for
+    event loops that are closed without shutting down their async generators.
+
+    :return: None
+    """
+    with _lock:
+        entry = _default_sessions.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+async def _close_at_shutdown(client: SessionAsync):
+    try:
+        yield
+    finally:
+        await client.close()
@@ -0,0 +1,45 @@
+"""
+This module provides the `aiohttp` trace config reporting the phases of each async request to the active tracer.
+"""
+
+import time
+
+import aiohttp
+from ModrinthAPI.utils.Tracing import current_span
+
+# aiohttp trace signals and the request span marks they set
+SIGNALS = {
+    'on_connection_queued_start': 'queued_start',
+    'on_connection_queued_end': 'queued_end',
+    'on_dns_resolvehost_start': 'dns_start',
+    'on_dns_resolvehost_end': 'dns_end',
+    'on_connection_create_start': 'connect_start',
+    'on_connection_create_end': 'connect_end',
+    'on_connection_reuseconn': 'ready',
+    'on_request_headers_sent': 'headers_sent',
+    'on_request_end': 'response_start',
+}
+
+
+def _mark(name: str):
+    async def callback(session, context, params):
+        # the callbacks run in the task sending the request, where its span is current
+        span = current_span()
+        if span is not None and span.marks is not None:
+            span.marks.setdefault(name, time.perf_counter())
+
+    return callback
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """
+    The function creates a trace config marking the start and end of each request phase on the current
+    request span: waiting for a pooled connection, resolving the host, connecting, sending the request,
+    waiting for the response headers and reading the body.
+
+    :return: The trace config, to pass to `aiohttp.ClientSession(trace_configs=[...])`.
+    """
+    config = aiohttp.TraceConfig()
+    for signal, mark in SIGNALS.items():
+        getattr(config, signal).append(_mark(mark))
+    return config
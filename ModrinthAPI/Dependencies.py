@@ -0,0 +1,275 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from . import Projects
+from . import Versions
+from .utils.Tracing import propagate, traced
+
+EXPANDED_TYPES = ("required",)
+
+
+class DependencyEdge(NamedTuple):
+    """
+    A dependency of a version on another project or version.
+
+    `dependency_version_id` is the version depended on, as given by the dependency or, for followed
+    dependencies on a project only, as chosen by the resolver. It is None when neither applies.
+    """
+
+    version_id: str
+    project_id: str | None
+    dependency_version_id: str | None
+    dependency_type: str
+
+
+class DependencyGraph:
+    """
+    The resolved dependency graph of one or more versions.
+
+    `versions` maps every resolved version's ID to its data, `projects` maps the ID of every project
+    involved to its data, and `edges` lists every dependency of every resolved version, including the
+    ones that were not followed.
+    """
+
+    def __init__(self, followed: tuple = EXPANDED_TYPES):
+        self.followed = followed
+        self.roots = []
+        self.versions = {}
+        self.projects = {}
+        self.edges = []
+
+    def __len__(self):
+        return len(self.versions)
+
+    def __contains__(self, version_id: str):
+        return version_id in self.versions
+
+    @property
+    def required(self) -> list[DependencyEdge]:
+        """
+        The required dependencies.
+        """
+        return self._of_type("required")
+
+    @property
+    def optional(self) -> list[DependencyEdge]:
+        """
+        The optional dependencies.
+        """
+        return self._of_type("optional")
+
+    @property
+    def incompatible(self) -> list[DependencyEdge]:
+        """
+        The incompatibilities.
+        """
+        return self._of_type("incompatible")
+
+    @property
+    def unresolved(self) -> list[DependencyEdge]:
+        """
+        The followed dependencies whose version could not be found.
+        """
+        return [
+            edge
+            for edge in self.edges
+            if edge.dependency_type in self.followed
+            and edge.dependency_version_id not in self.versions
+        ]
+
+    def dependencies_of(self, version_id: str) -> list[DependencyEdge]:
+        """
+        The function returns the dependencies of a version.
+
+        :return: A list of `DependencyEdge` whose `version_id` is `version_id`.
+        """
+        return [edge for edge in self.edges if edge.version_id == version_id]
+
+    def dependents_of(self, version_id: str) -> list[DependencyEdge]:
+        """
+        The function returns the dependencies on a version.
+
+        :return: A list of `DependencyEdge` whose `dependency_version_id` is `version_id`.
+        """
+        return [edge for edge in self.edges if edge.dependency_version_id == version_id]
+
+    def conflicts(self) -> list[DependencyEdge]:
+        """
+        The function returns the incompatibilities that are violated by the graph itself, i.e. the ones
+        whose project or version was resolved as part of the graph.
+
+        :return: A list of `DependencyEdge`.
+        """
+        resolved_projects = {
+            version.get("project_id") for version in self.versions.values()
+        }
+        return [
+            edge
+            for edge in self.incompatible
+            if edge.dependency_version_id in self.versions
+            or edge.project_id in resolved_projects
+        ]
+
+    def _of_type(self, dependency_type: str) -> list[DependencyEdge]:
+        return [edge for edge in self.edges if edge.dependency_type == dependency_type]
+
+
+@traced("dependencies.resolve")
+def resolve(
+    version_ids: list | None = None,
+    project_ids: list | None = None,
+    loaders: list | None = None,
+    game_versions: list | None = None,
+    include_optional: bool = False,
+    include_projects: bool = True,
+    max_workers: int = 8,
+) -> DependencyGraph:
+    """
+    The function resolves the full dependency tree of one or more versions or projects. The graph is
+    expanded breadth first: every level's versions are fetched in one batched `Versions.get_multiple` call
+    and every version is fetched at most once, so a large modpack resolves in about as many round trips as
+    its tree is deep.
+
+    Dependencies on a specific version use that version. Dependencies on a project only use the version
+    already in the graph for that project, or else the newest version matching `loaders` and
+    `game_versions`.
+
+    ---
+
+    ### ---Parameters---
+
+    :param version_ids: The IDs of the versions to resolve, defaults to None
+    :type version_ids: list (optional)
+
+    :param project_ids: The IDs or slugs of projects to resolve, using their newest matching version,
+    defaults to None
+    :type project_ids: list (optional)
+
+    :param loaders: The loaders used to choose versions of projects, e.g. ["fabric"], defaults to None
+    :type loaders: list (optional)
+
+    :param game_versions: The game versions used to choose versions of projects, e.g. ["1.20.1"],
+    defaults to None
+    :type game_versions: list (optional)
+
+    :param include_optional: Whether to also follow optional dependencies, defaults to False
+    :type include_optional: bool (optional)
+
+    :param include_projects: Whether to also fetch the data of every project involved, defaults to True
+    :type include_projects: bool (optional)
+
+    :param max_workers: The maximum number of requests sent at once, defaults to 8
+    :type max_workers: int (optional)
+
+    :return: A `DependencyGraph`.
+    """
+    expanded = EXPANDED_TYPES + (("optional",) if include_optional else ())
+    graph = DependencyGraph(expanded)
+
+    # project ID → the version chosen for it, or None if it has no matching version
+    chosen = {}
+    queued = set()
+    seen = set()
+    project_futures = []
+    known_projects = set()
+
+    def newest_version(project_id):
+        versions = Versions.get_list(project_id, loaders, game_versions)
+        return versions[0] if isinstance(versions, list) and versions else None
+
+    frontier = [id for id in dict.fromkeys(version_ids or []) if id is not None]
+    seen.update(frontier)
+    graph.roots.extend(frontier)
+    picks = list(dict.fromkeys(project_ids or []))
+    queued.update(picks)
+    root_picks = set(picks)
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        while frontier or picks:
+            level = []
+            pick_results = executor.map(propagate(newest_version), picks)
+            if frontier:
+                versions, _ = Versions.get_multiple(
+                    frontier, max_workers=max_workers, return_missing=True
+                )
+                level.extend(versions)
+            for version in level:
+                chosen.setdefault(version.get("project_id"), version["id"])
+
+            for project_id, version in zip(picks, pick_results):
+                # a version of the project pulled in by ID in the meantime wins
+                if chosen.get(project_id) is None:
+                    chosen[project_id] = version["id"] if version else None
+                if chosen[project_id] is None:
+                    continue
+                if project_id in root_picks:
+                    graph.roots.append(chosen[project_id])
+                if version is not None and version["id"] == chosen[project_id]:
+                    if version["id"] not in seen:
+                        seen.add(version["id"])
+                        level.append(version)
+                        chosen.setdefault(version.get("project_id"), version["id"])
+
+            for version in level:
+                graph.versions[version["id"]] = version
+
+            frontier = []
+            picks = []
+            new_projects = []
+            for version in level:
+                new_projects.append(version.get("project_id"))
+                for dependency in version.get("dependencies") or []:
+                    edge = DependencyEdge(
+                        version["id"],
+                        dependency.get("project_id"),
+                        dependency.get("version_id"),
+                        dependency.get("dependency_type") or "required",
+                    )
+                    graph.edges.append(edge)
+                    new_projects.append(edge.project_id)
+                    if edge.dependency_type not in expanded:
+                        continue
+                    if edge.dependency_version_id is not None:
+                        if edge.dependency_version_id not in seen:
+                            seen.add(edge.dependency_version_id)
+                            frontier.append(edge.dependency_version_id)
+                    elif edge.project_id is not None and not (
+                        edge.project_id in chosen or edge.project_id in queued
+                    ):
+                        queued.add(edge.project_id)
+                        picks.append(edge.project_id)
+
+            # project data is not needed to expand the graph, so fetch it in the background
+            new_projects = [
+                id
+                for id in dict.fromkeys(new_projects)
+                if id and id not in known_projects
+            ]
+            known_projects.update(new_projects)
+            if include_projects and new_projects:
+                project_futures.append(
+                    executor.submit(
+                        propagate(Projects.get_multiple),
+                        new_projects,
+                        max_workers=max_workers,
+                    )
+                )
+
+        for future in project_futures:
+            projects = future.result()
+            if isinstance(projects, list):
+                for project in projects:
+                    graph.projects[project["id"]] = project
+
+    # point project-only dependencies at the version chosen for their project
+    edges = []
+    for edge in graph.edges:
+        if edge.dependency_type in expanded and edge.dependency_version_id is None:
+            edge = edge._replace(dependency_version_id=chosen.get(edge.project_id))
+        if edge.project_id is None and edge.dependency_version_id in graph.versions:
+            edge = edge._replace(
+                project_id=graph.versions[edge.dependency_version_id].get("project_id")
+            )
+        edges.append(edge)
+    graph.edges = edges
+    return graph
@@ -1,4 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from .utils.API_Request import request
+from .utils.Chunking import merge_in_order, request_chunked
+from .utils.Models import Project, returns
+from .utils.Result_Cache import cached, mark_incomplete
+from .utils.Tracing import propagate
 
 import json
 
@@ -6,6 +12,7 @@ api_version = "v2"
 base_url = f"https://api.modrinth.com/{api_version}"
 
 
+@cached("projects.search")
 def search(query: str, limit: int = 5, offset: int = 0, facets: list | None = None):
     """
     The function searches for data based on a query and returns a list of results.
@@ -61,7 +68,96 @@ def search(query: str, limit: int = 5, offset: int = 0, facets: list | None = No
         return "No results found" if len(response["hits"]) == 0 else response["hits"]
 
 
+def search_all(
+    query: str = "",
+    facets: list | None = None,
+    index: str | None = None,
+    page_size: int = 100,
+    max_results: int | None = None,
+    prefetch: bool = True,
+):
+    """
+    The function lazily walks every result of a search query, page by page. While the caller consumes a
+    page, the next page is fetched in the background, and iteration stops cleanly after the last hit.
+
+    ---
+
+    ### ---Parameters---
+
+    :param query: The search query string, defaults to ""
+    :type query: str (optional)
+
+    :param facets: Facets are filters that can be applied to a search query to narrow down the results
+    based on specific criteria, defaults to None
+    :type facets: list (optional)
+
+    :param index: The sorting method of the results, e.g. "relevance", "downloads" or "newest". Defaults
+    to the API's default
+    :type index: str (optional)
+
+    :param page_size: The number of results fetched per request, at most 100, defaults to 100
+    :type page_size: int (optional)
+
+    :param max_results: The maximum number of results to return. If None, every result is returned,
+    defaults to None
+    :type max_results: int (optional)
+
+    :param prefetch: Whether to fetch the next page while the current one is consumed, defaults to True
+    :type prefetch: bool (optional)
+
+    :return: An iterator of results, each represented as a dictionary of the project's search data.
+    """
+
+    # set API endpoint
+    api_search_url = f"{base_url}/search"
 
+    # the API returns at most 100 results per page
+    page_size = min(max(page_size, 1), 100)
+
+    def fetch_page(offset):
+        limit = page_size
+        if max_results is not None:
+            limit = min(limit, max_results - offset)
+        params = {
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+            "facets": json.dumps(facets) if facets is not None else None,
+            "index": index,
+        }
+        return request(api_search_url, params=params, method="GET")
+
+    def has_more(offset, total_hits):
+        if max_results is not None and offset >= max_results:
+            return False
+        return offset < total_hits
+
+    offset = 0
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = executor.submit(propagate(fetch_page), offset)
+        while page is not None:
+            response, status_code = page.result()
+            if status_code != 200:
+                print(f"Error: {response}")
+                return
+
+            hits = response.get("hits", [])
+            offset += len(hits)
+            more = bool(hits) and has_more(offset, response.get("total_hits", 0))
+
+            # request the next page before handing this one to the caller
+            page = None
+            if more and prefetch:
+                page = executor.submit(propagate(fetch_page), offset)
+
+            yield from hits
+
+            if more and not prefetch:
+                page = executor.submit(propagate(fetch_page), offset)
+
+
+@cached("projects.get")
+@returns(Project)
 def get(project_id: str | None = None, slug: str | None = None):
     """
     The function retrieves a project by its ID or slug and returns a dictionary of the project's data.
@@ -123,6 +219,7 @@ def validate(project_id: str):
     return response, status_code
 
 
+@cached("projects.dependencies")
 def dependencies(project_id: str):
     """
     The function retrieves a list of dependencies for a project with the given ID and returns a list of
@@ -161,45 +258,57 @@ def dependencies(project_id: str):
         return "Error: Invalid response format"
 
 
-def get_multiple(project_ids: list):
+@cached("projects.get_multiple")
+@returns(Project)
+def get_multiple(project_ids: list, max_workers: int = 8, return_missing: bool = False):
     """
-    The function retrieves multiple projects by their IDs and returns a list of dictionaries containing the
-    projects' data.
+    The function retrieves multiple projects by their IDs or slugs and returns a list of dictionaries
+    containing the projects' data. Large ID lists are split into URL-length-safe chunks which are
+    requested concurrently.
 
     ---
 
     ### ---Parameters---
 
-    :param project_ids: A list of project IDs to retrieve
+    :param project_ids: A list of project IDs or slugs to retrieve
     :type project_ids: list
 
-    :return: A list of dictionaries containing the projects' data. Each dictionary represents a project and
-    contains keys representing the project's data and their corresponding values.
+    :param max_workers: The maximum number of chunks requested at once, defaults to 8
+    :type max_workers: int (optional)
+
+    :param return_missing: If True, also return the IDs or slugs that were not found, defaults to False
+    :type return_missing: bool (optional)
+
+    :return: A list of dictionaries containing the projects' data, in the same order as `project_ids`.
+    Each dictionary represents a project and contains keys representing the project's data and their
+    corresponding values. If `return_missing` is True, a tuple of that list and a list of the IDs or
+    slugs that were not found.
     """
 
     # set API endpoint
     api_multiple_projects_url = f"{base_url}/projects"
 
-    # return error if no user_id or slug provided
+    # return error if no project_ids provided
     if project_ids is None:
         return "Error: No user_id or slug provided"
 
-    # params
-    params = {"user_ids": json.dumps(project_ids)}
-
-    # make request
-    response, status_code = request(
-        api_multiple_projects_url, params=params, method="GET"
-    )
+    # make requests
+    projects = []
+    for response, status_code in request_chunked(
+        api_multiple_projects_url, project_ids, max_workers=max_workers
+    ):
+        if status_code != 200:
+            print(f"Error: {response}")
+            mark_incomplete()
+        else:
+            projects.extend(response)
 
-    if status_code != 200:
-        print(f"Error: {response}")
-
-    else:
-        # return data
-        return response["projects"]
+    # return data in input order
+    projects, missing = merge_in_order(project_ids, projects, keys=("id", "slug"))
+    return (projects, missing) if return_missing else projects
 
 
+@returns(Project)
 def get_random(count: int):
     """
     The function retrieves a random selection of projects and returns a list of dictionaries containing the
@@ -1,4 +1,6 @@
 from .utils.API_Request import request
+from .utils.Models import TeamMember, returns
+from .utils.Result_Cache import cached
 
 import json
 
@@ -6,6 +8,8 @@ api_version = "v2"
 base_url = f"https://api.modrinth.com/{api_version}"
 
 
+@cached("teams.get_project_members")
+@returns(TeamMember)
 def get_project_members(project_id: str | None = None, slug: str | None = None):
     """
     The function retrieves a list of members in a project's team and returns a list of dictionaries
@@ -38,6 +42,8 @@ def get_project_members(project_id: str | None = None, slug: str | None = None):
         return response
 
 
+@cached("teams.get_team_members")
+@returns(TeamMember)
 def get_team_members(team_id: str | None = None):
     """
     The function retrieves a list of members in a team and returns a list of dictionaries
@@ -67,6 +73,8 @@ def get_team_members(team_id: str | None = None):
         return response
 
 
+@cached("teams.get_members_from_teams")
+@returns(TeamMember)
 def get_members_from_teams(team_ids: list):
     """
     The function retrieves a list of members in a team and returns a list of dictionaries
@@ -1,11 +1,14 @@
 from .utils.API_Request import request
-
-import json
+from .utils.Chunking import merge_in_order, request_chunked
+from .utils.Models import Project, User, returns
+from .utils.Result_Cache import cached, mark_incomplete
 
 api_version = "v2"
 base_url = f"https://api.modrinth.com/{api_version}"
 
 
+@cached("users.get")
+@returns(User)
 def get(user_id: str | None = None, username: str | None = None):
     """
     The function retrieves a user's data by their ID or username and returns a dictionary of the user's data.
@@ -42,6 +45,7 @@ def get(user_id: str | None = None, username: str | None = None):
         return response
 
 
+@returns(User)
 def get_authenticated():
     """
     The function retrieves the authenticated user's data and returns a dictionary of the user's data.
@@ -68,20 +72,34 @@ def get_authenticated():
         return response
 
 
-def get_multiple(user_ids: list | None = None):
+@cached("users.get_multiple")
+@returns(User)
+def get_multiple(
+    user_ids: list | None = None, max_workers: int = 8, return_missing: bool = False
+):
     """
-    The function retrieves multiple users' data by their IDs and returns a list of dictionaries containing
-    the users' data.
+    The function retrieves multiple users by their IDs or usernames and returns a list of dictionaries
+    containing the users' data. Large ID lists are split into URL-length-safe chunks which are requested
+    concurrently.
 
     ---
 
     ### ---Parameters---
 
-    :param user_ids: A list of user IDs to retrieve
+    :param user_ids: A list of user IDs or usernames to retrieve
     :type user_ids: list (optional)
 
-    :return: A list of dictionaries containing the users' data. Each dictionary represents a user and
-    contains keys representing the user's data and their corresponding values.
+    :param max_workers: The maximum number of chunks requested at once, defaults to 8
+    :type max_workers: int (optional)
+
+    :param return_missing: If True, also return the IDs or usernames that were not found, defaults to
+    False
+    :type return_missing: bool (optional)
+
+    :return: A list of dictionaries containing the users' data, in the same order as `user_ids`. Each
+    dictionary represents a user and contains keys representing the user's data and their corresponding
+    values. If `return_missing` is True, a tuple of that list and a list of the IDs or usernames that
+    were not found.
     """
 
     # set API endpoint
@@ -91,19 +109,24 @@ def get_multiple(user_ids: list | None = None):
     if user_ids is None:
         return "Error: No user_ids provided"
 
-    params = {"user_ids": json.dumps(user_ids)}
+    # make requests
+    users = []
+    for response, status_code in request_chunked(
+        api_multiple_users_url, user_ids, max_workers=max_workers
+    ):
+        if status_code != 200:
+            print(f"Error: {response}")
+            mark_incomplete()
+        else:
+            users.extend(response)
 
-    # make request
-    response, status_code = request(api_multiple_users_url, params=params, method="GET")
-
-    if status_code != 200:
-        print(f"Error: {response}")
-
-    else:
-        # return data
-        return response
+    # return data in input order
+    users, missing = merge_in_order(user_ids, users, keys=("id", "username"))
+    return (users, missing) if return_missing else users
 
 
+@cached("users.get_projects")
+@returns(Project)
 def get_projects(user_id: str | None = None, username: str | None = None):
     """
     The function retrieves a list of projects for a user with the given ID or username and returns a list of
@@ -178,6 +201,8 @@ def get_notifications(user_id: str | None = None, username: str | None = None):
         return response
 
 
+@cached("users.get_followed_projects")
+@returns(Project)
 def get_followed_projects(username: str | None = None, user_id: str | None = None):
     """
     The function retrieves a list of projects followed by a user with the given ID or username and returns a
@@ -1,4 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
 from .utils.API_Request import request
+from .utils.Chunking import merge_in_order, post_chunked, request_chunked
+from .utils.Download import download_many
+from .utils.Hash_Store import get_hash_store
+from .utils.Hashing import DEFAULT_PATTERNS, HashStats, hash_directory
+from .utils.Models import Version, returns
+from .utils.Result_Cache import cached, mark_incomplete
+from .utils.Tracing import propagate
 
 import json
 
@@ -6,6 +16,8 @@ api_version = "v2"
 base_url = f"https://api.modrinth.com/{api_version}"
 
 
+@cached("versions.get")
+@returns(Version)
 def get(version_id: str):
     """
     The function retrieves a version of a project by its ID and returns a dictionary of the version's data.
@@ -39,6 +51,8 @@ def get(version_id: str):
         return response
 
 
+@cached("versions.get_list")
+@returns(Version)
 def get_list(
     project_id: str,
     loaders: list | None = None,
@@ -76,8 +90,10 @@ def get_list(
 
     # params
     params = {
-        "loaders": json.dumps(loaders),
-        "game_versions": json.dumps(game_versions),
+        "loaders": json.dumps(loaders) if loaders is not None else None,
+        "game_versions": (
+            json.dumps(game_versions) if game_versions is not None else None
+        ),
         "featured": "true" if featured else "false",
     }
 
@@ -96,10 +112,13 @@ def get_list(
         return response
 
 
-def get_multiple(version_ids: list):
+@cached("versions.get_multiple")
+@returns(Version)
+def get_multiple(version_ids: list, max_workers: int = 8, return_missing: bool = False):
     """
-    The function retrieves multiple versions of a project by their IDs and returns a list of dictionaries
-    containing the versions' data.
+    The function retrieves multiple versions by their IDs and returns a list of dictionaries containing
+    the versions' data. Large ID lists are split into URL-length-safe chunks which are requested
+    concurrently.
 
     ---
 
@@ -108,36 +127,47 @@ def get_multiple(version_ids: list):
     :param version_ids: A list of version IDs to retrieve
     :type version_ids: list
 
-    :return: A list of dictionaries containing the versions' data. Each dictionary represents a version and
-    contains keys representing the version's data and their corresponding values.
+    :param max_workers: The maximum number of chunks requested at once, defaults to 8
+    :type max_workers: int (optional)
+
+    :param return_missing: If True, also return the IDs that were not found, defaults to False
+    :type return_missing: bool (optional)
+
+    :return: A list of dictionaries containing the versions' data, in the same order as `version_ids`.
+    Each dictionary represents a version and contains keys representing the version's data and their
+    corresponding values. If `return_missing` is True, a tuple of that list and a list of the IDs that
+    were not found.
     """
 
     # set API endpoint
     api_multiple_versions_url = f"{base_url}/versions"
 
-    # return error if no user_id or slug provided
+    # return error if no version_ids provided
     if version_ids is None:
         return "Error: No user_id or slug provided"
 
-    # params
-    params = {"user_ids": json.dumps(version_ids)}
-
-    # make request
-    response, status_code = request(
-        api_multiple_versions_url, params=params, method="GET"
-    )
-
-    if status_code != 200:
-        print(f"Error: {response}")
-
-    else:
-        # return data
-        return response
-
-
-def get_from_hash(version_hash: str):
+    # make requests
+    versions = []
+    for response, status_code in request_chunked(
+        api_multiple_versions_url, version_ids, max_workers=max_workers
+    ):
+        if status_code != 200:
+            print(f"Error: {response}")
+            mark_incomplete()
+        else:
+            versions.extend(response)
+
+    # return data in input order
+    versions, missing = merge_in_order(version_ids, versions, keys=("id",))
+    return (versions, missing) if return_missing else versions
+
+
+@cached("versions.get_from_hash")
+@returns(Version)
+def get_from_hash(version_hash: str, algorithm: str = "sha1"):
     """
     The function retrieves a version of a project by its hash and returns a dictionary of the version's data.
+    If a hash store is installed, it is consulted first and updated with the result.
 
     ---
 
@@ -146,6 +176,9 @@ def get_from_hash(version_hash: str):
     :param version_hash: The hash of the version to retrieve
     :type version_hash: str
 
+    :param algorithm: The algorithm of the hash, "sha1" or "sha512", defaults to "sha1"
+    :type algorithm: str (optional)
+
     :return: the result of a version query based on the provided parameters. The function returns a
     dictionary of version data, with each key representing a piece of data and its corresponding value.
     """
@@ -157,17 +190,372 @@ def get_from_hash(version_hash: str):
     if version_hash is None:
         return "Error: No version_hash provided"
 
+    # check the hash store
+    store = get_hash_store()
+    if store is not None:
+        found = store.get_many([version_hash], algorithm)
+        if version_hash in found:
+            return found[version_hash]
+
+    # params
+    params = {"algorithm": algorithm}
+
     # make request
-    response, status_code = request(api_project_versions_hash_url, method="GET")
+    response, status_code = request(
+        api_project_versions_hash_url, params=params, method="GET"
+    )
 
     if status_code != 200:
+        if store is not None and status_code == 404:
+            store.put_missing([version_hash], algorithm)
         print(f"Error: {response}")
 
     else:
+        if store is not None:
+            store.put(version_hash, response, algorithm)
         # return data
         return response
 
 
+@returns(Version, keyed=True)
+def get_from_hashes(
+    hashes: list,
+    algorithm: str = "sha1",
+    chunk_size: int = 1000,
+    max_workers: int = 4,
+):
+    """
+    The function retrieves the versions of many files by their hashes in bulk and returns a dictionary
+    mapping each hash to its version's data. Large hash lists are split into chunks which are requested
+    concurrently. If a hash store is installed, it is consulted first and updated with the results.
+
+    ---
+
+    ### ---Parameters---
+
+    :param hashes: The hashes of the files to retrieve versions for
+    :type hashes: list
+
+    :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+    :type algorithm: str (optional)
+
+    :param chunk_size: The maximum number of hashes sent per request, defaults to 1000
+    :type chunk_size: int (optional)
+
+    :param max_workers: The maximum number of chunks requested at once, defaults to 4
+    :type max_workers: int (optional)
+
+    :return: A dictionary mapping each hash that has a version to a dictionary of the version's data, in
+    the same order as `hashes`. Hashes without a version are left out.
+    """
+
+    # set API endpoint
+    api_versions_from_hashes_url = f"{base_url}/version_files"
+
+    # return error if no hashes provided
+    if hashes is None:
+        return "Error: No hashes provided"
+
+    # check the hash store
+    store = get_hash_store()
+    known = store.get_many(hashes, algorithm) if store is not None else {}
+    unknown = [version_hash for version_hash in hashes if version_hash not in known]
+
+    # make requests
+    found = {}
+    failed = False
+    for response, status_code in post_chunked(
+        api_versions_from_hashes_url,
+        unknown,
+        "hashes",
+        data={"algorithm": algorithm},
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+    ):
+        if status_code != 200:
+            failed = True
+            print(f"Error: {response}")
+        else:
+            found.update(response)
+
+    if store is not None:
+        store.put_many(found, algorithm)
+        if not failed:
+            store.put_missing([h for h in unknown if h not in found], algorithm)
+
+    # return data in input order
+    versions = known | found
+    return {
+        version_hash: versions[version_hash]
+        for version_hash in hashes
+        if versions.get(version_hash) is not None
+    }
+
+
+@returns(Version, keyed=True)
+def get_latest_from_hashes(
+    hashes: list,
+    loaders: list | None = None,
+    game_versions: list | None = None,
+    algorithm: str = "sha1",
+    outdated_only: bool = False,
+    chunk_size: int = 1000,
+    max_workers: int = 4,
+):
+    """
+    The function retrieves the latest versions of the projects of many files by their hashes in bulk, for
+    checking many mods for updates at once. Large hash lists are split into chunks which are requested
+    concurrently.
+
+    ---
+
+    ### ---Parameters---
+
+    :param hashes: The hashes of the files to check for updates
+    :type hashes: list
+
+    :param loaders: The loaders the latest versions must support, e.g. ["fabric"], defaults to None
+    :type loaders: list (optional)
+
+    :param game_versions: The game versions the latest versions must support, e.g. ["1.20.1"], defaults
+    to None
+    :type game_versions: list (optional)
+
+    :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+    :type algorithm: str (optional)
+
+    :param outdated_only: If True, leave out the hashes whose file is already in its latest version,
+    defaults to False
+    :type outdated_only: bool (optional)
+
+    :param chunk_size: The maximum number of hashes sent per request, defaults to 1000
+    :type chunk_size: int (optional)
+
+    :param max_workers: The maximum number of chunks requested at once, defaults to 4
+    :type max_workers: int (optional)
+
+    :return: A dictionary mapping each hash that has a matching latest version to a dictionary of that
+    version's data, in the same order as `hashes`. Hashes without one are left out.
+    """
+
+    # set API endpoint
+    api_latest_versions_url = f"{base_url}/version_files/update"
+
+    # return error if no hashes provided
+    if hashes is None:
+        return "Error: No hashes provided"
+
+    # params
+    data = {"algorithm": algorithm}
+    if loaders is not None:
+        data["loaders"] = loaders
+    if game_versions is not None:
+        data["game_versions"] = game_versions
+
+    # make requests
+    found = {}
+    for response, status_code in post_chunked(
+        api_latest_versions_url,
+        hashes,
+        "hashes",
+        data=data,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+    ):
+        if status_code != 200:
+            print(f"Error: {response}")
+        else:
+            found.update(response)
+
+    # return data in input order
+    return {
+        version_hash: found[version_hash]
+        for version_hash in hashes
+        if found.get(version_hash) is not None
+        and not (
+            outdated_only and _has_file(found[version_hash], version_hash, algorithm)
+        )
+    }
+
+
+def _has_file(version: dict, file_hash: str, algorithm: str) -> bool:
+    return any(
+        file.get("hashes", {}).get(algorithm) == file_hash
+        for file in version.get("files") or []
+    )
+
+
+def get_from_directory(
+    directory: str,
+    algorithm: str = "sha1",
+    patterns: list | None = None,
+    recursive: bool = True,
+    batch_size: int = 1000,
+    max_workers: int | None = None,
+    stats: HashStats | None = None,
+):
+    """
+    The function identifies the mod files in a directory. Files are hashed in parallel with bounded memory,
+    and their hashes are streamed to the bulk hash lookup in batches while hashing continues. Files that
+    cannot be read are reported and skipped.
+
+    ---
+
+    ### ---Parameters---
+
+    :param directory: The mods or instance folder to scan
+    :type directory: str
+
+    :param algorithm: The hash algorithm to look files up by, "sha1" or "sha512", defaults to "sha1"
+    :type algorithm: str (optional)
+
+    :param patterns: Glob patterns of the file names to include. Defaults to .jar, .zip and .mrpack files
+    :type patterns: list (optional)
+
+    :param recursive: Whether to include subdirectories, defaults to True
+    :type recursive: bool (optional)
+
+    :param batch_size: The number of hashes looked up per request, defaults to 1000
+    :type batch_size: int (optional)
+
+    :param max_workers: The number of files hashed at once. Defaults to the number of CPUs
+    :type max_workers: int (optional)
+
+    :param stats: A `HashStats` updated as files are hashed, for reporting throughput, defaults to None
+    :type stats: HashStats (optional)
+
+    :return: A dictionary mapping the path of each identified file to a dictionary of its version's data.
+    Files without a version are left out.
+    """
+
+    # return error if no directory provided
+    if directory is None:
+        return "Error: No directory provided"
+
+    files = hash_directory(
+        directory,
+        patterns=patterns or DEFAULT_PATTERNS,
+        recursive=recursive,
+        max_workers=max_workers,
+        stats=stats,
+        on_error=lambda path, err: print(f"Error: {path}: {err}"),
+    )
+
+    # look full batches up in the background while the next batch is hashed
+    lookups = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batch = {}
+        for file_hashes in files:
+            batch.setdefault(getattr(file_hashes, algorithm), []).append(
+                file_hashes.path
+            )
+            if len(batch) >= batch_size:
+                lookups.append(
+                    executor.submit(propagate(_lookup_batch), batch, algorithm)
+                )
+                batch = {}
+        if batch:
+            lookups.append(executor.submit(propagate(_lookup_batch), batch, algorithm))
+
+    versions = {}
+    for lookup in lookups:
+        versions.update(lookup.result())
+    return versions
+
+
+def _lookup_batch(batch: dict, algorithm: str) -> dict:
+    # map the versions of a batch of hashes back to every path that had the hash
+    found = get_from_hashes(list(batch), algorithm=algorithm, chunk_size=len(batch))
+    return {
+        path: version
+        for version_hash, version in found.items()
+        for path in batch[version_hash]
+    }
+
+
+def download_files(
+    versions: dict | list,
+    directory: str,
+    primary_only: bool = False,
+    max_workers: int = 4,
+    bandwidth_limit: float | None = None,
+    progress: Callable[[str, int], None] | None = None,
+    segments: int = 1,
+    segment_progress: Callable[[str, int, int, int], None] | None = None,
+):
+    """
+    The function downloads the files of one or more versions into a directory. Files are streamed to disk
+    in chunks, verified against their sha1/sha512 while writing, and interrupted downloads are resumed.
+    Large files can be split into byte ranges downloaded over several connections at once.
+
+    ---
+
+    ### ---Parameters---
+
+    :param versions: A version, or a list of versions, as returned by `get`, `get_list` or `get_multiple`
+    :type versions: dict | list
+
+    :param directory: The directory to save the files to
+    :type directory: str
+
+    :param primary_only: Whether to only download each version's primary file, defaults to False
+    :type primary_only: bool (optional)
+
+    :param max_workers: The maximum number of simultaneous connections, shared by whole files and the
+    segments of segmented files, defaults to 4
+    :type max_workers: int (optional)
+
+    :param bandwidth_limit: The maximum combined download speed in bytes per second. If None, the speed
+    is not limited, defaults to None
+    :type bandwidth_limit: float (optional)
+
+    :param progress: A function called with the path and number of bytes downloaded so far after each
+    chunk, defaults to None
+    :type progress: Callable[[str, int], None] (optional)
+
+    :param segments: The maximum number of connections used per large file. Files smaller than 16 MiB
+    and servers without range support always use one connection, defaults to 1
+    :type segments: int (optional)
+
+    :param segment_progress: A function called with the path, segment index, bytes downloaded in the
+    segment so far and segment length after each chunk of a segmented download, defaults to None
+    :type segment_progress: Callable[[str, int, int, int], None] (optional)
+
+    :return: A list of `DownloadResult`, one per file. `result.ok` tells whether the file was downloaded
+    and verified, `result.error` holds the error otherwise, and `result.throughput` gives the speed in
+    bytes per second.
+    """
+
+    # return error if no versions provided
+    if versions is None:
+        return "Error: No versions provided"
+
+    if isinstance(versions, dict):
+        versions = [versions]
+
+    files = []
+    for version in versions:
+        version_files = version.get("files", [])
+        if primary_only:
+            primary = [file for file in version_files if file.get("primary")]
+            version_files = primary or version_files[:1]
+        files.extend(version_files)
+
+    results = download_many(
+        files,
+        directory,
+        max_workers=max_workers,
+        bandwidth_limit=bandwidth_limit,
+        progress=progress,
+        segments=segments,
+        segment_progress=segment_progress,
+    )
+    for result in results:
+        if not result.ok:
+            print(f"Error: {result.error}")
+    return results
+
+
 def edit_version(
     version_id: str,
     name: str,
@@ -10,10 +10,63 @@ License: MIT
 ---
 """
 
+from . import Dependencies
 from . import Projects
 from . import Teams
 from . import Users
 from . import Versions
 from .utils.Auth import set_auth
+from .utils.Hash_Store import HashStore, set_hash_store
+from .utils.Hashing import HashStats, hash_directory, hash_file
+from .utils.HTTP_Cache import HTTPCache, set_http_cache
+from .utils.Json import set_json_decoder
+from .utils.Metrics import Metrics, RequestEvent, set_metrics
+from .utils.Models import Project, TeamMember, User, Version, set_heavy_fields, set_models
+from .utils.Rate_Limit import RateLimiter, set_rate_limiter
+from .utils.Result_Cache import ResultCache, set_result_cache
+from .utils.Retry import CircuitBreaker, CircuitOpenError, RetryPolicy, set_circuit_breaker, set_retry_policy
+from .utils.Session import Session, close_session, set_session
+from .utils.Single_Flight import SingleFlight, set_single_flight
+from .utils.Tracing import Tracer, set_tracer
 
-__all__ = ['Projects', 'Teams', 'Users', 'Versions', 'set_auth']
+__all__ = [
+    'Dependencies',
+    'Projects',
+    'Teams',
+    'Users',
+    'Versions',
+    'set_auth',
+    'Session',
+    'set_session',
+    'close_session',
+    'RateLimiter',
+    'set_rate_limiter',
+    'RetryPolicy',
+    'set_retry_policy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'set_circuit_breaker',
+    'HTTPCache',
+    'set_http_cache',
+    'set_json_decoder',
+    'Metrics',
+    'RequestEvent',
+    'set_metrics',
+    'Project',
+    'Version',
+    'User',
+    'TeamMember',
+    'set_models',
+    'set_heavy_fields',
+    'ResultCache',
+    'set_result_cache',
+    'SingleFlight',
+    'set_single_flight',
+    'Tracer',
+    'set_tracer',
+    'HashStore',
+    'set_hash_store',
+    'HashStats',
+    'hash_directory',
+    'hash_file',
+]
@@ -4,9 +4,19 @@ This module provides a function for making HTTP GET requests using the `requests
 
 import json
 import os
+import time
 
 import requests
 
+from .HTTP_Cache import HTTPCache, get_http_cache
+from .Json import loads
+from .Metrics import endpoint_template, get_metrics
+from .Rate_Limit import get_rate_limiter
+from .Retry import CircuitOpenError, get_circuit_breaker, get_retry_policy
+from .Session import get_session
+from .Single_Flight import get_single_flight
+from .Tracing import get_tracer
+
 current_dir = os.path.dirname(__file__)
 
 parent_dir = os.path.dirname(current_dir)
@@ -43,24 +53,158 @@ def request(
     if params is None:
         params = {}
     if method == "GET":
-        response = requests.get(url, params=params, headers=auth, timeout=10)
-        try:
-            response.raise_for_status()
-            return response.json(), response.status_code
-        except requests.exceptions.RequestException as err:
-            return err, response.status_code
+        # identical GETs in flight at the same time share one response
+        flight = get_single_flight()
+        if flight is None:
+            body, status_code = _get(url, params)
+        else:
+            key = HTTPCache.key(url, params, auth)
+            body, status_code = flight.do(key, lambda: _get(url, params))
+        if isinstance(body, Exception):
+            return body, status_code
+        if not isinstance(body, bytes):
+            # a revalidated response is answered with its already decoded body
+            return body, status_code
+        return _decode(body), status_code
 
     elif method == "Patch":
-        response = requests.patch(url, json=data, headers=auth, timeout=10, files=files)
+        try:
+            response = _send("PATCH", url, json=data, headers=auth, files=files)
+        except CircuitOpenError as err:
+            return err, None
         try:
             response.raise_for_status()
             return response.status_code
         except requests.exceptions.RequestException as err:
             return err, response.status_code
 
-    # TODO: Add POST and DELETE methods
+    # TODO: Add DELETE method
     elif method == "POST":
-        pass
+        try:
+            response = _send("POST", url, params=params, json=data, headers=auth)
+        except CircuitOpenError as err:
+            return err, None
+        try:
+            response.raise_for_status()
+            return _decode(response.content), response.status_code
+        except requests.exceptions.RequestException as err:
+            return err, response.status_code
 
     elif method == "Delete":
         pass
+
+
+def _decode(body: bytes):
+    tracer = get_tracer()
+    if tracer is None:
+        return loads(body)
+    with tracer.span("decode", size=len(body)):
+        return loads(body)
+
+
+def _get(url: str, params: dict) -> tuple[object, int | None]:
+    # revalidate cached responses instead of downloading them again
+    cache = get_http_cache()
+    entry = None
+    headers = auth
+    if cache is not None:
+        cache_key = cache.key(url, params, auth)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            headers = (auth or {}) | entry.validators()
+
+    try:
+        response = _send("GET", url, params=params, headers=headers)
+    except CircuitOpenError as err:
+        # fail fast with the same (error, status) result as any other failed request
+        return err, None
+    if entry is not None and response.status_code == 304:
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.count("http_cache_revalidations", endpoint_template(url))
+        return cache.decoded(cache_key, entry, _decode), 200
+    try:
+        response.raise_for_status()
+        if cache is not None:
+            cache.store(cache_key, response.headers, response.content)
+        return response.content, response.status_code
+    except requests.exceptions.RequestException as err:
+        return err, response.status_code
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    # pace each attempt through the shared rate limiter and feed the response headers back into it,
+    # retrying transient failures as the retry policy allows
+    limiter = get_rate_limiter()
+    policy = get_retry_policy()
+    breaker = get_circuit_breaker()
+    metrics = get_metrics()
+    tracer = get_tracer()
+    endpoint = None
+    if metrics is not None or tracer is not None:
+        endpoint = endpoint_template(url)
+    if policy is not None:
+        policy.record_request()
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.check()
+        if limiter is not None:
+            waited = limiter.acquire()
+            if metrics is not None and waited > 0:
+                metrics.count("rate_limit_waits", endpoint)
+                metrics.count("rate_limit_wait_seconds", endpoint, waited)
+        event = span = None
+        if metrics is not None:
+            event = metrics.start(method, url, attempt, endpoint)
+        if tracer is not None:
+            span = tracer.start(
+                f"{method} {endpoint}",
+                "request",
+                method=method,
+                url=url,
+                attempt=attempt,
+            )
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except Exception as err:
+            if event is not None:
+                metrics.finish(event, None, error=err)
+            if span is not None:
+                tracer.finish(span, error=repr(err))
+            if not isinstance(
+                err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            ):
+                raise
+            if breaker is not None:
+                breaker.record(False)
+            delay = policy.should_retry(method, attempt) if policy is not None else None
+            if delay is None:
+                raise
+        else:
+            if event is not None:
+                metrics.finish(event, response.status_code, len(response.content))
+            if span is not None:
+                # requests only reports the time until the response headers were parsed
+                span.marks["response_start"] = (
+                    span.start + response.elapsed.total_seconds()
+                )
+                tracer.finish(
+                    span, status=response.status_code, size=len(response.content)
+                )
+            if limiter is not None:
+                limiter.update(response.headers, response.status_code)
+            if breaker is not None:
+                breaker.record(response.status_code < 500)
+            delay = None
+            if policy is not None:
+                delay = policy.should_retry(
+                    method, attempt, response.status_code, response.headers
+                )
+            if delay is None:
+                return response
+            response.close()
+        if metrics is not None:
+            metrics.count("retries", endpoint)
+        time.sleep(delay)
+        attempt += 1
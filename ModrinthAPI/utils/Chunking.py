@@ -0,0 +1,193 @@
+"""
+This module provides helpers for splitting large ID lists into URL-length-safe chunks and merging the
+chunked responses back together.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from .API_Request import request
+from .Tracing import propagate, traced
+
+# Conservative budget for the encoded `ids` query value, well below the URL limits of common servers.
+MAX_QUERY_LENGTH = 4000
+
+_SEPARATOR_LENGTH = len(quote(","))
+
+
+def chunk_ids(ids: list, max_length: int = MAX_QUERY_LENGTH) -> list[list]:
+    """
+    The function splits a list of IDs into chunks whose JSON-encoded, URL-quoted form stays within
+    `max_length` characters. Duplicate IDs are dropped, keeping the first occurrence.
+
+    ---
+
+    ### ---Parameters---
+
+    :param ids: The IDs to split
+    :type ids: list
+
+    :param max_length: The maximum encoded length of a single chunk, defaults to MAX_QUERY_LENGTH
+    :type max_length: int (optional)
+
+    :return: A list of ID chunks, in input order.
+    """
+    chunks = []
+    chunk = []
+    # the surrounding brackets of the JSON list
+    length = len(quote("[]"))
+    for id in dict.fromkeys(ids):
+        id_length = len(quote(json.dumps(id)))
+        if chunk and length + _SEPARATOR_LENGTH + id_length > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = len(quote("[]"))
+        if chunk:
+            length += _SEPARATOR_LENGTH
+        chunk.append(id)
+        length += id_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+@traced("request_chunked")
+def request_chunked(url: str, ids: list, max_workers: int = 8) -> list[tuple]:
+    """
+    The function requests `url` once per chunk of `ids`, passing each chunk as the `ids` query parameter,
+    with up to `max_workers` chunks in flight at once.
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL of the multi-get endpoint
+    :type url: str
+
+    :param ids: The IDs to request
+    :type ids: list
+
+    :param max_workers: The maximum number of chunks requested at once, defaults to 8
+    :type max_workers: int (optional)
+
+    :return: A list of `(response, status_code)` tuples, one per chunk.
+    """
+    chunks = chunk_ids(ids)
+
+    def fetch(chunk):
+        return request(url, params={"ids": json.dumps(chunk)}, method="GET")
+
+    if len(chunks) <= 1:
+        return [fetch(chunk) for chunk in chunks]
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        return list(executor.map(propagate(fetch), chunks))
+
+
+def chunk_list(items: list, chunk_size: int) -> list[list]:
+    """
+    The function splits a list into chunks of at most `chunk_size` items. Duplicate items are dropped,
+    keeping the first occurrence.
+
+    ---
+
+    ### ---Parameters---
+
+    :param items: The items to split
+    :type items: list
+
+    :param chunk_size: The maximum number of items in a chunk
+    :type chunk_size: int
+
+    :return: A list of chunks, in input order.
+    """
+    items = list(dict.fromkeys(items))
+    chunk_size = max(chunk_size, 1)
+    return [
+        items[start : start + chunk_size] for start in range(0, len(items), chunk_size)
+    ]
+
+
+@traced("post_chunked")
+def post_chunked(
+    url: str,
+    items: list,
+    field: str,
+    data: dict | None = None,
+    chunk_size: int = 1000,
+    max_workers: int = 4,
+) -> list[tuple]:
+    """
+    The function sends one POST request per chunk of `items`, with each chunk placed under `field` in the
+    JSON body alongside `data`, and up to `max_workers` chunks in flight at once.
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL of the bulk endpoint
+    :type url: str
+
+    :param items: The items to send
+    :type items: list
+
+    :param field: The body field that holds each chunk, e.g. "hashes"
+    :type field: str
+
+    :param data: Additional fields sent with every chunk, defaults to None
+    :type data: dict (optional)
+
+    :param chunk_size: The maximum number of items per request, defaults to 1000
+    :type chunk_size: int (optional)
+
+    :param max_workers: The maximum number of chunks requested at once, defaults to 4
+    :type max_workers: int (optional)
+
+    :return: A list of `(response, status_code)` tuples, one per chunk.
+    """
+    chunks = chunk_list(items, chunk_size)
+
+    def fetch(chunk):
+        return request(url, method="POST", data=(data or {}) | {field: chunk})
+
+    if len(chunks) <= 1:
+        return [fetch(chunk) for chunk in chunks]
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        return list(executor.map(propagate(fetch), chunks))
+
+
+def merge_in_order(ids: list, items: list, keys: tuple = ("id",)) -> tuple[list, list]:
+    """
+    The function orders the items returned by a multi-get endpoint to match the requested IDs.
+
+    ---
+
+    ### ---Parameters---
+
+    :param ids: The requested IDs, in the order results should be returned
+    :type ids: list
+
+    :param items: The items returned by the endpoint, in any order
+    :type items: list
+
+    :param keys: The item fields an ID may match, e.g. ("id", "slug"), defaults to ("id",)
+    :type keys: tuple (optional)
+
+    :return: A tuple of the matched items in input order and the list of IDs that had no match.
+    """
+    index = {}
+    for item in items:
+        for key in keys:
+            if item.get(key) is not None:
+                index.setdefault(item[key], item)
+
+    found = []
+    missing = []
+    for id in dict.fromkeys(ids):
+        if id in index:
+            found.append(index[id])
+        else:
+            missing.append(id)
+    return found, missing
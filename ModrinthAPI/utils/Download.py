@@ -0,0 +1,458 @@
+"""
+This module provides a streaming, resumable file downloader with inline hash verification, used to download
+the files of versions.
+"""
+
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+import requests
+
+from .Session import get_session
+from .Tracing import propagate, traced
+
+CHUNK_SIZE = 64 * 1024
+
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+
+class DownloadResult(NamedTuple):
+    """
+    The outcome of downloading a single file. `error` holds the error when the download failed, in which
+    case any partial data of a single-connection download is kept next to `path` with a ".part" suffix so
+    the download can be resumed. Segmented downloads cannot be resumed and are started over.
+    """
+
+    url: str
+    path: str
+    size: int
+    error: BaseException | None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of bytes downloaded per second.
+        """
+        return self.size / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BandwidthLimiter:
+    """
+    A thread-safe token bucket capping the combined download speed of every download sharing it.
+
+    ---
+
+    ### ---Parameters---
+
+    :param bytes_per_second: The maximum combined download speed in bytes per second
+    :type bytes_per_second: float
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._available = 0.0
+        self._updated = time.monotonic()
+
+    def consume(self, amount: int):
+        """
+        The function blocks until `amount` bytes may be transferred.
+
+        :return: None
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(
+                self.bytes_per_second,
+                self._available + (now - self._updated) * self.bytes_per_second,
+            )
+            self._updated = now
+            self._available -= amount
+            wait = -self._available / self.bytes_per_second
+        if wait > 0:
+            time.sleep(wait)
+
+
+@traced("download_file")
+def download_file(
+    url: str,
+    path: str,
+    hashes: dict | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    bandwidth: BandwidthLimiter | None = None,
+    progress: Callable[[str, int], None] | None = None,
+    segments: int = 1,
+    min_segment_size: int = MIN_SEGMENT_SIZE,
+    segment_progress: Callable[[str, int, int, int], None] | None = None,
+    connections: threading.Semaphore | None = None,
+) -> DownloadResult:
+    """
+    The function streams a file to disk in chunks, never holding more than one chunk in memory, and
+    verifies its hashes while writing. The file is written to `path` + ".part" and only moved to `path`
+    once it is complete and verified. An existing ".part" file is resumed with an HTTP Range request, or
+    started over if the server rejects the range or answers with a different one, and an existing file at
+    `path` whose hashes already match is not downloaded again.
+
+    With `segments` above 1, files of at least two segments' worth are split into byte ranges fetched over
+    several pooled connections at once and written in place into a preallocated `path` + ".segments"
+    file, which is discarded if the download is interrupted. Servers that do not support ranges fall back
+    to a single connection.
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL of the file
+    :type url: str
+
+    :param path: The path to save the file to
+    :type path: str
+
+    :param hashes: The expected hashes of the file, e.g. {"sha1": ..., "sha512": ...}, as found in a
+    version's `files`. Checked hashes must all match, defaults to None
+    :type hashes: dict (optional)
+
+    :param chunk_size: The number of bytes read from the network at a time, defaults to 64 KiB
+    :type chunk_size: int (optional)
+
+    :param bandwidth: A limiter shared by downloads to cap their combined speed, defaults to None
+    :type bandwidth: BandwidthLimiter (optional)
+
+    :param progress: A function called with the path and number of bytes downloaded so far after each
+    chunk, defaults to None
+    :type progress: Callable[[str, int], None] (optional)
+
+    :param segments: The maximum number of connections used to download the file, defaults to 1
+    :type segments: int (optional)
+
+    :param min_segment_size: The smallest segment worth its own connection, defaults to 8 MiB
+    :type min_segment_size: int (optional)
+
+    :param segment_progress: A function called with the path, segment index, bytes downloaded in the
+    segment so far and segment length after each chunk of a segmented download, defaults to None
+    :type segment_progress: Callable[[str, int, int, int], None] (optional)
+
+    :param connections: A semaphore shared by downloads to cap their combined number of open connections,
+    each segment holding its own, defaults to None
+    :type connections: threading.Semaphore (optional)
+
+    :return: A `DownloadResult`.
+    """
+    started = time.perf_counter()
+    expected = {
+        algorithm: value.lower()
+        for algorithm, value in (hashes or {}).items()
+        if algorithm in ("sha1", "sha512") and value
+    }
+
+    if os.path.exists(path) and expected and _matches(_hash_file(path), expected):
+        return DownloadResult(url, path, os.path.getsize(path), None)
+
+    # an interrupted segmented download leaves a file with holes, which cannot be resumed
+    segments_path = f"{path}.segments"
+    if os.path.exists(segments_path):
+        os.remove(segments_path)
+
+    part_path = f"{path}.part"
+    if segments > 1 and not os.path.exists(part_path):
+        with _connection(connections):
+            size = _probe_size(url)
+        if size is not None and size >= min_segment_size * 2:
+            return _download_segmented(
+                url,
+                path,
+                size,
+                expected,
+                min(segments, size // min_segment_size),
+                chunk_size,
+                bandwidth,
+                progress,
+                segment_progress,
+                started,
+                connections,
+            )
+
+    hashers = _new_hashers()
+    offset = 0
+    if os.path.exists(part_path):
+        # re-hash what is already on disk so verification covers the whole file
+        hashers = _hash_file(part_path)
+        offset = os.path.getsize(part_path)
+        if expected and _matches(hashers, expected):
+            # the download completed but was stopped before the file was moved into place
+            os.replace(part_path, path)
+            return DownloadResult(
+                url, path, offset, None, time.perf_counter() - started
+            )
+
+    try:
+        # one connection, held until the file has been received
+        with _connection(connections):
+            response = _request_from(url, offset)
+            if offset and (
+                response.status_code == 416
+                or response.status_code == 206
+                and _range_start(response) != offset
+            ):
+                # the ".part" file is at least as large as the file yet did not verify, or the server
+                # answered with another range than the one requested; start over
+                response.close()
+                response = _request_from(url, 0)
+            with response:
+                if offset and response.status_code == 206:
+                    mode = "ab"
+                else:
+                    # the server ignored or rejected the range; start over
+                    response.raise_for_status()
+                    hashers = _new_hashers()
+                    offset = 0
+                    mode = "wb"
+
+                length = response.headers.get("Content-Length", "")
+                remaining = int(length) if length.isdigit() else None
+                with open(part_path, mode) as file:
+                    for chunk in response.iter_content(chunk_size):
+                        if bandwidth is not None:
+                            bandwidth.consume(len(chunk))
+                        file.write(chunk)
+                        for hasher in hashers.values():
+                            hasher.update(chunk)
+                        offset += len(chunk)
+                        if remaining is not None:
+                            remaining -= len(chunk)
+                        if progress is not None:
+                            progress(path, offset)
+                if remaining:
+                    # the received data is kept so the download can be resumed
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Download of {url} ended {remaining} bytes early"
+                    )
+    except (requests.exceptions.RequestException, OSError) as err:
+        return DownloadResult(url, path, offset, err, time.perf_counter() - started)
+
+    elapsed = time.perf_counter() - started
+    if not _matches(hashers, expected):
+        os.remove(part_path)
+        error = ValueError(f"Hash mismatch for {url}")
+        return DownloadResult(url, path, offset, error, elapsed)
+
+    os.replace(part_path, path)
+    return DownloadResult(url, path, offset, None, elapsed)
+
+
+def _request_from(url: str, offset: int) -> requests.Response:
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    return get_session().request("GET", url, headers=headers, stream=True)
+
+
+def _probe_size(url: str) -> int | None:
+    # ask for the first byte; a 206 with a Content-Range means the server supports ranges
+    try:
+        with get_session().request(
+            "GET",
+            url,
+            headers={"Range": "bytes=0-0", "Accept-Encoding": "identity"},
+            stream=True,
+        ) as response:
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code != 206 or "/" not in content_range:
+                return None
+            total = content_range.rsplit("/", 1)[1]
+            return int(total) if total.isdigit() else None
+    except requests.exceptions.RequestException:
+        return None
+
+
+def _download_segmented(
+    url: str,
+    path: str,
+    size: int,
+    expected: dict,
+    segments: int,
+    chunk_size: int,
+    bandwidth: BandwidthLimiter | None,
+    progress: Callable[[str, int], None] | None,
+    segment_progress: Callable[[str, int, int, int], None] | None,
+    started: float,
+    connections: threading.Semaphore | None,
+) -> DownloadResult:
+    part_path = f"{path}.segments"
+    with open(part_path, "wb") as file:
+        file.truncate(size)
+
+    bounds = [size * index // segments for index in range(segments + 1)]
+    lock = threading.Lock()
+    downloaded = [0]
+
+    def fetch(index):
+        start, end = bounds[index], bounds[index + 1]
+        position = start
+        headers = {"Range": f"bytes={start}-{end - 1}", "Accept-Encoding": "identity"}
+        with _connection(connections), get_session().request(
+            "GET", url, headers=headers, stream=True
+        ) as response, open(part_path, "r+b") as file:
+            if response.status_code != 206:
+                response.raise_for_status()
+                raise requests.exceptions.InvalidHeader(
+                    f"Range request for {url} returned {response.status_code}"
+                )
+            if _range_start(response) != start:
+                raise requests.exceptions.InvalidHeader(
+                    f"Range request for {url} returned another range"
+                )
+            file.seek(start)
+            for chunk in response.iter_content(chunk_size):
+                chunk = chunk[: end - position]
+                if not chunk:
+                    break
+                if bandwidth is not None:
+                    bandwidth.consume(len(chunk))
+                file.write(chunk)
+                position += len(chunk)
+                if segment_progress is not None:
+                    segment_progress(path, index, position - start, end - start)
+                if progress is not None:
+                    with lock:
+                        downloaded[0] += len(chunk)
+                        total = downloaded[0]
+                    progress(path, total)
+        if position != end:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Segment {index} of {url} ended early"
+            )
+
+    try:
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            for _ in executor.map(propagate(fetch), range(segments)):
+                pass
+    except (requests.exceptions.RequestException, OSError) as err:
+        # the preallocated file has holes, so it cannot be resumed
+        os.remove(part_path)
+        return DownloadResult(url, path, 0, err, time.perf_counter() - started)
+
+    # segments arrive out of order, so the assembled file is verified in one pass
+    elapsed = time.perf_counter() - started
+    if not _matches(_hash_file(part_path), expected):
+        os.remove(part_path)
+        error = ValueError(f"Hash mismatch for {url}")
+        return DownloadResult(url, path, size, error, elapsed)
+
+    os.replace(part_path, path)
+    return DownloadResult(url, path, size, None, elapsed)
+
+
+@traced("download_many")
+def download_many(
+    files: list[dict],
+    directory: str,
+    max_workers: int = 4,
+    bandwidth_limit: float | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[str, int], None] | None = None,
+    segments: int = 1,
+    segment_progress: Callable[[str, int, int, int], None] | None = None,
+) -> list[DownloadResult]:
+    """
+    The function downloads many files in parallel into a directory, with a cap on both the number of
+    open connections and their combined speed.
+
+    ---
+
+    ### ---Parameters---
+
+    :param files: The files to download, each a dictionary with "url", "filename" and optional "hashes"
+    keys, as found in a version's `files`
+    :type files: list[dict]
+
+    :param directory: The directory to save the files to
+    :type directory: str
+
+    :param max_workers: The maximum number of simultaneous connections, shared by whole files and the
+    segments of segmented files, defaults to 4
+    :type max_workers: int (optional)
+
+    :param bandwidth_limit: The maximum combined download speed in bytes per second. If None, the speed
+    is not limited, defaults to None
+    :type bandwidth_limit: float (optional)
+
+    :param chunk_size: The number of bytes read from the network at a time, defaults to 64 KiB
+    :type chunk_size: int (optional)
+
+    :param progress: A function called with the path and number of bytes downloaded so far after each
+    chunk, defaults to None
+    :type progress: Callable[[str, int], None] (optional)
+
+    :param segments: The maximum number of connections used per large file, defaults to 1
+    :type segments: int (optional)
+
+    :param segment_progress: A function called with the path, segment index, bytes downloaded in the
+    segment so far and segment length after each chunk of a segmented download, defaults to None
+    :type segment_progress: Callable[[str, int, int, int], None] (optional)
+
+    :return: A list of `DownloadResult`, in the same order as `files`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    bandwidth = BandwidthLimiter(bandwidth_limit) if bandwidth_limit else None
+    max_workers = max(max_workers, 1)
+    connections = threading.BoundedSemaphore(max_workers)
+
+    def download(file):
+        # never let a filename from the API escape the target directory
+        path = os.path.join(directory, os.path.basename(file["filename"]))
+        return download_file(
+            file["url"],
+            path,
+            hashes=file.get("hashes"),
+            chunk_size=chunk_size,
+            bandwidth=bandwidth,
+            progress=progress,
+            segments=segments,
+            segment_progress=segment_progress,
+            connections=connections,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(propagate(download), files))
+
+
+def _connection(connections: threading.Semaphore | None):
+    # a slot of the shared connection budget, if there is one
+    return connections if connections is not None else contextlib.nullcontext()
+
+
+def _range_start(response: requests.Response) -> int | None:
+    # the first byte of a "Content-Range: bytes <start>-<end>/<size>" header
+    content_range = response.headers.get("Content-Range", "")
+    first = content_range.removeprefix("bytes ").partition("-")[0]
+    return int(first) if first.isdigit() else None
+
+
+def _new_hashers() -> dict:
+    return {"sha1": hashlib.sha1(), "sha512": hashlib.sha512()}
+
+
+def _hash_file(path: str) -> dict:
+    hashers = _new_hashers()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return hashers
+
+
+def _matches(hashers: dict, expected: dict) -> bool:
+    return all(
+        hashers[algorithm].hexdigest() == value for algorithm, value in expected.items()
+    )
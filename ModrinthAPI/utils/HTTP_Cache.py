@@ -0,0 +1,248 @@
+"""
+This module provides a conditional-request HTTP cache. Cached responses are revalidated with
+`If-None-Match` / `If-Modified-Since`, and a `304 Not Modified` is answered from the local store.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+from urllib.parse import urlencode
+
+from .Json import typed_decoder
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached response body and the validators needed to revalidate it.
+    """
+
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    A thread-safe store of response bodies keyed by request, held in an in-memory LRU with an optional
+    on-disk tier. Entries never expire on their own: each use revalidates them with the server, which
+    answers `304 Not Modified` without a body when nothing has changed.
+
+    The decoded body of an entry is kept in memory after its first revalidation, so it is shared between
+    callers and should not be mutated.
+
+    ---
+
+    ### ---Parameters---
+
+    :param max_entries: The maximum number of responses kept in memory, defaults to 1024
+    :type max_entries: int (optional)
+
+    :param directory: A directory to persist responses in. Entries evicted from memory are still served
+    from disk, and the cache survives restarts. If None, the cache is memory-only, defaults to None
+    :type directory: str (optional)
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: str | None = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        # cache key -> (entry, decoded body)
+        self._decoded = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: dict | None = None, headers: dict | None = None) -> str:
+        """
+        The function builds the cache key of a request from its URL, query parameters and authorization,
+        so users with different tokens never share entries.
+
+        :return: The cache key.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        authorization = (headers or {}).get("Authorization")
+        if authorization:
+            digest = hashlib.sha256(authorization.encode()).hexdigest()[:16]
+            key = f"{key}#{digest}"
+        return key
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        The function returns the cached entry for `key`, or None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._read(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def decoded(self, key: str, entry: CacheEntry, decode: Callable[[bytes], ...]):
+        """
+        The function returns the decoded body of `entry`, decoding it only the first time it is needed. A
+        body decoded into models is not shared with callers expecting plain data, and the other way round.
+
+        ---
+
+        ### ---Parameters---
+
+        :param key: The cache key of the request
+        :type key: str
+
+        :param entry: The entry returned by `get` for `key`
+        :type entry: CacheEntry
+
+        :param decode: The function decoding the raw body
+        :type decode: Callable[[bytes], Any]
+
+        :return: The decoded body.
+        """
+        typed = typed_decoder.get()
+        with self._lock:
+            decoded = self._decoded.get(key)
+            if decoded is not None and decoded[0] is entry and decoded[1] is typed:
+                return decoded[2]
+        value = decode(entry.body)
+        with self._lock:
+            # the entry may have been replaced or evicted while decoding
+            if self._entries.get(key) is entry:
+                self._decoded[key] = (entry, typed, value)
+        return value
+
+    def store(self, key: str, headers, body: bytes):
+        """
+        The function stores a response body if the response carries an `ETag` or `Last-Modified` header,
+        and otherwise removes the entry for `key`, which can no longer be revalidated.
+
+        ---
+
+        ### ---Parameters---
+
+        :param key: The cache key of the request
+        :type key: str
+
+        :param headers: The response headers
+        :type headers: Mapping[str, str]
+
+        :param body: The raw response body
+        :type body: bytes
+
+        :return: None
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            self._forget(key)
+            return
+        entry = CacheEntry(etag, last_modified, body)
+        self._remember(key, entry)
+        self._write(key, entry)
+
+    def clear(self):
+        """
+        The function removes every entry from memory and disk.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._decoded.clear()
+            if self.directory is not None:
+                for name in os.listdir(self.directory):
+                    if name.endswith(".cache"):
+                        os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._decoded.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._decoded.pop(evicted, None)
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._decoded.pop(key, None)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.cache")
+
+    def _read(self, key: str) -> CacheEntry | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as file:
+                meta = json.loads(file.readline())
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CacheEntry(meta.get("etag"), meta.get("last_modified"), body)
+
+    def _write(self, key: str, entry: CacheEntry):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        meta = {"key": key, "etag": entry.etag, "last_modified": entry.last_modified}
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(json.dumps(meta).encode() + b"\n")
+                file.write(entry.body)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+
+http_cache: HTTPCache | None = None
+
+
+def get_http_cache() -> HTTPCache | None:
+    """
+    The function returns the HTTP cache used by the request functions.
+
+    :return: The active `HTTPCache`, or None if HTTP caching is disabled.
+    """
+    return http_cache
+
+
+def set_http_cache(cache: HTTPCache | None):
+    """
+    The function sets the HTTP cache used by the sync and async request functions for GET requests.
+
+    ---
+
+    ### ---Parameters---
+
+    :param cache: The cache to use, or None to disable HTTP caching
+    :type cache: HTTPCache
+
+    :return: None
+    """
+    global http_cache
+    http_cache = cache
@@ -0,0 +1,223 @@
+"""
+This module provides a persistent, SQLite-backed store mapping file hashes to the versions they belong to.
+A file hash always identifies the same version, so positive entries never expire. Hashes the API does not
+know are remembered for a short time only, since the file may be uploaded later.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+
+def default_path() -> str:
+    """
+    The function returns the default path of the hash store database, in the user's cache directory.
+
+    :return: The path of "ModrinthAPI/hashes.sqlite3" under `%LOCALAPPDATA%` on Windows, `~/Library/Caches`
+    on macOS, and `$XDG_CACHE_HOME` or `~/.cache` elsewhere.
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(base, "ModrinthAPI", "hashes.sqlite3")
+
+
+class HashStore:
+    """
+    A thread-safe, indexed hash → version store consulted by `Versions.get_from_hash` before the network.
+
+    ---
+
+    ### ---Parameters---
+
+    :param path: The path of the SQLite database file, or ":memory:" for a store that lives only as long as
+    the process. If None, the database is kept in the user's cache directory (see `default_path`), defaults
+    to None
+    :type path: str (optional)
+
+    :param negative_ttl: How long in seconds an unknown hash is remembered as unknown, defaults to 3600
+    :type negative_ttl: float (optional)
+    """
+
+    def __init__(self, path: str | None = None, negative_ttl: float = 3600):
+        if path is None:
+            path = default_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS version_files ("
+                " algorithm TEXT NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " version TEXT,"
+                " expires REAL,"
+                " PRIMARY KEY (algorithm, hash)"
+                ") WITHOUT ROWID"
+            )
+
+    def get_many(self, file_hashes: list, algorithm: str = "sha1") -> dict:
+        """
+        The function looks up many hashes at once.
+
+        ---
+
+        ### ---Parameters---
+
+        :param file_hashes: The hashes to look up
+        :type file_hashes: list
+
+        :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
+        :return: A dictionary mapping every hash the store has a live entry for to its version's data, or
+        to None if the hash is known to have no version. Unknown hashes are left out.
+        """
+        found = {}
+        file_hashes = list(dict.fromkeys(file_hashes))
+        now = time.time()
+        # stay well below SQLite's limit on bound parameters
+        for start in range(0, len(file_hashes), 500):
+            chunk = file_hashes[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT hash, version, expires FROM version_files"
+                    f" WHERE algorithm = ? AND hash IN ({placeholders})",
+                    [algorithm, *chunk],
+                ).fetchall()
+            for file_hash, version, expires in rows:
+                if version is not None:
+                    found[file_hash] = json.loads(version)
+                elif expires is not None and expires > now:
+                    found[file_hash] = None
+        return found
+
+    def put(self, file_hash: str, version: dict, algorithm: str = "sha1"):
+        """
+        The function stores the version a hash belongs to. The entry never expires.
+
+        :return: None
+        """
+        self.put_many({file_hash: version}, algorithm)
+
+    def put_many(self, versions: dict, algorithm: str = "sha1"):
+        """
+        The function stores the versions many hashes belong to. The entries never expire.
+
+        ---
+
+        ### ---Parameters---
+
+        :param versions: A dictionary mapping each hash to its version's data
+        :type versions: dict
+
+        :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
+        :return: None
+        """
+        rows = [
+            (algorithm, file_hash, json.dumps(version), None)
+            for file_hash, version in versions.items()
+        ]
+        self._write(rows)
+
+    def put_missing(self, file_hashes: list, algorithm: str = "sha1"):
+        """
+        The function remembers hashes the API has no version for, for `negative_ttl` seconds.
+
+        ---
+
+        ### ---Parameters---
+
+        :param file_hashes: The unknown hashes
+        :type file_hashes: list
+
+        :param algorithm: The algorithm of the hashes, "sha1" or "sha512", defaults to "sha1"
+        :type algorithm: str (optional)
+
+        :return: None
+        """
+        expires = time.time() + self.negative_ttl
+        self._write(
+            [(algorithm, file_hash, None, expires) for file_hash in file_hashes]
+        )
+
+    def clear(self):
+        """
+        The function removes every entry from the store.
+
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM version_files")
+
+    def close(self):
+        """
+        The function closes the database connection.
+
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, rows: list):
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO version_files (algorithm, hash, version, expires)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+
+hash_store: HashStore | None = None
+
+
+def get_hash_store() -> HashStore | None:
+    """
+    The function returns the hash store consulted by the hash lookups.
+
+    :return: The active `HashStore`, or None if no store is installed.
+    """
+    return hash_store
+
+
+def set_hash_store(store: HashStore | None):
+    """
+    The function sets the hash store consulted by `Versions.get_from_hash` and
+    `Versions_Async.get_from_hash` before the network.
+
+    ---
+
+    ### ---Parameters---
+
+    :param store: The store to use, or None to always query the API
+    :type store: HashStore
+
+    :return: None
+    """
+    global hash_store
+    hash_store = store
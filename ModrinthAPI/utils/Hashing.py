@@ -0,0 +1,258 @@
+"""
+This module provides streaming file hashing for identifying mod files with the Modrinth API. Every file is
+read once, in fixed-size chunks, to compute its sha1 and sha512 together.
+"""
+
+import fnmatch
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_PATTERNS = ("*.jar", "*.zip", "*.mrpack")
+
+
+class FileHashes(NamedTuple):
+    """
+    The hashes of a single file.
+    """
+
+    path: str
+    size: int
+    sha1: str
+    sha512: str
+
+
+class HashStats:
+    """
+    Running totals of a hashing run, for reporting throughput. `failed` lists the paths of the files that
+    could not be read.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.failed: list[str] = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, hashes: FileHashes):
+        self.files += 1
+        self.bytes += hashes.size
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of bytes hashed per second.
+        """
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"HashStats(files={self.files}, bytes={self.bytes}, "
+            f"elapsed={self.elapsed:.2f}s, throughput={self.throughput / 1e6:.1f} MB/s)"
+        )
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> FileHashes:
+    """
+    The function computes the sha1 and sha512 of a file in a single pass, reading it in chunks into a
+    reused buffer so memory stays constant regardless of the file's size.
+
+    ---
+
+    ### ---Parameters---
+
+    :param path: The path of the file to hash
+    :type path: str
+
+    :param chunk_size: The number of bytes read at a time, defaults to 1 MiB
+    :type chunk_size: int (optional)
+
+    :return: The `FileHashes` of the file.
+    """
+    sha1 = hashlib.sha1()
+    sha512 = hashlib.sha512()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            read = file.readinto(buffer)
+            if not read:
+                break
+            sha1.update(view[:read])
+            sha512.update(view[:read])
+            size += read
+    return FileHashes(path, size, sha1.hexdigest(), sha512.hexdigest())
+
+
+def find_files(
+    directory: str, patterns: Iterable[str] = DEFAULT_PATTERNS, recursive: bool = True
+) -> Iterator[str]:
+    """
+    The function lazily lists the files in a directory whose names match any of `patterns`. Like `os.walk`,
+    subdirectories that cannot be listed are skipped.
+
+    ---
+
+    ### ---Parameters---
+
+    :param directory: The directory to search
+    :type directory: str
+
+    :param patterns: Glob patterns of the file names to include, defaults to DEFAULT_PATTERNS
+    :type patterns: Iterable[str] (optional)
+
+    :param recursive: Whether to search subdirectories, defaults to True
+    :type recursive: bool (optional)
+
+    :return: An iterator of file paths.
+    """
+    patterns = tuple(patterns)
+    pending = [directory]
+    while pending:
+        path = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            if path == directory:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.is_file() and any(
+                    fnmatch.fnmatch(entry.name, pattern) for pattern in patterns
+                ):
+                    yield entry.path
+
+
+def hash_files(
+    paths: Iterable[str],
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    stats: HashStats | None = None,
+    on_error: Callable[[str, OSError], None] | None = None,
+) -> Iterator[FileHashes]:
+    """
+    The function hashes many files in parallel and yields their hashes in input order. At most twice
+    `max_workers` files are in flight at once, so memory stays bounded for any number of files. Files that
+    cannot be read, e.g. because they were deleted or are locked, are skipped.
+
+    ---
+
+    ### ---Parameters---
+
+    :param paths: The paths of the files to hash. May be any iterable, including a generator
+    :type paths: Iterable[str]
+
+    :param max_workers: The number of files hashed at once. Defaults to the number of CPUs
+    :type max_workers: int (optional)
+
+    :param use_processes: Whether to hash in a process pool instead of a thread pool. Threads are usually
+    enough since hashlib releases the GIL while hashing, defaults to False
+    :type use_processes: bool (optional)
+
+    :param chunk_size: The number of bytes read at a time, defaults to 1 MiB
+    :type chunk_size: int (optional)
+
+    :param stats: A `HashStats` updated as files are hashed, for reporting throughput, defaults to None
+    :type stats: HashStats (optional)
+
+    :param on_error: A function called with the path and the error of each file that could not be read,
+    defaults to None
+    :type on_error: Callable[[str, OSError], None] (optional)
+
+    :return: An iterator of `FileHashes`, in the same order as `paths`.
+    """
+    max_workers = max_workers or os.cpu_count() or 4
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    paths = iter(paths)
+
+    with executor_class(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for path in paths:
+            in_flight.append((path, executor.submit(hash_file, path, chunk_size)))
+            if len(in_flight) >= max_workers * 2:
+                yield from _collect(*in_flight.popleft(), stats, on_error)
+        while in_flight:
+            yield from _collect(*in_flight.popleft(), stats, on_error)
+
+
+def hash_directory(
+    directory: str,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    recursive: bool = True,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    stats: HashStats | None = None,
+    on_error: Callable[[str, OSError], None] | None = None,
+) -> Iterator[FileHashes]:
+    """
+    The function walks a mods or instance folder and yields the hashes of every matching file, hashing
+    files in parallel with bounded memory. Files that cannot be read are skipped.
+
+    ---
+
+    ### ---Parameters---
+
+    :param directory: The directory to hash
+    :type directory: str
+
+    :param patterns: Glob patterns of the file names to include, defaults to DEFAULT_PATTERNS
+    :type patterns: Iterable[str] (optional)
+
+    :param recursive: Whether to include subdirectories, defaults to True
+    :type recursive: bool (optional)
+
+    :param max_workers: The number of files hashed at once. Defaults to the number of CPUs
+    :type max_workers: int (optional)
+
+    :param use_processes: Whether to hash in a process pool instead of a thread pool, defaults to False
+    :type use_processes: bool (optional)
+
+    :param stats: A `HashStats` updated as files are hashed, for reporting throughput, defaults to None
+    :type stats: HashStats (optional)
+
+    :param on_error: A function called with the path and the error of each file that could not be read,
+    defaults to None
+    :type on_error: Callable[[str, OSError], None] (optional)
+
+    :return: An iterator of `FileHashes`.
+    """
+    return hash_files(
+        find_files(directory, patterns, recursive),
+        max_workers=max_workers,
+        use_processes=use_processes,
+        stats=stats,
+        on_error=on_error,
+    )
+
+
+def _collect(
+    path: str,
+    future,
+    stats: HashStats | None,
+    on_error: Callable[[str, OSError], None] | None,
+) -> Iterator[FileHashes]:
+    # yields the file's hashes, or nothing if it could not be read
+    try:
+        hashes = future.result()
+    except OSError as err:
+        if stats is not None:
+            stats.failed.append(path)
+        if on_error is not None:
+            on_error(path, err)
+        return
+    if stats is not None:
+        stats.add(hashes)
+    yield hashes
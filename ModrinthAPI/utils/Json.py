@@ -0,0 +1,107 @@
+"""
+This module provides the JSON decoder used by the sync and async request functions to parse response bodies.
+orjson or msgspec is used when installed, falling back to the standard library. Bodies are decoded straight
+from bytes, without building an intermediate str.
+"""
+
+import contextvars
+import json
+from typing import Callable
+
+
+def _orjson_decoder() -> Callable[[bytes], ...]:
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec_decoder() -> Callable[[bytes], ...]:
+    import msgspec
+
+    return msgspec.json.Decoder().decode
+
+
+def _stdlib_decoder() -> Callable[[bytes], ...]:
+    # json.loads detects the encoding of bytes itself
+    return json.loads
+
+
+DECODERS = {
+    "orjson": _orjson_decoder,
+    "msgspec": _msgspec_decoder,
+    "json": _stdlib_decoder,
+}
+
+
+def _default_decoder() -> tuple[str, Callable[[bytes], ...]]:
+    for name, factory in DECODERS.items():
+        try:
+            return name, factory()
+        except ImportError:
+            continue
+    return "json", json.loads
+
+
+json_decoder_name, json_decoder = _default_decoder()
+
+
+# set by `Models.returns` while a read function returning models runs, so bodies are decoded straight
+# into models
+typed_decoder: contextvars.ContextVar[Callable[[bytes], ...] | None] = (
+    contextvars.ContextVar("typed_decoder", default=None)
+)
+
+
+def loads(body: bytes | str):
+    """
+    The function decodes a JSON response body with the active decoder, or straight into models while a
+    read function returning models runs.
+
+    ---
+
+    ### ---Parameters---
+
+    :param body: The raw response body
+    :type body: bytes | str
+
+    :return: The decoded data.
+    """
+    decode = typed_decoder.get()
+    if decode is None:
+        return json_decoder(body)
+    return decode(body)
+
+
+def get_json_decoder() -> str:
+    """
+    The function returns the name of the active JSON decoder.
+
+    :return: "orjson", "msgspec", "json", or "custom" for a decoder set as a function.
+    """
+    return json_decoder_name
+
+
+def set_json_decoder(decoder: str | Callable[[bytes], ...] | None = None):
+    """
+    The function sets the JSON decoder used to parse response bodies.
+
+    ---
+
+    ### ---Parameters---
+
+    :param decoder: The name of a decoder, "orjson", "msgspec" or "json", a function decoding bytes, or
+    None to use the fastest installed decoder, defaults to None
+    :type decoder: str | Callable[[bytes], ...] (optional)
+
+    :return: None
+    """
+    global json_decoder, json_decoder_name
+    if decoder is None:
+        json_decoder_name, json_decoder = _default_decoder()
+    elif callable(decoder):
+        json_decoder_name, json_decoder = "custom", decoder
+    elif decoder in DECODERS:
+        # raises ImportError if the decoder is not installed
+        json_decoder_name, json_decoder = decoder, DECODERS[decoder]()
+    else:
+        raise ValueError(f"Unknown JSON decoder: {decoder}")
@@ -0,0 +1,438 @@
+"""
+This module provides opt-in instrumentation of the requests made by the sync and async API modules: request
+hooks, per-endpoint latency histograms and counters, rendered in the Prometheus text format. Endpoints are
+reported by their templated path, e.g. "/v2/project/{id}", so that metrics do not grow with every item
+requested.
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Callable, NamedTuple
+from urllib.parse import urlsplit
+
+from .Result_Cache import get_result_cache
+from .Retry import get_circuit_breaker, get_retry_policy
+from .Single_Flight import get_single_flight
+
+# the upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# path segments followed by an item ID, and the placeholder the ID is templated to
+ID_SEGMENTS = {
+    "project": "{id}",
+    "version": "{id}",
+    "version_file": "{hash}",
+    "user": "{id}",
+    "team": "{id}",
+}
+
+# the counters recorded by `Metrics.count`, and their help texts
+COUNTERS = {
+    "retries": "Requests retried after a transient failure.",
+    "http_cache_revalidations": "Requests answered from the HTTP cache after a 304 response.",
+    "rate_limit_waits": "Requests delayed by the rate limiter.",
+    "rate_limit_wait_seconds": "Time spent waiting for the rate limiter.",
+    "hedges": "Duplicate requests sent to hedge slow requests.",
+    "hedge_wins": "Requests answered by their hedge.",
+}
+
+
+def endpoint_template(url: str) -> str:
+    """
+    The function returns the templated path of a URL, with item IDs and hashes replaced by placeholders,
+    e.g. "/v2/project/{id}/version" for "https://api.modrinth.com/v2/project/AANobbMI/version".
+
+    ---
+
+    ### ---Parameters---
+
+    :param url: The URL
+    :type url: str
+
+    :return: The templated path.
+    """
+    segments = urlsplit(url).path.split("/")
+    for index in range(1, len(segments)):
+        placeholder = ID_SEGMENTS.get(segments[index - 1])
+        if placeholder is not None and segments[index]:
+            segments[index] = placeholder
+    return "/".join(segments)
+
+
+class RequestEvent(NamedTuple):
+    """
+    A request attempt, as passed to the request hooks. Hooks called before the request is sent receive it
+    with `status`, `elapsed`, `size` and `error` unset.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    attempt: int
+    started: float
+    status: int | None = None
+    elapsed: float = 0.0
+    size: int = 0
+    error: BaseException | None = None
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Metrics:
+    """
+    A thread-safe collector of request metrics, shared by the sync and async request functions.
+
+    Every attempt to send a request, including retries, is timed and counted by method, templated endpoint
+    and status, with "error" as the status of attempts that failed without a response. Hooks added with
+    `add_hook` are called before and after each attempt with its `RequestEvent`. Exceptions raised by hooks
+    are not caught.
+
+    `render` returns all metrics in the Prometheus text format, including the counters kept by the active
+    result cache, single-flight de-duplicator, retry policy and circuit breaker.
+    """
+
+    def __init__(self):
+        self.before_hooks: list[Callable[[RequestEvent], None]] = []
+        self.after_hooks: list[Callable[[RequestEvent], None]] = []
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._requests = Counter()
+        self._bytes = Counter()
+        self._counters = {name: Counter() for name in COUNTERS}
+
+    def add_hook(
+        self,
+        before: Callable[[RequestEvent], None] | None = None,
+        after: Callable[[RequestEvent], None] | None = None,
+    ):
+        """
+        The function adds hooks called before and after every request attempt.
+
+        ---
+
+        ### ---Parameters---
+
+        :param before: A function called with the `RequestEvent` before the attempt is sent
+        :type before: Callable[[RequestEvent], None] (optional)
+
+        :param after: A function called with the completed `RequestEvent` after the attempt
+        :type after: Callable[[RequestEvent], None] (optional)
+
+        :return: None
+        """
+        if before is not None:
+            self.before_hooks.append(before)
+        if after is not None:
+            self.after_hooks.append(after)
+
+    def start(
+        self, method: str, url: str, attempt: int = 0, endpoint: str | None = None
+    ) -> RequestEvent:
+        """
+        The function starts timing a request attempt and calls the before hooks.
+
+        ---
+
+        ### ---Parameters---
+
+        :param method: The HTTP method
+        :type method: str
+
+        :param url: The URL, without query parameters
+        :type url: str
+
+        :param attempt: The number of the attempt, starting at 0, defaults to 0
+        :type attempt: int (optional)
+
+        :param endpoint: The templated endpoint, if already known, defaults to None
+        :type endpoint: str (optional)
+
+        :return: The `RequestEvent` to pass to `finish`.
+        """
+        if endpoint is None:
+            endpoint = endpoint_template(url)
+        event = RequestEvent(method, url, endpoint, attempt, time.perf_counter())
+        for hook in self.before_hooks:
+            hook(event)
+        return event
+
+    def finish(
+        self,
+        event: RequestEvent,
+        status: int | None,
+        size: int = 0,
+        error: BaseException | None = None,
+    ) -> RequestEvent:
+        """
+        The function records a completed request attempt and calls the after hooks.
+
+        ---
+
+        ### ---Parameters---
+
+        :param event: The `RequestEvent` returned by `start`
+        :type event: RequestEvent
+
+        :param status: The HTTP status, or None if no response was received
+        :type status: int | None
+
+        :param size: The size in bytes of the response body, defaults to 0
+        :type size: int (optional)
+
+        :param error: The exception the attempt failed with, defaults to None
+        :type error: BaseException (optional)
+
+        :return: The completed `RequestEvent`.
+        """
+        elapsed = time.perf_counter() - event.started
+        event = event._replace(status=status, elapsed=elapsed, size=size, error=error)
+        key = (event.method, event.endpoint)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            histogram.sum += elapsed
+            histogram.count += 1
+            self._requests[key + (str(status) if status is not None else "error",)] += 1
+            self._bytes[key] += size
+        for hook in self.after_hooks:
+            hook(event)
+        return event
+
+    def count(self, name: str, endpoint: str = "", amount: float = 1):
+        """
+        The function increments one of the counters in COUNTERS.
+
+        ---
+
+        ### ---Parameters---
+
+        :param name: The name of the counter, e.g. "retries"
+        :type name: str
+
+        :param endpoint: The templated endpoint the count applies to, defaults to ""
+        :type endpoint: str (optional)
+
+        :param amount: The amount to add, defaults to 1
+        :type amount: float (optional)
+
+        :return: None
+        """
+        with self._lock:
+            self._counters[name][endpoint] += amount
+
+    def reset(self):
+        """
+        The function resets every metric. Hooks are kept.
+
+        :return: None
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._bytes.clear()
+            for counter in self._counters.values():
+                counter.clear()
+
+    def render(self) -> str:
+        """
+        The function renders every metric in the Prometheus text exposition format.
+
+        :return: The metrics text.
+        """
+        lines = []
+        with self._lock:
+            _family(
+                lines,
+                "modrinth_requests_total",
+                "counter",
+                "Request attempts by method, endpoint and status.",
+                [
+                    ({"method": m, "endpoint": e, "status": s}, value)
+                    for (m, e, s), value in sorted(self._requests.items())
+                ],
+            )
+            _family(
+                lines,
+                "modrinth_response_bytes_total",
+                "counter",
+                "Response body bytes received.",
+                [
+                    ({"method": m, "endpoint": e}, value)
+                    for (m, e), value in sorted(self._bytes.items())
+                ],
+            )
+            lines.append(
+                "# HELP modrinth_request_duration_seconds Request attempt latency."
+            )
+            lines.append("# TYPE modrinth_request_duration_seconds histogram")
+            for (method, endpoint), histogram in sorted(self._histograms.items()):
+                labels = {"method": method, "endpoint": endpoint}
+                cumulative = 0
+                bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+                for bound, value in zip(bounds, histogram.buckets):
+                    cumulative += value
+                    lines.append(
+                        _sample(
+                            "modrinth_request_duration_seconds_bucket",
+                            labels | {"le": bound},
+                            cumulative,
+                        )
+                    )
+                lines.append(
+                    _sample(
+                        "modrinth_request_duration_seconds_sum", labels, histogram.sum
+                    )
+                )
+                lines.append(
+                    _sample(
+                        "modrinth_request_duration_seconds_count",
+                        labels,
+                        histogram.count,
+                    )
+                )
+            for name, help_text in COUNTERS.items():
+                _family(
+                    lines,
+                    f"modrinth_{name}_total",
+                    "counter",
+                    help_text,
+                    [
+                        ({"endpoint": endpoint} if endpoint else {}, value)
+                        for endpoint, value in sorted(self._counters[name].items())
+                    ],
+                )
+        _collect_components(lines)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        The function writes the rendered metrics to a file, replacing it atomically, e.g. for the textfile
+        collector of the Prometheus node exporter.
+
+        ---
+
+        ### ---Parameters---
+
+        :param path: The path of the file
+        :type path: str
+
+        :return: None
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(self.render())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+def _collect_components(lines: list[str]):
+    # the components keep their own counters; read them at render time rather than on every request
+    cache = get_result_cache()
+    if cache is not None:
+        stats = cache.stats()
+        for kind in ("hits", "misses"):
+            _family(
+                lines,
+                f"modrinth_result_cache_{kind}_total",
+                "counter",
+                f"Result cache {kind} by function.",
+                [({"function": name}, counts[kind]) for name, counts in stats.items()],
+            )
+    flight = get_single_flight()
+    if flight is not None:
+        _family(
+            lines,
+            "modrinth_single_flight_shared_total",
+            "counter",
+            "Requests answered by an identical request already in flight.",
+            [({}, flight.shared)],
+        )
+    policy = get_retry_policy()
+    if policy is not None:
+        _family(
+            lines,
+            "modrinth_retry_budget_exhausted_total",
+            "counter",
+            "Retries refused because the retry budget was spent.",
+            [({}, policy.exhausted)],
+        )
+    breaker = get_circuit_breaker()
+    if breaker is not None:
+        _family(
+            lines,
+            "modrinth_circuit_breaker_rejected_total",
+            "counter",
+            "Requests failed fast by the open circuit breaker.",
+            [({}, breaker.rejected)],
+        )
+        _family(
+            lines,
+            "modrinth_circuit_breaker_open",
+            "gauge",
+            "Whether the circuit breaker is open.",
+            [({}, int(breaker.state != "closed"))],
+        )
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        lines.append(_sample(name, labels, value))
+
+
+def _sample(name: str, labels: dict[str, str], value) -> str:
+    if not labels:
+        return f"{name} {value}"
+    text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{text}}} {value}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+metrics: Metrics | None = None
+
+
+def get_metrics() -> Metrics | None:
+    """
+    The function returns the metrics collector shared by the sync and async request functions.
+
+    :return: The active `Metrics`, or None if instrumentation is disabled.
+    """
+    return metrics
+
+
+def set_metrics(collector: Metrics | None):
+    """
+    The function sets the metrics collector shared by the sync and async request functions.
+
+    ---
+
+    ### ---Parameters---
+
+    :param collector: The metrics collector to use, or None to disable instrumentation
+    :type collector: Metrics
+
+    :return: None
+    """
+    global metrics
+    metrics = collector
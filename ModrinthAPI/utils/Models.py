@@ -0,0 +1,510 @@
+"""
+This module provides compact, typed models for the projects, versions, users and team members returned by the
+API. Models are `msgspec.Struct` classes: response bodies are decoded straight into them, without building a
+dictionary per object first, and they store their fields in slots that the garbage collector does not track.
+They remain read-only mappings, so code reading dictionaries keeps working, but they cannot be mutated or
+passed to `json.dumps` without `to_dict()`. Fields a model does not declare are skipped while decoding. Models
+need msgspec, are off by default and are enabled with `set_models(True)`.
+
+Heavy fields that most consumers never read, project bodies and galleries and version changelogs, can be
+left undecoded until first accessed with `set_heavy_fields("lazy")`, or skipped entirely with
+`set_heavy_fields("drop")`.
+"""
+
+import contextlib
+import functools
+import inspect
+from abc import ABCMeta
+from collections.abc import Mapping
+from typing import Any, Optional, Union
+
+from . import Json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _declare(namespace: dict):
+    # declares the `_fields` of a model class, except its heavy fields, as struct fields absent by default
+    heavy = namespace.get("_heavy", ())
+    nested = namespace.get("_nested", {})
+    annotations = {}
+    for name in namespace["_fields"]:
+        if name not in heavy:
+            annotations[name] = Optional[nested[name]] if name in nested else Any
+            namespace[name] = msgspec.UNSET
+    namespace["__annotations__"] = annotations
+
+
+def _eager_variant(model: type) -> type:
+    # the model with its heavy fields decoded like any other field
+    namespace = {
+        "__annotations__": dict.fromkeys(model._heavy, Any),
+        "__module__": model.__module__,
+        "__qualname__": model.__qualname__,
+    }
+    namespace.update(dict.fromkeys(model._heavy, msgspec.UNSET))
+    return type(model)(model.__name__, (model,), namespace)
+
+
+def _lazy_property(name: str, attribute: str) -> property:
+    def getter(self):
+        value = getattr(self, attribute)
+        if value is msgspec.UNSET:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        if type(value) is msgspec.Raw:
+            value = msgspec.json.decode(value)
+            msgspec.structs.force_setattr(self, attribute, value)
+        return value
+
+    return property(getter)
+
+
+def _lazy_variant(model: type) -> type:
+    # the model with its heavy fields kept as raw JSON, decoded on first access
+    attributes = {name: f"_raw_{name}" for name in model._heavy}
+
+    def __post_init__(self):
+        # copy the raw fields out of the response body so it can be freed
+        for attribute in attributes.values():
+            value = getattr(self, attribute)
+            if type(value) is msgspec.Raw:
+                msgspec.structs.force_setattr(self, attribute, value.copy())
+
+    namespace = {
+        "__annotations__": dict.fromkeys(attributes.values(), msgspec.Raw),
+        "__module__": model.__module__,
+        "__qualname__": model.__qualname__,
+        "__post_init__": __post_init__,
+    }
+    for name, attribute in attributes.items():
+        namespace[attribute] = msgspec.field(default=msgspec.UNSET, name=name)
+        namespace[name] = _lazy_property(name, attribute)
+    return type(model)(model.__name__, (model,), namespace)
+
+
+if msgspec is not None:
+
+    class _ModelMeta(msgspec.StructMeta, ABCMeta):
+        def __new__(mcls, name, bases, namespace, **kwargs):
+            if "_fields" in namespace:
+                _declare(namespace)
+            cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+            # the JSON name of each field and the attribute holding it, in API order
+            attributes = dict(zip(cls.__struct_encode_fields__, cls.__struct_fields__))
+            cls._attributes = {
+                name: attributes[name] for name in cls._fields if name in attributes
+            }
+            if "_fields" in namespace:
+                cls._model = cls
+                cls._variants = {"drop": cls}
+                if cls._heavy:
+                    cls._variants["eager"] = _eager_variant(cls)
+                    cls._variants["lazy"] = _lazy_variant(cls)
+                else:
+                    cls._variants["eager"] = cls._variants["lazy"] = cls
+            return cls
+
+    _bases = (msgspec.Struct, Mapping)
+    _options = dict(frozen=True, eq=False, gc=False, kw_only=True)
+else:
+
+    class _ModelMeta(ABCMeta):
+        # without msgspec the model classes exist, but models cannot be enabled
+        def __new__(mcls, name, bases, namespace, **kwargs):
+            return super().__new__(mcls, name, bases, namespace)
+
+    _bases = (Mapping,)
+    _options = {}
+
+
+class Model(*_bases, metaclass=_ModelMeta, **_options):
+    """
+    The base class of the models. A model is a read-only mapping of the fields present in the API
+    response, which are also readable as attributes.
+
+    Fields absent from the response are absent from the model as well, so `model["field"]` raises
+    KeyError and `model.get("field")` returns None, just like for a dictionary.
+    """
+
+    # the fields of the model, in API order
+    _fields: tuple[str, ...] = ()
+    # fields holding other models
+    _nested: dict[str, type["Model"]] = {}
+    # large fields that can be left undecoded or skipped, see `set_heavy_fields`
+    _heavy: tuple[str, ...] = ()
+    # fields shown by repr()
+    _repr_fields: tuple[str, ...] = ("id",)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Model":
+        """
+        The function builds a model from a decoded API response.
+
+        :return: The model.
+        """
+        if isinstance(data, cls):
+            return data
+        # there is no raw JSON left to defer, so lazy models are built with their heavy fields
+        mode = "eager" if heavy_fields == "lazy" else heavy_fields
+        return msgspec.convert(data, cls._model._variants[mode])
+
+    def to_dict(self) -> dict:
+        """
+        The function converts the model back into a plain dictionary, including nested models.
+
+        :return: A dictionary of the model's fields.
+        """
+        return {
+            key: value.to_dict() if isinstance(value, Model) else value
+            for key, value in self.items()
+        }
+
+    def __getitem__(self, key: str):
+        attribute = self._attributes.get(key)
+        if attribute is None or getattr(self, attribute) is msgspec.UNSET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    # check the attributes themselves so membership tests and iterating do not decode lazy fields
+    def __contains__(self, key):
+        attribute = self._attributes.get(key)
+        return attribute is not None and getattr(self, attribute) is not msgspec.UNSET
+
+    def __iter__(self):
+        for key, attribute in self._attributes.items():
+            if getattr(self, attribute) is not msgspec.UNSET:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return self._model.from_dict, (self.to_dict(),)
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={self.get(name)!r}" for name in self._repr_fields if name in self
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class Project(Model):
+    """
+    A project, as returned by `Projects.get`, `Projects.get_multiple` and the user project lists.
+    """
+
+    _fields = (
+        "id",
+        "slug",
+        "project_type",
+        "team",
+        "title",
+        "description",
+        "body",
+        "body_url",
+        "published",
+        "updated",
+        "approved",
+        "queued",
+        "status",
+        "requested_status",
+        "moderator_message",
+        "license",
+        "client_side",
+        "server_side",
+        "downloads",
+        "followers",
+        "categories",
+        "additional_categories",
+        "game_versions",
+        "loaders",
+        "versions",
+        "icon_url",
+        "issues_url",
+        "source_url",
+        "wiki_url",
+        "discord_url",
+        "donation_urls",
+        "gallery",
+        "color",
+        "thread_id",
+        "monetization_status",
+    )
+    _heavy = ("body", "gallery")
+    _repr_fields = ("id", "slug", "title")
+
+
+class Version(Model):
+    """
+    A version, as returned by `Versions.get`, `Versions.get_list`, `Versions.get_multiple` and the hash
+    lookups.
+    """
+
+    _fields = (
+        "id",
+        "project_id",
+        "author_id",
+        "name",
+        "version_number",
+        "changelog",
+        "changelog_url",
+        "date_published",
+        "downloads",
+        "version_type",
+        "status",
+        "requested_status",
+        "featured",
+        "game_versions",
+        "loaders",
+        "dependencies",
+        "files",
+    )
+    _heavy = ("changelog",)
+    _repr_fields = ("id", "project_id", "version_number")
+
+
+class User(Model):
+    """
+    A user, as returned by `Users.get` and `Users.get_multiple`.
+    """
+
+    _fields = (
+        "id",
+        "username",
+        "name",
+        "email",
+        "bio",
+        "avatar_url",
+        "created",
+        "role",
+        "badges",
+        "payout_data",
+        "auth_providers",
+        "email_verified",
+        "has_password",
+        "has_totp",
+        "github_id",
+    )
+    _repr_fields = ("id", "username")
+
+
+class TeamMember(Model):
+    """
+    A member of a team, as returned by the `Teams` functions. `user` is a `User`.
+    """
+
+    _fields = (
+        "team_id",
+        "user",
+        "role",
+        "permissions",
+        "accepted",
+        "payouts_split",
+        "ordering",
+    )
+    _nested = {"user": User}
+    _repr_fields = ("team_id", "user", "role")
+
+
+class _Decoder:
+    # decodes response bodies straight into models, or into plain data when a body has an unexpected shape
+    def __init__(self, model: type[Model], keyed: bool):
+        variant = model._variants[heavy_fields]
+        self.object = msgspec.json.Decoder(dict[str, variant] if keyed else variant)
+        # lists of models, or of lists of models for the team member lookups
+        self.array = msgspec.json.Decoder(list[Union[variant, list[variant]]])
+
+    def __call__(self, body: bytes | str):
+        start = body[:16].lstrip()[:1]
+        try:
+            if start in (b"{", "{"):
+                return self.object.decode(body)
+            if start in (b"[", "["):
+                return self.array.decode(body)
+        except msgspec.ValidationError:
+            pass
+        return Json.json_decoder(body)
+
+
+_decoders: dict[tuple, _Decoder] = {}
+
+
+def _decoder(model: type[Model], keyed: bool) -> _Decoder:
+    key = (model, keyed, heavy_fields)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        decoder = _decoders[key] = _Decoder(model, keyed)
+    return decoder
+
+
+models_enabled = False
+
+heavy_fields = "eager"
+
+
+def set_models(enabled: bool):
+    """
+    The function sets whether the read functions return models or, as by default, the plain dictionaries
+    decoded from the API. While models are enabled, responses are decoded with msgspec whatever JSON
+    decoder is set. Results already held by a result cache are returned as they were cached, so set this
+    before making requests.
+
+    ---
+
+    ### ---Parameters---
+
+    :param enabled: True to return models, False to return plain dictionaries, which also resets heavy
+    fields to "eager"
+    :type enabled: bool
+
+    :return: None
+    """
+    global models_enabled, heavy_fields
+    if enabled and msgspec is None:
+        raise ImportError("Models need msgspec: pip install msgspec")
+    models_enabled = enabled
+    if not enabled:
+        heavy_fields = "eager"
+
+
+def set_heavy_fields(mode: str):
+    """
+    The function sets how models store heavy fields: project `body` and `gallery`, and version
+    `changelog`. It applies to models built afterwards. Plain dictionaries always hold every field, so
+    "lazy" and "drop" need models to be enabled.
+
+    ---
+
+    ### ---Parameters---
+
+    :param mode: "eager" to decode them like any other field, which is the default, "lazy" to keep them as
+    raw JSON and decode them on first access, or "drop" to skip them while decoding
+    :type mode: str
+
+    :return: None
+    """
+    global heavy_fields
+    if mode not in ("lazy", "eager", "drop"):
+        raise ValueError(f"Unknown heavy field mode: {mode}")
+    if mode != "eager" and not models_enabled:
+        raise ValueError(
+            f'Heavy fields can only be set to "{mode}" with models enabled'
+        )
+    heavy_fields = mode
+
+
+@contextlib.contextmanager
+def decode_as(model: type[Model], keyed: bool = False):
+    """
+    A context manager decoding the response bodies of the requests made inside it straight into models
+    while models are enabled. It covers the current thread or task, and the tasks it starts.
+
+    ---
+
+    ### ---Parameters---
+
+    :param model: The model class to decode into
+    :type model: type[Model]
+
+    :param keyed: Whether the responses are dictionaries mapping keys, such as hashes, to objects, defaults
+    to False
+    :type keyed: bool (optional)
+    """
+    if not models_enabled:
+        yield
+        return
+    token = Json.typed_decoder.set(_decoder(model, keyed))
+    try:
+        yield
+    finally:
+        Json.typed_decoder.reset(token)
+
+
+def as_model(model: type[Model], value, keyed: bool = False):
+    """
+    The function converts decoded API data into models while models are enabled. Lists and tuples are
+    converted item by item, and anything that is not a mapping, such as an error, is returned unchanged.
+
+    ---
+
+    ### ---Parameters---
+
+    :param model: The model class to convert into
+    :type model: type[Model]
+
+    :param value: The decoded data
+    :type value: Any
+
+    :param keyed: Whether `value` is a dictionary mapping keys, such as hashes, to objects, defaults to
+    False
+    :type keyed: bool (optional)
+
+    :return: The converted data.
+    """
+    if not models_enabled:
+        return value
+    if isinstance(value, Model):
+        return value
+    if isinstance(value, Mapping):
+        if keyed:
+            return {key: as_model(model, item) for key, item in value.items()}
+        try:
+            return model.from_dict(value)
+        except msgspec.ValidationError:
+            return value
+    if isinstance(value, list):
+        return [as_model(model, item, keyed) for item in value]
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(as_model(model, item, keyed) for item in value)
+    return value
+
+
+def returns(model: type[Model], keyed: bool = False):
+    """
+    The function returns a decorator making a sync or async read function return models: its responses
+    are decoded with `decode_as`, and anything decoded otherwise, such as responses fetched on other
+    threads, is converted with `as_model`. Placed below `cached`, results are cached as models.
+
+    ---
+
+    ### ---Parameters---
+
+    :param model: The model class to return
+    :type model: type[Model]
+
+    :param keyed: Whether the function returns a dictionary mapping keys to objects, defaults to False
+    :type keyed: bool (optional)
+
+    :return: The decorator.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with decode_as(model, keyed):
+                    return as_model(model, await func(*args, **kwargs), keyed)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with decode_as(model, keyed):
+                return as_model(model, func(*args, **kwargs), keyed)
+
+        return wrapper
+
+    return decorator
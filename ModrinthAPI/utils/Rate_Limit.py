@@ -0,0 +1,201 @@
+"""
+This module provides a token-bucket rate limiter driven by Modrinth's `X-Ratelimit-*` response headers. A
+single limiter is shared by the sync and async request functions of the process.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket that paces outgoing requests to stay just under the API's rate limit.
+
+    Every response updates the bucket from the `X-Ratelimit-Limit`, `X-Ratelimit-Remaining` and
+    `X-Ratelimit-Reset` headers. The requests the server reports as remaining in its current window are
+    spread evenly until the window resets, and once none are left, requests wait for the reset. Until the
+    server has reported a window, and after it resets, the bucket refills continuously at
+    `limit / period` tokens per second. A 429 response pauses all requests until the window resets.
+
+    ---
+
+    ### ---Parameters---
+
+    :param limit: The number of requests allowed per period until the server reports its own, defaults to
+    300
+    :type limit: int (optional)
+
+    :param period: The length of the rate limit window in seconds, defaults to 60
+    :type period: float (optional)
+
+    :param headroom: The number of requests kept in reserve below the limit, defaults to 1
+    :type headroom: int (optional)
+    """
+
+    def __init__(self, limit: int = 300, period: float = 60, headroom: int = 1):
+        self.limit = limit
+        self.period = period
+        self.headroom = headroom
+        self._lock = threading.Lock()
+        self._tokens = float(max(limit - headroom, 1))
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # the end of the server's current window, and the refill rate that spreads its remaining requests
+        self._window_end = 0.0
+        self._window_rate = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """
+        The maximum number of tokens in the bucket.
+        """
+        return max(self.limit - self.headroom, 1)
+
+    @property
+    def rate(self) -> float:
+        """
+        The number of tokens added to the bucket per second outside a window reported by the server.
+        """
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        if self._updated < self._window_end:
+            until = min(now, self._window_end)
+            self._tokens += (until - self._updated) * self._window_rate
+            self._updated = until
+            if until < self._window_end:
+                return
+            # a new window starts with a full budget, minus the requests already queued for it
+            self._tokens = self.capacity + min(self._tokens, 0.0)
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _wait(self, now: float) -> float:
+        # how long until the bucket is out of debt
+        debt = -self._tokens
+        if debt <= 0:
+            return 0.0
+        if now < self._window_end:
+            in_window = (self._window_end - now) * self._window_rate
+            if debt <= in_window:
+                return debt / self._window_rate
+            debt -= in_window + self.capacity
+            return self._window_end - now + max(debt, 0.0) / self.rate
+        return debt / self.rate
+
+    def reserve(self) -> float:
+        """
+        The function takes a token from the bucket and returns how long the caller must wait before
+        sending its request. Waiting callers are queued by going into token debt, so they are released in
+        order at the refill rate.
+
+        :return: The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            return max(self._wait(now), self._paused_until - now)
+
+    def acquire(self) -> float:
+        """
+        The function blocks the calling thread until a request may be sent.
+
+        :return: The number of seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    async def acquire_async(self) -> float:
+        """
+        The function waits, without blocking the event loop, until a request may be sent.
+
+        :return: The number of seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return max(wait, 0.0)
+
+    def update(self, headers, status_code: int | None = None):
+        """
+        The function updates the bucket from the rate limit headers of a response.
+
+        ---
+
+        ### ---Parameters---
+
+        :param headers: The response headers
+        :type headers: Mapping[str, str]
+
+        :param status_code: The HTTP status code of the response
+        :type status_code: int (optional)
+
+        :return: None
+        """
+        limit = _header_number(headers, "X-Ratelimit-Limit")
+        remaining = _header_number(headers, "X-Ratelimit-Remaining")
+        reset = _header_number(headers, "X-Ratelimit-Reset")
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None and limit > 0:
+                self.limit = int(limit)
+            if remaining is not None:
+                # the server's count is authoritative; never spend more than it has left
+                budget = max(remaining - self.headroom, 0.0)
+                self._tokens = min(self._tokens, budget)
+                if reset is not None and reset > 0:
+                    # what is not available right away is spread over the rest of the window
+                    spare = max(budget - max(self._tokens, 0.0), 0.0)
+                    self._window_end = now + reset
+                    self._window_rate = spare / reset
+            if status_code == 429:
+                retry_after = _header_number(headers, "Retry-After")
+                pause = retry_after if retry_after is not None else reset
+                if pause is None:
+                    pause = self.period
+                self._paused_until = max(self._paused_until, now + pause)
+
+
+def _header_number(headers, name: str) -> float | None:
+    value = headers.get(name) if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+rate_limiter: RateLimiter | None = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """
+    The function returns the rate limiter shared by the sync and async request functions.
+
+    :return: The active `RateLimiter`, or None if rate limiting is disabled.
+    """
+    return rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None):
+    """
+    The function sets the rate limiter shared by the sync and async request functions.
+
+    ---
+
+    ### ---Parameters---
+
+    :param limiter: The rate limiter to use, or None to disable rate limiting
+    :type limiter: RateLimiter
+
+    :return: None
+    """
+    global rate_limiter
+    rate_limiter = limiter
@@ -0,0 +1,275 @@
+"""
+This module provides an opt-in, size-bounded TTL cache for the results of the read functions in the sync and
+async API modules.
+"""
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Time to live in seconds of each endpoint's results. Endpoints not listed use the cache's default TTL.
+DEFAULT_TTLS = {
+    "projects.search": 30,
+    "projects.get": 300,
+    "projects.dependencies": 300,
+    "projects.get_multiple": 300,
+    "versions.get": 3600,
+    "versions.get_list": 300,
+    "versions.get_multiple": 3600,
+    "versions.get_from_hash": 3600,
+    "users.get": 300,
+    "users.get_multiple": 300,
+    "users.get_projects": 300,
+    "users.get_followed_projects": 60,
+    "teams.get_project_members": 300,
+    "teams.get_team_members": 300,
+    "teams.get_members_from_teams": 300,
+}
+
+_MISSING = object()
+
+# set by `cached` around each call; holds [True] once the call reports an incomplete result
+_incomplete = contextvars.ContextVar("modrinth_incomplete", default=None)
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache of function results keyed on (function, normalized arguments), where each
+    entry expires after its endpoint's TTL. Holding no locks across awaits, it is safe to share between
+    threads and event loops.
+
+    Cached results are shared between callers and should not be mutated.
+
+    ---
+
+    ### ---Parameters---
+
+    :param max_entries: The maximum number of results kept before the least recently used are evicted,
+    defaults to 4096
+    :type max_entries: int (optional)
+
+    :param default_ttl: The time to live in seconds of endpoints without their own TTL, defaults to 60
+    :type default_ttl: float (optional)
+
+    :param ttls: Per-endpoint TTLs in seconds, e.g. {"versions.get": 86400}, merged over DEFAULT_TTLS.
+    A TTL of 0 disables caching for that endpoint
+    :type ttls: dict[str, float] (optional)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        default_ttl: float = 60,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = DEFAULT_TTLS | (ttls or {})
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        The function returns the TTL in seconds of an endpoint's results.
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, key):
+        """
+        The function returns the cached result for `key`, or `_MISSING` if there is no live entry. Every
+        lookup is counted as a hit or a miss of `endpoint`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits[endpoint] += 1
+                    return value
+                del self._entries[key]
+            self.misses[endpoint] += 1
+            return _MISSING
+
+    def set(self, endpoint: str, key, value):
+        """
+        The function stores a result for its endpoint's TTL, evicting the least recently used entries
+        beyond `max_entries`.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        The function returns the hit and miss counters of every endpoint.
+
+        :return: A dictionary mapping each endpoint to a dictionary with its "hits" and "misses".
+        """
+        with self._lock:
+            endpoints = set(self.hits) | set(self.misses)
+            return {
+                endpoint: {"hits": self.hits[endpoint], "misses": self.misses[endpoint]}
+                for endpoint in sorted(endpoints)
+            }
+
+    def clear(self):
+        """
+        The function removes every cached result. The counters are kept.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache | None:
+    """
+    The function returns the result cache used by the read functions.
+
+    :return: The active `ResultCache`, or None if result caching is disabled.
+    """
+    return result_cache
+
+
+def set_result_cache(cache: ResultCache | None):
+    """
+    The function sets the result cache shared by the read functions of the sync and async modules.
+
+    ---
+
+    ### ---Parameters---
+
+    :param cache: The cache to use, or None to disable result caching
+    :type cache: ResultCache
+
+    :return: None
+    """
+    global result_cache
+    result_cache = cache
+
+
+def cached(endpoint: str):
+    """
+    The function returns a decorator that caches the results of a sync or async read function under
+    `endpoint` while a result cache is installed. Results are keyed on the function itself, so the sync
+    and async functions of an endpoint never share entries. Errors, and results the function reported as
+    incomplete with `mark_incomplete`, are never cached.
+
+    ---
+
+    ### ---Parameters---
+
+    :param endpoint: The name of the endpoint, e.g. "projects.get", used for TTLs and counters
+    :type endpoint: str
+
+    :return: The decorator.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def make_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, _freeze(tuple(bound.arguments.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            return key
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = result_cache
+                key = make_key(args, kwargs) if cache is not None else None
+                if key is None:
+                    return await func(*args, **kwargs)
+                value = cache.get(endpoint, key)
+                if value is _MISSING:
+                    flag = []
+                    token = _incomplete.set(flag)
+                    try:
+                        value = await func(*args, **kwargs)
+                    finally:
+                        _reset(token, flag)
+                    if not flag and _cacheable(value):
+                        cache.set(endpoint, key, value)
+                return value
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = result_cache
+            key = make_key(args, kwargs) if cache is not None else None
+            if key is None:
+                return func(*args, **kwargs)
+            value = cache.get(endpoint, key)
+            if value is _MISSING:
+                flag = []
+                token = _incomplete.set(flag)
+                try:
+                    value = func(*args, **kwargs)
+                finally:
+                    _reset(token, flag)
+                if not flag and _cacheable(value):
+                    cache.set(endpoint, key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def mark_incomplete():
+    """
+    The function marks the result of the cached read function currently running as incomplete, e.g.
+    because one of its chunked requests failed, so that it is returned but not cached. Outside a cached
+    function it does nothing.
+
+    :return: None
+    """
+    flag = _incomplete.get()
+    if flag is not None and not flag:
+        flag.append(True)
+
+
+def _reset(token, flag: list):
+    _incomplete.reset(token)
+    # a cached function calling another one is incomplete whenever the inner call is
+    if flag:
+        mark_incomplete()
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def _cacheable(value) -> bool:
+    # the read functions return None or an "Error: ..." string when a request fails
+    if value is None:
+        return False
+    return not (isinstance(value, str) and value.startswith("Error"))
@@ -0,0 +1,308 @@
+"""
+This module provides the retry policy and circuit breaker shared by the sync and async request functions.
+Transient failures are retried with exponential backoff and full jitter, and once the API is clearly down,
+requests fail fast instead of waiting on it.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    A thread-safe policy deciding whether and when a failed request is retried.
+
+    Requests are retried after connection errors, timeouts and the statuses in `statuses`, for the methods
+    in `methods` only. Each retry waits a random time between 0 and `backoff * 2 ** attempt` seconds,
+    capped at `max_backoff`, unless a 429 or 503 response says how long to wait in its `Retry-After`
+    header. Retries are limited by a budget: within each `budget_period`, at most `min_retries` plus
+    `retry_ratio` times the number of requests may be retried, so an outage cannot multiply the load.
+
+    ---
+
+    ### ---Parameters---
+
+    :param max_attempts: The maximum number of attempts per request, including the first, defaults to 4
+    :type max_attempts: int (optional)
+
+    :param backoff: The base delay in seconds, defaults to 0.5
+    :type backoff: float (optional)
+
+    :param max_backoff: The maximum delay in seconds, defaults to 30
+    :type max_backoff: float (optional)
+
+    :param max_retry_after: The maximum `Retry-After` delay in seconds that is honored. Longer ones are
+    not retried, defaults to 120
+    :type max_retry_after: float (optional)
+
+    :param statuses: The HTTP statuses that are retried, defaults to RETRY_STATUSES
+    :type statuses: tuple (optional)
+
+    :param methods: The HTTP methods that are retried, defaults to IDEMPOTENT_METHODS
+    :type methods: tuple (optional)
+
+    :param retry_ratio: The share of requests that may be retried per budget period, defaults to 0.2
+    :type retry_ratio: float (optional)
+
+    :param min_retries: The number of retries allowed per budget period regardless of traffic, defaults
+    to 10
+    :type min_retries: int (optional)
+
+    :param budget_period: The length in seconds of the retry budget window, defaults to 10
+    :type budget_period: float (optional)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        max_retry_after: float = 120,
+        statuses: tuple = RETRY_STATUSES,
+        methods: tuple = IDEMPOTENT_METHODS,
+        retry_ratio: float = 0.2,
+        min_retries: int = 10,
+        budget_period: float = 10,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = statuses
+        self.methods = tuple(method.upper() for method in methods)
+        self.retry_ratio = retry_ratio
+        self.min_retries = min_retries
+        self.budget_period = budget_period
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+        self._window_started = time.monotonic()
+        self._window_requests = 0
+        self._window_retries = 0
+
+    def record_request(self):
+        """
+        The function counts a new request toward the retry budget.
+
+        :return: None
+        """
+        with self._lock:
+            self._roll_window()
+            self._window_requests += 1
+
+    def should_retry(
+        self, method: str, attempt: int, status: int | None = None, headers=None
+    ) -> float | None:
+        """
+        The function decides whether a failed attempt is retried, and spends budget on it if so.
+
+        ---
+
+        ### ---Parameters---
+
+        :param method: The HTTP method of the request
+        :type method: str
+
+        :param attempt: The number of the failed attempt, starting at 0
+        :type attempt: int
+
+        :param status: The HTTP status of the response, or None if the attempt failed with a connection
+        error or timeout
+        :type status: int (optional)
+
+        :param headers: The response headers, for `Retry-After`
+        :type headers: Mapping[str, str] (optional)
+
+        :return: The number of seconds to wait before retrying, or None if the request is not retried.
+        """
+        if method.upper() not in self.methods or attempt + 1 >= self.max_attempts:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+
+        delay = None
+        if status in (429, 503) and headers is not None:
+            delay = _retry_after(headers.get("Retry-After"))
+            if delay is not None and delay > self.max_retry_after:
+                return None
+        if delay is None:
+            # full jitter spreads the retries of many clients evenly over the backoff window
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+        with self._lock:
+            self._roll_window()
+            if (
+                self._window_retries
+                >= self.min_retries + self.retry_ratio * self._window_requests
+            ):
+                self.exhausted += 1
+                return None
+            self._window_retries += 1
+            self.retries += 1
+        return delay
+
+    def _roll_window(self):
+        now = time.monotonic()
+        if now - self._window_started >= self.budget_period:
+            self._window_started = now
+            self._window_requests = 0
+            self._window_retries = 0
+
+
+def _retry_after(value: str | None) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    The error of a request that was not sent because the circuit breaker is open. The sync and async request
+    functions return it as `(error, None)`, like any other failed request.
+    """
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker that stops sending requests while the API is down.
+
+    After `failure_threshold` consecutive failures, i.e. connection errors, timeouts and 5xx responses, the
+    circuit opens and every request fails immediately with a `CircuitOpenError`. After `recovery_time`
+    seconds a single trial request is let through: if it succeeds the circuit closes, and if it fails the
+    circuit stays open for another `recovery_time`.
+
+    ---
+
+    ### ---Parameters---
+
+    :param failure_threshold: The number of consecutive failures that opens the circuit, defaults to 5
+    :type failure_threshold: int (optional)
+
+    :param recovery_time: How long in seconds the circuit stays open before a trial request, defaults to
+    30
+    :type recovery_time: float (optional)
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = "closed"
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def check(self):
+        """
+        The function raises `CircuitOpenError` if a request may not be sent now.
+
+        :return: None
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if now - self._opened_at >= self.recovery_time:
+                # let one trial request through; the others keep failing until it reports back
+                self.state = "half-open"
+                self._opened_at = now
+                return
+            self.rejected += 1
+            retry_in = self.recovery_time - (now - self._opened_at)
+        raise CircuitOpenError(
+            f"The Modrinth API is unavailable; retrying in {retry_in:.1f}s"
+        )
+
+    def record(self, success: bool):
+        """
+        The function records the outcome of a request.
+
+        ---
+
+        ### ---Parameters---
+
+        :param success: False if the request failed with a connection error, timeout or 5xx response
+        :type success: bool
+
+        :return: None
+        """
+        with self._lock:
+            if success:
+                self.state = "closed"
+                self._failures = 0
+                return
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+retry_policy: RetryPolicy | None = RetryPolicy()
+
+circuit_breaker: CircuitBreaker | None = None
+
+
+def get_retry_policy() -> RetryPolicy | None:
+    """
+    The function returns the retry policy shared by the sync and async request functions.
+
+    :return: The active `RetryPolicy`, or None if retries are disabled.
+    """
+    return retry_policy
+
+
+def set_retry_policy(policy: RetryPolicy | None):
+    """
+    The function sets the retry policy shared by the sync and async request functions.
+
+    ---
+
+    ### ---Parameters---
+
+    :param policy: The retry policy to use, or None to never retry
+    :type policy: RetryPolicy
+
+    :return: None
+    """
+    global retry_policy
+    retry_policy = policy
+
+
+def get_circuit_breaker() -> CircuitBreaker | None:
+    """
+    The function returns the circuit breaker shared by the sync and async request functions.
+
+    :return: The active `CircuitBreaker`, or None if no circuit breaker is installed.
+    """
+    return circuit_breaker
+
+
+def set_circuit_breaker(breaker: CircuitBreaker | None):
+    """
+    The function sets the circuit breaker shared by the sync and async request functions.
+
+    ---
+
+    ### ---Parameters---
+
+    :param breaker: The circuit breaker to use, or None to always send requests
+    :type breaker: CircuitBreaker
+
+    :return: None
+    """
+    global circuit_breaker
+    circuit_breaker = breaker
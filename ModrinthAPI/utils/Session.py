@@ -0,0 +1,152 @@
+"""
+This module provides a persistent, pooled HTTP session shared by the sync API modules.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_lock = threading.Lock()
+_session = None
+
+
+class Session:
+    """
+    A long-lived HTTP session that keeps TCP/TLS connections alive between requests. The underlying
+    `requests.Session` is shared by every thread, with a connection pool sized by `pool_maxsize`.
+
+    ---
+
+    ### ---Parameters---
+
+    :param pool_connections: The number of host pools to cache, defaults to 10
+    :type pool_connections: int (optional)
+
+    :param pool_maxsize: The maximum number of connections kept alive per host. Should be at least the
+    number of threads making requests at once, defaults to 20
+    :type pool_maxsize: int (optional)
+
+    :param pool_block: Whether to block when the pool has no free connection instead of opening a
+    throwaway one, defaults to False
+    :type pool_block: bool (optional)
+
+    :param timeout: The timeout in seconds for each request, defaults to 10
+    :type timeout: float (optional)
+
+    ---
+
+    Using the session as a context manager makes it the active session for the sync modules and closes it
+    on exit:
+
+        with Session(pool_maxsize=50):
+            Projects.get("sodium")
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        pool_block: bool = False,
+        timeout: float = 10,
+    ):
+        self.timeout = timeout
+        self._previous = None
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+
+    @property
+    def http(self) -> requests.Session:
+        """
+        The underlying `requests.Session`.
+        """
+        return self._http
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        The function sends a request through the pooled connection.
+
+        ---
+
+        ### ---Parameters---
+
+        :param method: The HTTP method to use for the request
+        :type method: str
+
+        :param url: The URL to send the request to
+        :type url: str
+
+        :param kwargs: Any additional keyword arguments accepted by `requests.Session.request`
+
+        :return: The `requests.Response` of the request.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self._http.request(method, url, **kwargs)
+
+    def close(self):
+        """
+        The function closes every pooled connection held by the session.
+
+        :return: None
+        """
+        self._http.close()
+
+    def __enter__(self):
+        self._previous = set_session(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        set_session(self._previous)
+        self._previous = None
+        self.close()
+
+
+def get_session() -> Session:
+    """
+    The function returns the active session, creating a default one on first use.
+
+    :return: The active `Session`.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = Session()
+    return _session
+
+
+def set_session(session: Session | None) -> Session | None:
+    """
+    The function sets the session used by the sync modules.
+
+    ---
+
+    ### ---Parameters---
+
+    :param session: The session to use for future requests. If None, a default session is created on the
+    next request
+    :type session: Session
+
+    :return: The previously active session, or None.
+    """
+    global _session
+    with _lock:
+        previous, _session = _session, session
+    return previous
+
+
+def close_session():
+    """
+    The function closes the active session. A new default session is created on the next request.
+
+    :return: None
+    """
+    previous = set_session(None)
+    if previous is not None:
+        previous.close()
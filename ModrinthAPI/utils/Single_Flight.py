@@ -0,0 +1,162 @@
+"""
+This module provides single-flight de-duplication of identical in-flight GET requests. While a request is in
+flight, identical requests from other threads or coroutines wait for it and share its raw response instead of
+sending their own. A single instance is shared by the sync and async request functions of the process.
+"""
+
+import asyncio
+import threading
+import weakref
+
+
+class _Call:
+    # an in-flight sync call and its outcome
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    # an in-flight async call and the number of coroutines waiting for it
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    A thread-safe de-duplicator of concurrent identical calls.
+
+    The first caller for a key runs the call, and callers arriving with the same key before it completes
+    wait for it and receive its result, or its exception. Async calls are shared within an event loop. A
+    waiting coroutine that is cancelled stops waiting without affecting the others, and the shared call
+    is only cancelled once every coroutine waiting for it has been.
+
+    `shared` counts the calls that were answered by another caller's call.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = weakref.WeakKeyDictionary()
+
+    def do(self, key, function):
+        """
+        The function runs `function` unless an identical call is already in flight, in which case it
+        waits for that call and returns its result.
+
+        ---
+
+        ### ---Parameters---
+
+        :param key: The key identifying identical calls
+        :type key: Hashable
+
+        :param function: The function to call, without arguments
+        :type function: Callable[[], Any]
+
+        :return: The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, function):
+        """
+        The function awaits `function()` unless an identical call is already in flight on the running
+        event loop, in which case it waits for that call and returns its result.
+
+        ---
+
+        ### ---Parameters---
+
+        :param key: The key identifying identical calls
+        :type key: Hashable
+
+        :param function: The coroutine function to call, without arguments
+        :type function: Callable[[], Awaitable[Any]]
+
+        :return: The result of the call.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            call = calls.get(key)
+            if call is None:
+                call = calls[key] = _AsyncCall(loop.create_task(function()))
+                call.task.add_done_callback(lambda task: _forget(calls, key, call))
+            else:
+                self.shared += 1
+            call.waiters += 1
+
+        try:
+            # shield the shared task so cancelling one waiter does not cancel it for the others
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # nobody is waiting any more; stop the request and let new callers start afresh
+                with self._lock:
+                    _forget(calls, key, call)
+                call.task.cancel()
+
+
+def _forget(calls: dict, key, call):
+    if calls.get(key) is call:
+        del calls[key]
+
+
+single_flight: SingleFlight | None = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight | None:
+    """
+    The function returns the single-flight de-duplicator shared by the sync and async request functions.
+
+    :return: The active `SingleFlight`, or None if de-duplication is disabled.
+    """
+    return single_flight
+
+
+def set_single_flight(flight: SingleFlight | None):
+    """
+    The function sets the single-flight de-duplicator shared by the sync and async request functions.
+
+    ---
+
+    ### ---Parameters---
+
+    :param flight: The de-duplicator to use, or None to send every request
+    :type flight: SingleFlight
+
+    :return: None
+    """
+    global single_flight
+    single_flight = flight
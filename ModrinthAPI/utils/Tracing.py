@@ -0,0 +1,478 @@
+"""
+This module provides opt-in tracing of the sync and async API modules. Composite operations such as dependency
+resolution and bulk fetches are recorded as spans, with the requests they make as child spans broken down into
+DNS, connect, send, wait and receive time. Traces can be exported as a Chrome trace, for chrome://tracing or
+Perfetto, or as a HAR file for the network panel of a browser.
+
+While no tracer is set, tracing costs a single None check per request.
+"""
+
+import collections
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+_current_span = contextvars.ContextVar("modrinth_span", default=None)
+
+# the request phases, in order, with the marks they run between
+PHASES = (
+    ("blocked", "queued_start", "queued_end"),
+    ("dns", "dns_start", "dns_end"),
+    ("connect", "connect_start", "connect_end"),
+    ("send", "ready", "headers_sent"),
+    ("wait", "headers_sent", "response_start"),
+    ("receive", "response_start", "end"),
+)
+
+
+class Span:
+    """
+    A timed operation. Spans started while another span is current in the same thread or task become its
+    children. Request spans also hold `marks`, the times at which each phase of the request started or
+    ended, as reported by the HTTP client.
+
+    Times are `time.perf_counter` values.
+    """
+
+    __slots__ = (
+        "name",
+        "category",
+        "parent",
+        "start",
+        "end",
+        "attributes",
+        "marks",
+        "_token",
+    )
+
+    def __init__(self, name: str, category: str, parent, attributes: dict):
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.attributes = attributes
+        self.marks = {} if category == "request" else None
+        self.end = None
+        self._token = None
+        self.start = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        """
+        The duration of the span in seconds, up to now if it has not ended.
+        """
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def timings(self) -> dict[str, float]:
+        """
+        The function returns the time spent in each phase of a request span, in seconds. Phases the HTTP
+        client did not report are -1, except send, wait and receive, which are always known.
+
+        :return: A dictionary mapping each phase in PHASES to its duration.
+        """
+        marks = dict(self.marks or {})
+        marks["end"] = self.end if self.end is not None else time.perf_counter()
+        marks.setdefault(
+            "ready", marks.get("connect_end", marks.get("queued_end", self.start))
+        )
+        marks.setdefault("headers_sent", marks["ready"])
+        marks.setdefault("response_start", marks["end"])
+        timings = {}
+        for phase, begin, finish in PHASES:
+            if begin in marks and finish in marks:
+                timings[phase] = max(marks[finish] - marks[begin], 0.0)
+            else:
+                timings[phase] = -1.0
+        # the connection is created after the host is resolved, so its time includes the DNS lookup
+        if timings["connect"] >= 0 and timings["dns"] >= 0:
+            timings["connect"] = max(timings["connect"] - timings["dns"], 0.0)
+        return timings
+
+
+class Tracer:
+    """
+    A thread-safe recorder of spans. Finished spans are kept in order of completion, up to `max_spans`,
+    after which the oldest are dropped.
+
+    ---
+
+    ### ---Parameters---
+
+    :param max_spans: The maximum number of finished spans kept, defaults to 100000
+    :type max_spans: int (optional)
+    """
+
+    def __init__(self, max_spans: int = 100000):
+        self.spans: collections.deque[Span] = collections.deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        # anchors converting perf_counter times into wall clock times
+        self._origin = time.perf_counter()
+        self._wall_origin = time.time()
+
+    def start(self, name: str, category: str = "span", **attributes) -> Span:
+        """
+        The function starts a span as a child of the current span and makes it current. Every span started
+        must be finished with `finish` in the same thread or task.
+
+        ---
+
+        ### ---Parameters---
+
+        :param name: The name of the span
+        :type name: str
+
+        :param category: "request" for a single HTTP request, or "span" for any other operation, defaults
+        to "span"
+        :type category: str (optional)
+
+        :param attributes: Attributes recorded with the span, e.g. url="..."
+        :type attributes: Any (optional)
+
+        :return: The span.
+        """
+        span = Span(name, category, _current_span.get(), attributes)
+        span._token = _current_span.set(span)
+        return span
+
+    def finish(self, span: Span, **attributes):
+        """
+        The function ends a span, restores its parent as the current span and records it. Attributes set
+        to None are left out.
+
+        ---
+
+        ### ---Parameters---
+
+        :param span: The span returned by `start`
+        :type span: Span
+
+        :param attributes: Attributes recorded with the span, e.g. status=200
+        :type attributes: Any (optional)
+
+        :return: None
+        """
+        span.end = time.perf_counter()
+        for key, value in attributes.items():
+            if value is not None:
+                span.attributes[key] = value
+        if span._token is not None:
+            _current_span.reset(span._token)
+            span._token = None
+        with self._lock:
+            self.spans.append(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """
+        A context manager recording the code it wraps as a span. An exception raised inside it is recorded
+        as the span's `error` attribute.
+
+        ---
+
+        ### ---Parameters---
+
+        :param name: The name of the span
+        :type name: str
+
+        :param attributes: Attributes recorded with the span
+        :type attributes: Any (optional)
+        """
+        span = self.start(name, **attributes)
+        error = None
+        try:
+            yield span
+        except BaseException as err:
+            error = repr(err)
+            raise
+        finally:
+            self.finish(span, error=error)
+
+    def clear(self):
+        """
+        The function removes every recorded span.
+
+        :return: None
+        """
+        with self._lock:
+            self.spans.clear()
+
+    def _snapshot(self) -> list[Span]:
+        with self._lock:
+            return sorted(self.spans, key=lambda span: span.start)
+
+    def chrome_trace(self) -> dict:
+        """
+        The function exports the recorded spans in the Chrome trace event format. Spans that overlap
+        without being nested, such as concurrent requests, are laid out on separate rows, and request
+        spans are broken down into their phases.
+
+        :return: The trace, to be serialized as JSON.
+        """
+        pid = os.getpid()
+        events = []
+        # each row holds a stack of the spans open on it; a span goes on its parent's row when the parent
+        # is the innermost open span there, and on the first free row otherwise
+        rows: list[list[Span]] = []
+        row_of = {}
+        for span in self._snapshot():
+            for stack in rows:
+                while stack and stack[-1].end <= span.start:
+                    stack.pop()
+            row = row_of.get(id(span.parent))
+            if row is None or not rows[row] or rows[row][-1] is not span.parent:
+                row = next((i for i, stack in enumerate(rows) if not stack), len(rows))
+                if row == len(rows):
+                    rows.append([])
+            rows[row].append(span)
+            row_of[id(span)] = row
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start - self._origin) * 1e6,
+                    "dur": (span.end - span.start) * 1e6,
+                    "pid": pid,
+                    "tid": row,
+                    "args": {
+                        key: _jsonable(value) for key, value in span.attributes.items()
+                    },
+                }
+            )
+            if span.marks is None:
+                continue
+            timings = span.timings()
+            marks = span.marks
+            starts = {
+                "blocked": marks.get("queued_start"),
+                "dns": marks.get("dns_start"),
+                "connect": marks.get("dns_end", marks.get("connect_start")),
+                "send": marks.get("connect_end", marks.get("queued_end", span.start)),
+                "wait": marks.get("headers_sent"),
+                "receive": marks.get("response_start"),
+            }
+            for phase, _, _ in PHASES:
+                start = starts[phase]
+                if start is None or timings[phase] <= 0:
+                    continue
+                events.append(
+                    {
+                        "name": phase,
+                        "cat": "phase",
+                        "ph": "X",
+                        "ts": (start - self._origin) * 1e6,
+                        "dur": timings[phase] * 1e6,
+                        "pid": pid,
+                        "tid": row,
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def har(self) -> dict:
+        """
+        The function exports the recorded request spans as an HTTP Archive (HAR 1.2). Headers and bodies
+        are not recorded, so only the URL, status, size and timings of each request are included.
+
+        :return: The archive, to be serialized as JSON.
+        """
+        entries = []
+        for span in self._snapshot():
+            if span.category != "request":
+                continue
+            timings = span.timings()
+            url = span.attributes.get("url", "")
+            size = span.attributes.get("size", 0)
+            started = datetime.fromtimestamp(
+                self._wall_origin + span.start - self._origin, timezone.utc
+            )
+            entries.append(
+                {
+                    "startedDateTime": started.isoformat(timespec="milliseconds"),
+                    "time": (span.end - span.start) * 1000,
+                    "request": {
+                        "method": span.attributes.get("method", "GET"),
+                        "url": url,
+                        "httpVersion": "HTTP/1.1",
+                        "cookies": [],
+                        "headers": [],
+                        "queryString": [],
+                        "headersSize": -1,
+                        "bodySize": -1,
+                    },
+                    "response": {
+                        "status": span.attributes.get("status", 0),
+                        "statusText": "",
+                        "httpVersion": "HTTP/1.1",
+                        "cookies": [],
+                        "headers": [],
+                        "content": {"size": size, "mimeType": "application/json"},
+                        "redirectURL": "",
+                        "headersSize": -1,
+                        "bodySize": size,
+                    },
+                    "cache": {},
+                    "timings": {
+                        phase: value * 1000 if value >= 0 else -1
+                        for phase, value in timings.items()
+                    }
+                    | {"ssl": -1},
+                    "serverIPAddress": urlsplit(url).hostname or "",
+                    "comment": span.attributes.get("error", ""),
+                }
+            )
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "ModrinthAPI", "version": ""},
+                "pages": [],
+                "entries": entries,
+            }
+        }
+
+    def write_chrome_trace(self, path: str):
+        """
+        The function writes the recorded spans to a Chrome trace file.
+
+        ---
+
+        ### ---Parameters---
+
+        :param path: The path of the file, usually ending in .json
+        :type path: str
+
+        :return: None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+    def write_har(self, path: str):
+        """
+        The function writes the recorded request spans to a HAR file.
+
+        ---
+
+        ### ---Parameters---
+
+        :param path: The path of the file, usually ending in .har
+        :type path: str
+
+        :return: None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.har(), file)
+
+
+def _jsonable(value):
+    return (
+        value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+    )
+
+
+def current_span() -> Span | None:
+    """
+    The function returns the span current in this thread or task.
+
+    :return: The current `Span`, or None if there is none.
+    """
+    return _current_span.get()
+
+
+def traced(name: str):
+    """
+    The function returns a decorator recording each call of a sync or async function as a span while a
+    tracer is set.
+
+    ---
+
+    ### ---Parameters---
+
+    :param name: The name of the spans, e.g. "dependencies.resolve"
+    :type name: str
+
+    :return: The decorator.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if active_tracer is None:
+                    return await func(*args, **kwargs)
+                with active_tracer.span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_tracer is None:
+                return func(*args, **kwargs)
+            with active_tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def propagate(function):
+    """
+    The function wraps a function submitted to a thread pool so that the spans it starts become children
+    of the span current where it was submitted. Without a tracer, `function` is returned unchanged.
+
+    ---
+
+    ### ---Parameters---
+
+    :param function: The function to wrap
+    :type function: Callable
+
+    :return: The wrapped function.
+    """
+    if active_tracer is None:
+        return function
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # a context can only be entered by one thread at a time, so each call runs in its own copy
+        return context.copy().run(function, *args, **kwargs)
+
+    return wrapper
+
+
+active_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer | None:
+    """
+    The function returns the tracer shared by the sync and async API modules.
+
+    :return: The active `Tracer`, or None if tracing is disabled.
+    """
+    return active_tracer
+
+
+def set_tracer(tracer: Tracer | None):
+    """
+    The function sets the tracer shared by the sync and async API modules. Async sessions opened while a
+    tracer is set also report the DNS, connect and send time of their requests.
+
+    ---
+
+    ### ---Parameters---
+
+    :param tracer: The tracer to use, or None to disable tracing
+    :type tracer: Tracer
+
+    :return: None
+    """
+    global active_tracer
+    active_tracer = tracer
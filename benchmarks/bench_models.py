@@ -0,0 +1,173 @@
+"""
+Compares the memory use and decode time of plain dictionaries and the `ModrinthAPI` models for a large
+collection of projects and versions shaped like real API responses.
+
+Usage: python benchmarks/bench_models.py [count]
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModrinthAPI.utils.Json import get_json_decoder, loads
+from ModrinthAPI.utils import Models
+from ModrinthAPI.utils.Models import Project, Version, as_model, decode_as
+
+LOADERS = ["fabric", "forge", "quilt", "neoforge"]
+GAME_VERSIONS = [f"1.{minor}.{patch}" for minor in range(16, 21) for patch in range(5)]
+WORDS = (
+    "the mod adds new blocks items biomes config option support for fabric forge quilt "
+    "performance rendering world generation fixed crash when loading chunks server client "
+    "compatibility with shaders improved textures added recipes removed deprecated api"
+).split()
+
+
+def make_markdown(seed: int, paragraphs: int) -> str:
+    rng = random.Random(seed)
+    lines = [f"# Heading {seed}"]
+    for _ in range(paragraphs):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 80))))
+        lines.append(
+            f"- [{rng.choice(WORDS)}](https://example.com/{rng.randint(0, 10**6)})"
+        )
+    return "\n\n".join(lines)
+
+
+def make_project(index: int) -> dict:
+    return {
+        "id": f"P{index:07d}",
+        "slug": f"project-{index}",
+        "project_type": "mod",
+        "team": f"T{index:07d}",
+        "title": f"Project {index}",
+        "description": "A short description of the project.",
+        "body": make_markdown(index, 8),
+        "body_url": None,
+        "published": "2023-01-01T00:00:00.000000Z",
+        "updated": "2023-06-01T00:00:00.000000Z",
+        "approved": "2023-01-02T00:00:00.000000Z",
+        "queued": None,
+        "status": "approved",
+        "requested_status": None,
+        "moderator_message": None,
+        "license": {"id": "MIT", "name": "MIT License", "url": None},
+        "client_side": "required",
+        "server_side": "optional",
+        "downloads": index * 37,
+        "followers": index % 500,
+        "categories": ["technology", "utility"],
+        "additional_categories": [],
+        "game_versions": GAME_VERSIONS[index % 10 : index % 10 + 8],
+        "loaders": LOADERS[: 1 + index % 3],
+        "versions": [f"V{index:07d}{n}" for n in range(3)],
+        "icon_url": f"https://cdn.modrinth.com/data/P{index:07d}/icon.png",
+        "issues_url": None,
+        "source_url": f"https://github.com/example/project-{index}",
+        "wiki_url": None,
+        "discord_url": None,
+        "donation_urls": [],
+        "gallery": [
+            {
+                "url": f"https://cdn.modrinth.com/data/P{index:07d}/images/{n}.png",
+                "featured": n == 0,
+                "title": f"Screenshot {n}",
+                "description": make_markdown(index + n, 1),
+                "created": "2023-01-01T00:00:00.000000Z",
+                "ordering": n,
+            }
+            for n in range(3)
+        ],
+        "color": 8703084,
+        "thread_id": f"H{index:07d}",
+        "monetization_status": "monetized",
+    }
+
+
+def make_version(index: int) -> dict:
+    return {
+        "id": f"V{index:07d}",
+        "project_id": f"P{index // 3:07d}",
+        "author_id": f"U{index % 1000:07d}",
+        "name": f"Release {index}",
+        "version_number": f"1.{index % 20}.{index % 7}",
+        "changelog": make_markdown(index, 2),
+        "changelog_url": None,
+        "date_published": "2023-06-01T00:00:00.000000Z",
+        "downloads": index * 11,
+        "version_type": "release",
+        "status": "listed",
+        "requested_status": None,
+        "featured": False,
+        "game_versions": GAME_VERSIONS[index % 10 : index % 10 + 4],
+        "loaders": LOADERS[: 1 + index % 2],
+        "dependencies": [],
+        "files": [],
+    }
+
+
+def measure(label: str, body: bytes, build, repeat: int = 3):
+    # time without tracing, then measure the memory held by one result
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        objects = build(body)
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = build(body)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_object = size / len(objects)
+    del objects
+    print(
+        f"{label:<30} {elapsed * 1000:9.1f} ms {size / 1e6:9.1f} MB {per_object:9.0f} B/object"
+    )
+    return elapsed, size
+
+
+def decode(model, body: bytes) -> list:
+    # as the read functions decorated with `returns` do
+    with decode_as(model):
+        return as_model(model, loads(body))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"{count} objects per run, JSON decoder: {get_json_decoder()}\n")
+    Models.set_models(True)
+    for name, make, model in (
+        ("projects", make_project, Project),
+        ("versions", make_version, Version),
+    ):
+        body = json.dumps([make(index) for index in range(count)]).encode()
+        print(f"{name} ({len(body) / 1e6:.1f} MB of JSON)")
+        measure("  dicts (json module)", body, json.loads)
+        dict_time, dict_size = measure("  dicts", body, loads)
+        for mode in ("eager", "lazy", "drop"):
+            Models.set_heavy_fields(mode)
+            model_time, model_size = measure(
+                f"  models, {mode} heavy fields",
+                body,
+                lambda body: decode(model, body),
+            )
+            print(
+                f"    {model_size / dict_size:.0%} of the memory and "
+                f"{model_time / dict_time:.0%} of the time of dicts"
+            )
+        Models.set_heavy_fields("eager")
+        print()
+    Models.set_models(False)
+
+
+if __name__ == "__main__":
+    main()
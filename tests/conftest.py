@@ -0,0 +1,179 @@
+"""
+Shared fixtures: a local HTTP server standing in for the Modrinth API and its CDN, and a reset of the
+process-wide components the tests install.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from ModrinthAPI import Projects, Teams, Users, Versions
+from ModrinthAPI.Async import Projects_Async, Teams_Async, Users_Async, Versions_Async
+from ModrinthAPI.Async.utils import Batch_Async, Hedge_Async
+from ModrinthAPI.utils import (
+    HTTP_Cache,
+    Metrics,
+    Rate_Limit,
+    Result_Cache,
+    Retry,
+    Single_Flight,
+    Tracing,
+)
+
+API_MODULES = (
+    Projects,
+    Teams,
+    Users,
+    Versions,
+    Projects_Async,
+    Teams_Async,
+    Users_Async,
+    Versions_Async,
+)
+
+
+class Server:
+    """
+    The state of the local server. `files` maps paths to file contents served with Range support,
+    `routes` maps paths to functions called with the parsed query of a GET, or the decoded JSON body of a
+    POST, and returning `(status, body)` or `(status, body, headers)`, `requests` records the method, path and headers of every request received
+    and `connections` the client ports they arrived from.
+
+    Setting `ranges` to False makes file responses ignore Range headers, setting `range_shift` to a number
+    of bytes makes them answer a range starting that much earlier than requested, setting `short` to a
+    number of bytes makes them end that many bytes before their Content-Length, and setting `delay` to a
+    number of seconds holds each of them that long before its body is sent.
+    """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.routes = {}
+        self.requests: list[tuple[str, str, dict]] = []
+        self.connections: set[int] = set()
+        self.ranges = True
+        self.range_shift = 0
+        self.short = 0
+        self.delay = 0.0
+        self.url = ""
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, headers: dict, port: int):
+        with self._lock:
+            self.requests.append((method, path, headers))
+            self.connections.add(port)
+
+    def hits(self, path: str) -> list[dict]:
+        """
+        The function returns the headers of every request received for `path`.
+        """
+        with self._lock:
+            return [headers for _, hit, headers in self.requests if hit == path]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        state = self.server.state
+        url = urlsplit(self.path)
+        state.record("GET", url.path, dict(self.headers), self.client_address[1])
+        if url.path in state.files:
+            return self.send_file(state.files[url.path])
+        route = state.routes.get(url.path)
+        if route is None:
+            return self.send_json(404, {"error": "not_found"})
+        self.send_json(*route(parse_qs(url.query)))
+
+    def do_POST(self):
+        state = self.server.state
+        url = urlsplit(self.path)
+        state.record("POST", url.path, dict(self.headers), self.client_address[1])
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        route = state.routes.get(url.path)
+        if route is None:
+            return self.send_json(404, {"error": "not_found"})
+        self.send_json(*route(body))
+
+    def send_json(self, status: int, body, headers: dict | None = None):
+        # a 304 has no body
+        data = json.dumps(body).encode() if status != 304 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_file(self, data: bytes):
+        state = self.server.state
+        start, end = 0, len(data)
+        header = self.headers.get("Range")
+        if header and state.ranges:
+            first, _, last = header.removeprefix("bytes=").partition("-")
+            start = max(int(first) - state.range_shift, 0)
+            end = min(int(last) + 1, len(data)) if last else len(data)
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start))
+        self.end_headers()
+        time.sleep(state.delay)
+        if state.short:
+            # drop the connection before the promised length has been sent
+            self.wfile.write(data[start : max(end - state.short, start)])
+            self.close_connection = True
+            return
+        self.wfile.write(data[start:end])
+
+
+@pytest.fixture
+def server():
+    state = Server()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.state = state
+    state.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def api(server, monkeypatch):
+    # point every API module at the local server
+    for module in API_MODULES:
+        monkeypatch.setattr(module, "base_url", f"{server.url}/v2")
+    return server
+
+
+@pytest.fixture(autouse=True)
+def reset_components():
+    yield
+    Result_Cache.set_result_cache(None)
+    Single_Flight.set_single_flight(Single_Flight.SingleFlight())
+    Batch_Async.set_batch_loader(None)
+    Hedge_Async.set_hedger(None)
+    Rate_Limit.set_rate_limiter(Rate_Limit.RateLimiter())
+    HTTP_Cache.set_http_cache(None)
+    Retry.set_retry_policy(Retry.RetryPolicy())
+    Retry.set_circuit_breaker(None)
+    Metrics.set_metrics(None)
+    Tracing.set_tracer(None)
@@ -0,0 +1,106 @@
+import asyncio
+import gc
+import json
+
+import pytest
+
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.Async.utils import Batch_Async
+from ModrinthAPI.Async.utils.Batch_Async import BatchLoader, set_batch_loader
+
+
+@pytest.fixture
+def loader(api):
+    def projects(query):
+        ids = json.loads(query["ids"][0])
+        if "broken" in ids:
+            return 400, {"error": "invalid_input"}
+        return 200, [
+            {"id": id, "slug": f"slug-{id}"}
+            for id in ids
+            if not id.startswith("missing")
+        ]
+
+    api.routes["/v2/projects"] = projects
+    loader = BatchLoader()
+    set_batch_loader(loader)
+    return loader
+
+
+def gather(*awaitables):
+    async def main():
+        return await asyncio.gather(*awaitables, return_exceptions=True)
+
+    return asyncio.run(main())
+
+
+def test_concurrent_lookups_are_sent_as_one_request(api, loader):
+    results = gather(*(Projects_Async.get(id) for id in ("a", "b", "c", "a")))
+    assert [result["id"] for result in results] == ["a", "b", "c", "a"]
+    assert len(api.hits("/v2/projects")) == 1
+    assert (loader.loads, loader.batches) == (4, 1)
+
+
+def test_lookups_match_slugs(api, loader):
+    (result,) = gather(Projects_Async.get(slug="slug-a"))
+    assert result["id"] == "slug-a"
+
+
+def test_missing_items_are_not_found(api, loader):
+    url = f"{api.url}/v2/projects"
+    found, missing = gather(loader.load(url, "a"), loader.load(url, "missing"))
+    assert found == ({"id": "a", "slug": "slug-a"}, 200)
+    response, status = missing
+    assert isinstance(response, LookupError) and status == 404
+
+
+def test_failed_batch_is_returned_to_every_caller(api, loader):
+    url = f"{api.url}/v2/projects"
+    results = gather(*(loader.load(url, id) for id in ("a", "broken", "b")))
+    assert [status for _, status in results] == [400] * 3
+
+
+def test_exception_is_raised_in_every_caller(api, loader, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(Batch_Async, "request_async", failing)
+    url = f"{api.url}/v2/projects"
+    errors = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        results = await asyncio.gather(
+            *(loader.load(url, id) for id in ("a", "b")), return_exceptions=True
+        )
+        await asyncio.sleep(0)
+        # a task whose exception was never retrieved reports it when collected
+        gc.collect()
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert errors == []
+    assert not loader._tasks
+
+
+def test_large_batches_are_chunked(api, loader):
+    ids = [f"{index:03d}" + "x" * 600 for index in range(20)]
+    results = gather(*(Projects_Async.get(id) for id in ids))
+    assert [result["id"] for result in results] == ids
+    assert loader.batches == len(api.hits("/v2/projects")) > 1
+
+
+def test_running_batches_are_referenced(api, loader):
+    async def main():
+        lookup = asyncio.ensure_future(loader.load(f"{api.url}/v2/projects", "a"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        running = set(loader._tasks)
+        return running, await lookup
+
+    running, result = asyncio.run(main())
+    assert len(running) == 1
+    assert result == ({"id": "a", "slug": "slug-a"}, 200)
+    assert not loader._tasks
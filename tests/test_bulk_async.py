@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+import random
+
+import pytest
+
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.Async.utils.Bulk_Async import fetch_many
+
+
+def collect(iterator, limit=None):
+    async def main():
+        results = []
+        async for result in iterator:
+            results.append(result)
+            if limit is not None and len(results) == limit:
+                break
+        return results
+
+    return asyncio.run(main())
+
+
+class Tracker:
+    # a fake fetch function recording how many calls run at once
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.started = []
+
+    async def __call__(self, id):
+        self.started.append(id)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(random.uniform(0, 0.01))
+        self.running -= 1
+        if id == "missing":
+            return {"error": "not_found"}, 404
+        if id == "crash":
+            raise RuntimeError("boom")
+        return {"id": id}, 200
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_concurrency_is_bounded(ordered):
+    fetch = Tracker()
+    ids = [str(index) for index in range(50)]
+    results = collect(fetch_many(fetch, ids, concurrency=4, ordered=ordered))
+    assert sorted(result.id for result in results) == sorted(ids)
+    assert fetch.peak <= 4
+
+
+def test_ordered_results_follow_the_input():
+    ids = [str(index) for index in range(30)]
+    results = collect(fetch_many(Tracker(), ids, concurrency=8, ordered=True))
+    assert [result.id for result in results] == ids
+    assert all(result.ok and result.data == {"id": result.id} for result in results)
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_failures_are_reported_per_id(ordered):
+    results = collect(
+        fetch_many(Tracker(), ["a", "missing", "crash", "b"], ordered=ordered)
+    )
+    outcomes = {result.id: result for result in results}
+    assert outcomes["a"].ok and outcomes["b"].ok
+    assert outcomes["missing"].status_code == 404 and not outcomes["missing"].ok
+    assert isinstance(outcomes["crash"].error, RuntimeError)
+    assert outcomes["crash"].status_code is None
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_ids_are_consumed_lazily(ordered):
+    fetch = Tracker()
+    ids = (str(index) for index in itertools.count())
+    results = collect(fetch_many(fetch, ids, concurrency=3, ordered=ordered), limit=5)
+    assert len(results) == 5
+    # an unbounded input is only read a window ahead of the consumer
+    assert len(fetch.started) <= 5 + 3 * 2
+
+
+def test_errors_of_the_input_iterator_are_raised():
+    def ids():
+        yield "a"
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        collect(fetch_many(Tracker(), ids()))
+
+
+def test_module_fetch_many(api):
+    for id in ("a", "b"):
+        api.routes[f"/v2/project/{id}"] = lambda query, id=id: (200, {"id": id})
+    results = collect(Projects_Async.fetch_many(["a", "missing", "b"], ordered=True))
+    assert [result.id for result in results] == ["a", "missing", "b"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[0].data == {"id": "a"}
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from urllib.parse import quote
+
+from ModrinthAPI import Projects, Users
+from ModrinthAPI.Async import Versions_Async
+from ModrinthAPI.utils.Chunking import (
+    chunk_ids,
+    chunk_list,
+    merge_in_order,
+    request_chunked,
+)
+
+
+def long_ids(count: int) -> list[str]:
+    return [f"{index:03d}" + "x" * 600 for index in range(count)]
+
+
+def serve(api, path: str, keys=("id",)):
+    def route(query):
+        ids = json.loads(query["ids"][0])
+        return 200, [
+            {key: id for key in keys} for id in ids if not id.startswith("missing")
+        ]
+
+    api.routes[path] = route
+
+
+def test_chunks_stay_within_the_query_budget():
+    ids = long_ids(30)
+    chunks = chunk_ids(ids, max_length=2000)
+    assert len(chunks) > 1
+    assert [id for chunk in chunks for id in chunk] == ids
+    assert all(len(quote(json.dumps(chunk))) <= 2000 for chunk in chunks)
+
+
+def test_chunking_drops_duplicates_and_keeps_single_oversized_ids():
+    assert chunk_ids(["a", "b", "a"]) == [["a", "b"]]
+    assert chunk_ids(["x" * 100], max_length=10) == [["x" * 100]]
+    assert chunk_ids([]) == []
+
+
+def test_chunk_list():
+    assert chunk_list([1, 2, 3, 2, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert chunk_list([1, 2], 0) == [[1], [2]]
+
+
+def test_merge_in_order_matches_ids_and_slugs():
+    items = [{"id": "B", "slug": "b"}, {"id": "A", "slug": "a"}]
+    found, missing = merge_in_order(["a", "B", "c", "a"], items, keys=("id", "slug"))
+    assert found == [items[1], items[0]]
+    assert missing == ["c"]
+
+
+def test_request_chunked_sends_one_request_per_chunk(api):
+    serve(api, "/v2/projects")
+    ids = long_ids(20)
+    responses = request_chunked(f"{api.url}/v2/projects", ids, max_workers=4)
+    assert len(responses) == len(chunk_ids(ids)) == len(api.hits("/v2/projects"))
+    assert all(status == 200 for _, status in responses)
+    assert sorted(item["id"] for response, _ in responses for item in response) == ids
+
+
+def test_get_multiple_returns_input_order_and_missing_ids(api):
+    serve(api, "/v2/projects", keys=("id", "slug"))
+    ids = long_ids(12)[::-1] + ["missing"]
+    projects, missing = Projects.get_multiple(ids, return_missing=True)
+    assert [project["id"] for project in projects] == ids[:-1]
+    assert missing == ["missing"]
+    assert len(api.hits("/v2/projects")) > 1
+
+
+def test_users_get_multiple(api):
+    serve(api, "/v2/users")
+    assert [user["id"] for user in Users.get_multiple(["b", "a"])] == ["b", "a"]
+
+
+def test_async_get_multiple(api):
+    serve(api, "/v2/versions")
+    ids = long_ids(12)
+    versions = asyncio.run(Versions_Async.get_multiple(ids, concurrency=2))
+    assert [version["id"] for version in versions] == ids
+    assert len(api.hits("/v2/versions")) > 1
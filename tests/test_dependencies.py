@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from ModrinthAPI import Dependencies
+
+
+def version(id: str, project_id: str, *dependencies) -> dict:
+    return {
+        "id": id,
+        "project_id": project_id,
+        "dependencies": [
+            {
+                "version_id": version_id,
+                "project_id": dependency_project,
+                "dependency_type": kind,
+            }
+            for version_id, dependency_project, kind in dependencies
+        ],
+    }
+
+
+VERSIONS = {
+    "a1": version(
+        "a1",
+        "A",
+        ("b1", None, "required"),
+        (None, "C", "required"),
+        (None, "D", "optional"),
+        (None, "E", "incompatible"),
+    ),
+    "b1": version("b1", "B", (None, "C", "required")),
+    "c1": version("c1", "C"),
+    "c2": version("c2", "C"),
+    "d1": version("d1", "D", ("gone", None, "required")),
+    "e1": version("e1", "E"),
+}
+
+# newest first, as the API lists them
+PROJECT_VERSIONS = {
+    "A": ["a1"],
+    "B": ["b1"],
+    "C": ["c2", "c1"],
+    "D": ["d1"],
+    "E": ["e1"],
+}
+
+
+@pytest.fixture
+def modrinth(api):
+    def versions(query):
+        ids = json.loads(query["ids"][0])
+        return 200, [VERSIONS[id] for id in ids if id in VERSIONS]
+
+    def projects(query):
+        ids = json.loads(query["ids"][0])
+        return 200, [{"id": id} for id in ids if id in PROJECT_VERSIONS]
+
+    api.routes["/v2/versions"] = versions
+    api.routes["/v2/projects"] = projects
+    for project_id, ids in PROJECT_VERSIONS.items():
+        api.routes[f"/v2/project/{project_id}/version"] = lambda query, ids=ids: (
+            200,
+            [VERSIONS[id] for id in ids],
+        )
+    return api
+
+
+def test_required_dependencies_are_resolved_level_by_level(modrinth):
+    graph = Dependencies.resolve(["a1"])
+    assert graph.roots == ["a1"]
+    assert set(graph.versions) == {"a1", "b1", "c2"}
+    # one batched versions request per level, and each project's versions listed once
+    assert len(modrinth.hits("/v2/versions")) == 2
+    assert len(modrinth.hits("/v2/project/C/version")) == 1
+    assert {edge.dependency_version_id for edge in graph.required} == {"b1", "c2"}
+    assert graph.unresolved == []
+    assert set(graph.projects) == {"A", "B", "C", "D", "E"}
+
+
+def test_unfollowed_dependencies_are_kept_as_edges(modrinth):
+    graph = Dependencies.resolve(["a1"], include_projects=False)
+    assert [edge.project_id for edge in graph.optional] == ["D"]
+    assert [edge.project_id for edge in graph.incompatible] == ["E"]
+    assert graph.optional[0].dependency_version_id is None
+    assert graph.projects == {}
+    assert graph.conflicts() == []
+
+
+def test_optional_dependencies_can_be_followed(modrinth):
+    graph = Dependencies.resolve(["a1"], include_optional=True)
+    assert "d1" in graph
+    # d1 depends on a version that does not exist
+    assert [edge.dependency_version_id for edge in graph.unresolved] == ["gone"]
+
+
+def test_a_version_already_in_the_graph_wins_for_its_project(modrinth):
+    graph = Dependencies.resolve(["a1", "c1"])
+    assert set(graph.versions) == {"a1", "b1", "c1"}
+    assert modrinth.hits("/v2/project/C/version") == []
+    dependencies = graph.dependencies_of("b1")
+    assert [edge.dependency_version_id for edge in dependencies] == ["c1"]
+    assert {edge.version_id for edge in graph.dependents_of("c1")} == {"a1", "b1"}
+
+
+def test_projects_resolve_to_their_newest_version(modrinth):
+    queries = []
+
+    def list_versions(query):
+        queries.append(query)
+        return 200, [VERSIONS["c2"], VERSIONS["c1"]]
+
+    modrinth.routes["/v2/project/C/version"] = list_versions
+    graph = Dependencies.resolve(project_ids=["C", "B"], loaders=["fabric"])
+    assert graph.roots == ["c2", "b1"]
+    assert set(graph.versions) == {"b1", "c2"}
+    assert [json.loads(query["loaders"][0]) for query in queries] == [["fabric"]]
+
+
+def test_incompatibilities_within_the_graph_are_conflicts(modrinth):
+    graph = Dependencies.resolve(["a1", "e1"])
+    assert [edge.project_id for edge in graph.conflicts()] == ["E"]
@@ -0,0 +1,267 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ModrinthAPI.utils import Download
+from ModrinthAPI.utils.Download import download_file, download_many
+
+DATA = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture
+def file(server):
+    server.files["/file.jar"] = DATA
+    return f"{server.url}/file.jar"
+
+
+def hashes(data: bytes = DATA) -> dict:
+    return {
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "sha512": hashlib.sha512(data).hexdigest(),
+    }
+
+
+class CountingSession:
+    # wraps the session of the downloader, recording the most responses open at once
+    def __init__(self, session):
+        self.session = session
+        self.open = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def opened(self, change: int):
+        with self.lock:
+            self.open += change
+            self.peak = max(self.peak, self.open)
+
+    def request(self, *args, **kwargs):
+        response = self.session.request(*args, **kwargs)
+        self.opened(1)
+        close = response.close
+
+        def closing():
+            self.opened(-1)
+            close()
+
+        response.close = closing
+        return response
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    session = CountingSession(Download.get_session())
+    monkeypatch.setattr(Download, "get_session", lambda: session)
+    return session
+
+
+def read(path) -> bytes:
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def test_download_verifies_and_moves_into_place(server, file, tmp_path):
+    path = tmp_path / "file.jar"
+    result = download_file(file, str(path), hashes=hashes())
+    assert result.ok and result.size == len(DATA)
+    assert read(path) == DATA
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_existing_verified_file_is_not_downloaded_again(server, file, tmp_path):
+    path = tmp_path / "file.jar"
+    path.write_bytes(DATA)
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert server.hits("/file.jar") == []
+
+
+def test_part_file_is_resumed_with_a_range_request(server, file, tmp_path):
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(DATA[:1000])
+    result = download_file(file, str(path), hashes=hashes())
+    assert result.ok
+    assert read(path) == DATA
+    assert server.hits("/file.jar")[0]["Range"] == "bytes=1000-"
+
+
+def test_server_ignoring_the_range_restarts_the_download(server, file, tmp_path):
+    server.ranges = False
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(DATA[:1000])
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert read(path) == DATA
+
+
+def test_hash_mismatch_removes_the_partial_file(server, file, tmp_path):
+    path = tmp_path / "file.jar"
+    result = download_file(file, str(path), hashes=hashes(b"something else"))
+    assert isinstance(result.error, ValueError)
+    assert not os.path.exists(path)
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_complete_part_file_is_moved_into_place_without_a_request(
+    server, file, tmp_path
+):
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(DATA)
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert read(path) == DATA
+    assert server.hits("/file.jar") == []
+
+
+@pytest.mark.parametrize("size", [len(DATA), len(DATA) + 10])
+def test_416_for_an_oversized_part_file_restarts_the_download(
+    server, file, tmp_path, size
+):
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(b"\0" * size)
+    result = download_file(file, str(path), hashes=hashes())
+    assert result.ok
+    assert read(path) == DATA
+    first, second = server.hits("/file.jar")
+    assert first["Range"] == f"bytes={size}-"
+    assert "Range" not in second
+
+
+def test_body_shorter_than_content_length_keeps_the_part_file(server, file, tmp_path):
+    server.short = 1000
+    path = tmp_path / "file.jar"
+    result = download_file(file, str(path), hashes=hashes())
+    assert result.error is not None
+    assert not os.path.exists(path)
+    # the chunk being read when the connection dropped is lost
+    part = read(f"{path}.part")
+    assert 0 < len(part) < len(DATA) and DATA.startswith(part)
+
+    server.short = 0
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert read(path) == DATA
+    assert server.hits("/file.jar")[-1]["Range"] == f"bytes={len(part)}-"
+
+
+def test_segmented_download(server, file, tmp_path):
+    path = tmp_path / "file.jar"
+    progress = {}
+    result = download_file(
+        file,
+        str(path),
+        hashes=hashes(),
+        segments=4,
+        min_segment_size=len(DATA) // 8,
+        segment_progress=lambda _, index, done, length: progress.update(
+            {index: (done, length)}
+        ),
+    )
+    assert result.ok
+    assert read(path) == DATA
+    assert not os.path.exists(f"{path}.segments")
+    assert sorted(progress) == [0, 1, 2, 3]
+    assert all(done == length for done, length in progress.values())
+
+
+def test_interrupted_segmented_download_is_discarded_and_restarted(
+    server, file, tmp_path
+):
+    path = tmp_path / "file.jar"
+    options = dict(hashes=hashes(), segments=4, min_segment_size=len(DATA) // 8)
+    server.short = 1000
+    result = download_file(file, str(path), **options)
+    assert result.error is not None
+    assert not os.path.exists(f"{path}.segments")
+    assert not os.path.exists(f"{path}.part")
+
+    server.short = 0
+    assert download_file(file, str(path), **options).ok
+    assert read(path) == DATA
+
+
+def test_stale_segments_file_is_not_resumed(server, file, tmp_path):
+    # a preallocated file left by a killed segmented download is full size but full of holes
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.segments").write_bytes(b"\0" * len(DATA))
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert read(path) == DATA
+    assert not os.path.exists(f"{path}.segments")
+    assert "Range" not in server.hits("/file.jar")[0]
+
+
+def test_download_many(server, tmp_path):
+    files = []
+    for index in range(3):
+        data = DATA[index:]
+        server.files[f"/{index}.jar"] = data
+        files.append(
+            {
+                "url": f"{server.url}/{index}.jar",
+                "filename": f"../{index}.jar",
+                "hashes": hashes(data),
+            }
+        )
+    results = download_many(files, str(tmp_path / "mods"))
+    assert [result.ok for result in results] == [True] * 3
+    # filenames cannot escape the target directory
+    assert sorted(os.listdir(tmp_path / "mods")) == ["0.jar", "1.jar", "2.jar"]
+    assert read(tmp_path / "mods" / "2.jar") == DATA[2:]
+
+
+def test_resume_answered_with_another_range_restarts_the_download(
+    server, file, tmp_path
+):
+    server.range_shift = 100
+    path = tmp_path / "file.jar"
+    (tmp_path / "file.jar.part").write_bytes(DATA[:1000])
+    assert download_file(file, str(path), hashes=hashes()).ok
+    assert read(path) == DATA
+    first, second = server.hits("/file.jar")
+    assert first["Range"] == "bytes=1000-"
+    assert "Range" not in second
+
+
+def test_segment_answered_with_another_range_fails(server, file, tmp_path):
+    server.range_shift = 100
+    path = tmp_path / "file.jar"
+    result = download_file(file, str(path), segments=4, min_segment_size=len(DATA) // 8)
+    assert result.error is not None
+    assert not os.path.exists(path)
+
+
+def test_segments_share_the_connection_budget(server, file, tmp_path, counting):
+    server.delay = 0.05
+    connections = threading.BoundedSemaphore(3)
+    options = dict(
+        hashes=hashes(),
+        segments=4,
+        min_segment_size=len(DATA) // 8,
+        connections=connections,
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            executor.map(
+                lambda name: download_file(file, str(tmp_path / name), **options),
+                ["a.jar", "b.jar"],
+            )
+        )
+    assert all(result.ok for result in results)
+    assert counting.peak == 3
+
+
+def test_download_many_caps_connections_across_files_and_segments(
+    server, tmp_path, counting
+):
+    server.delay = 0.05
+    large = DATA * 16  # two minimum-size segments
+    server.files["/large.jar"] = large
+    files = [
+        {
+            "url": f"{server.url}/large.jar",
+            "filename": f"{name}.jar",
+            "hashes": hashes(large),
+        }
+        for name in ("a", "b", "c")
+    ]
+    results = download_many(files, str(tmp_path), max_workers=3, segments=2)
+    assert [result.ok for result in results] == [True] * 3
+    assert counting.peak == 3
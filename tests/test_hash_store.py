@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from ModrinthAPI import Versions
+from ModrinthAPI.Async import Versions_Async
+from ModrinthAPI.utils import Hash_Store
+from ModrinthAPI.utils.Hash_Store import HashStore, set_hash_store
+
+
+@pytest.fixture
+def store():
+    store = HashStore(":memory:")
+    set_hash_store(store)
+    yield store
+    set_hash_store(None)
+    store.close()
+
+
+def test_entries_are_kept_per_algorithm(store):
+    store.put("aa", {"id": "v1"})
+    store.put_many({"bb": {"id": "v2"}}, algorithm="sha512")
+    assert store.get_many(["aa", "bb", "cc"]) == {"aa": {"id": "v1"}}
+    assert store.get_many(["bb"], algorithm="sha512") == {"bb": {"id": "v2"}}
+
+
+def test_unknown_hashes_expire(store):
+    store.put_missing(["aa"])
+    assert store.get_many(["aa"]) == {"aa": None}
+    store.negative_ttl = -1
+    store.put_missing(["bb"])
+    assert store.get_many(["bb"]) == {}
+    store.clear()
+    assert store.get_many(["aa"]) == {}
+
+
+def test_lookups_are_chunked_below_the_parameter_limit(store):
+    hashes = [f"{index:04x}" for index in range(1200)]
+    store.put_many({file_hash: {"id": file_hash} for file_hash in hashes})
+    assert len(store.get_many(hashes)) == 1200
+
+
+def test_database_persists_on_disk(tmp_path):
+    path = str(tmp_path / "hashes.sqlite3")
+    with HashStore(path) as store:
+        store.put("aa", {"id": "v1"})
+    with HashStore(path) as store:
+        assert store.get_many(["aa"]) == {"aa": {"id": "v1"}}
+
+
+def test_default_database_is_in_the_user_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(Hash_Store.sys, "platform", "linux")
+    monkeypatch.setattr(Hash_Store.os, "name", "posix")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    with HashStore() as store:
+        assert store.path == os.path.join(tmp_path, "ModrinthAPI", "hashes.sqlite3")
+        assert os.path.exists(store.path)
+
+
+def test_get_from_hash_answers_repeats_from_the_store(api, store):
+    api.routes["/v2/version_file/aa"] = lambda query: (200, {"id": "v1"})
+    assert Versions.get_from_hash("aa") == {"id": "v1"}
+    assert Versions.get_from_hash("aa") == {"id": "v1"}
+    assert len(api.hits("/v2/version_file/aa")) == 1
+    assert store.get_many(["aa"]) == {"aa": {"id": "v1"}}
+
+
+def test_get_from_hash_remembers_unknown_hashes(api, store):
+    assert Versions.get_from_hash("missing") is None
+    assert Versions.get_from_hash("missing") is None
+    assert len(api.hits("/v2/version_file/missing")) == 1
+
+
+def test_async_get_from_hash_uses_the_store_off_the_event_loop(api, store, monkeypatch):
+    api.routes["/v2/version_file/aa"] = lambda query: (200, {"id": "v1"})
+    threads = set()
+    get_many = store.get_many
+
+    def recording(*args):
+        threads.add(threading.get_ident())
+        return get_many(*args)
+
+    monkeypatch.setattr(store, "get_many", recording)
+
+    async def main():
+        return [await Versions_Async.get_from_hash("aa") for _ in range(2)]
+
+    assert asyncio.run(main()) == [{"id": "v1"}] * 2
+    assert len(api.hits("/v2/version_file/aa")) == 1
+    assert threads and threading.get_ident() not in threads
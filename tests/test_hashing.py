@@ -0,0 +1,116 @@
+import hashlib
+import os
+
+import pytest
+
+from ModrinthAPI import Versions
+from ModrinthAPI.utils import Hashing
+from ModrinthAPI.utils.Hashing import (
+    HashStats,
+    find_files,
+    hash_directory,
+    hash_file,
+    hash_files,
+)
+
+
+@pytest.fixture
+def mods(tmp_path):
+    (tmp_path / "sub").mkdir()
+    contents = {
+        "a.jar": b"a" * 5000,
+        "b.zip": b"b",
+        "sub/c.jar": os.urandom(3000),
+        "notes.txt": b"ignored",
+    }
+    for name, data in contents.items():
+        (tmp_path / name).write_bytes(data)
+    return tmp_path, contents
+
+
+@pytest.fixture
+def unreadable(monkeypatch):
+    # makes hash_file fail for files named locked.jar
+    def hash_or_fail(path, chunk_size=Hashing.CHUNK_SIZE):
+        if os.path.basename(path) == "locked.jar":
+            raise PermissionError(13, "Permission denied", path)
+        return hash_file(path, chunk_size)
+
+    monkeypatch.setattr(Hashing, "hash_file", hash_or_fail)
+
+
+def test_hash_file_matches_hashlib_across_chunks(mods):
+    directory, contents = mods
+    hashes = hash_file(str(directory / "sub/c.jar"), chunk_size=1024)
+    data = contents["sub/c.jar"]
+    assert hashes.size == len(data)
+    assert hashes.sha1 == hashlib.sha1(data).hexdigest()
+    assert hashes.sha512 == hashlib.sha512(data).hexdigest()
+
+
+def test_find_files_filters_by_pattern(mods):
+    directory, _ = mods
+    found = {os.path.relpath(path, directory) for path in find_files(str(directory))}
+    assert found == {"a.jar", "b.zip", os.path.join("sub", "c.jar")}
+    top_level = find_files(str(directory), recursive=False)
+    assert {os.path.basename(path) for path in top_level} == {"a.jar", "b.zip"}
+
+
+def test_hash_files_keeps_input_order(mods):
+    directory, contents = mods
+    paths = [str(directory / name) for name in contents] * 5
+    stats = HashStats()
+    results = list(hash_files(paths, max_workers=2, stats=stats))
+    assert [result.path for result in results] == paths
+    assert stats.files == len(paths)
+    assert stats.bytes == sum(map(len, contents.values())) * 5
+
+
+def test_unreadable_files_are_skipped_and_reported(mods, unreadable):
+    directory, _ = mods
+    (directory / "locked.jar").write_bytes(b"locked")
+    paths = [
+        str(directory / "a.jar"),
+        str(directory / "locked.jar"),
+        str(directory / "gone.jar"),
+    ]
+    stats = HashStats()
+    errors = []
+    results = list(
+        hash_files(
+            paths,
+            max_workers=1,
+            stats=stats,
+            on_error=lambda *error: errors.append(error),
+        )
+    )
+    assert [result.path for result in results] == paths[:1]
+    assert stats.failed == paths[1:]
+    assert [path for path, _ in errors] == paths[1:]
+    assert all(isinstance(err, OSError) for _, err in errors)
+
+
+def test_hash_directory_continues_past_unreadable_files(mods, unreadable):
+    directory, _ = mods
+    (directory / "locked.jar").write_bytes(b"locked")
+    stats = HashStats()
+    results = list(hash_directory(str(directory), stats=stats))
+    assert len(results) == 3
+    assert stats.failed == [str(directory / "locked.jar")]
+
+
+def test_get_from_directory_identifies_readable_files(api, mods, unreadable, capsys):
+    directory, contents = mods
+    (directory / "locked.jar").write_bytes(b"locked")
+    known = {hashlib.sha1(contents["a.jar"]).hexdigest(): {"id": "v1"}}
+    api.routes["/v2/version_files"] = lambda body: (
+        200,
+        {
+            file_hash: known[file_hash]
+            for file_hash in body["hashes"]
+            if file_hash in known
+        },
+    )
+    versions = Versions.get_from_directory(str(directory), batch_size=2)
+    assert versions == {str(directory / "a.jar"): {"id": "v1"}}
+    assert "locked.jar" in capsys.readouterr().out
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from ModrinthAPI.Async.utils.API_Request_Async import request_async
+from ModrinthAPI.Async.utils.Hedge_Async import Hedger, set_hedger
+from ModrinthAPI.utils.Metrics import endpoint_template
+from ModrinthAPI.utils.Rate_Limit import RateLimiter, set_rate_limiter
+
+ENDPOINT = "/v2/project/{id}"
+
+
+def primed(latency: float = 0.05, **options) -> Hedger:
+    # a hedger that has already seen enough requests to hedge ENDPOINT after `latency`
+    hedger = Hedger(**options)
+    for _ in range(hedger.min_samples):
+        hedger.observe(ENDPOINT, latency)
+    return hedger
+
+
+def call(delays: list, wait: float = 0):
+    # a request whose calls wait `wait` for the rate limiter, then take the next of `delays` once sent
+    calls = []
+
+    async def function(on_send):
+        index = len(calls)
+        calls.append(index)
+        await asyncio.sleep(wait)
+        on_send()
+        await asyncio.sleep(delays[index])
+        return f"call {index}", 200
+
+    return function, calls
+
+
+def test_threshold_is_the_latency_percentile():
+    hedger = Hedger(percentile=0.9, min_samples=10)
+    for latency in range(1, 10):
+        hedger.observe(ENDPOINT, latency / 100)
+    assert hedger.threshold(ENDPOINT) is None
+    hedger.observe(ENDPOINT, 1.0)
+    assert hedger.threshold(ENDPOINT) == 1.0
+    assert hedger.threshold("/v2/user/{id}") is None
+
+
+def test_slow_request_is_answered_by_its_hedge():
+    hedger = primed()
+    function, calls = call([1.0, 0.01])
+    started = time.monotonic()
+    assert asyncio.run(hedger.run(ENDPOINT, function)) == ("call 1", 200)
+    assert time.monotonic() - started < 0.5
+    assert calls == [0, 1]
+    assert (hedger.hedged, hedger.hedge_wins) == (1, 1)
+
+
+def test_fast_request_is_not_hedged():
+    hedger = primed()
+    function, calls = call([0.01])
+    assert asyncio.run(hedger.run(ENDPOINT, function)) == ("call 0", 200)
+    assert calls == [0] and hedger.hedged == 0
+
+
+def test_waiting_for_the_rate_limiter_does_not_count():
+    hedger = primed(min_samples=5)
+    function, calls = call([0.01, 0.01], wait=0.2)
+    assert asyncio.run(hedger.run(ENDPOINT, function)) == ("call 0", 200)
+    assert calls == [0] and hedger.hedged == 0
+    # the latency recorded is the time since the request was sent
+    latencies, _ = hedger._latencies[ENDPOINT]
+    assert latencies[-1] < 0.1
+
+
+def test_hedges_are_limited_by_the_budget():
+    hedger = primed(budget=0, burst=1)
+    for _ in range(2):
+        function, _ = call([0.2, 0.01])
+        asyncio.run(hedger.run(ENDPOINT, function))
+    assert (hedger.hedged, hedger.over_budget) == (1, 1)
+
+
+@pytest.fixture
+def slow_first(api):
+    # the first request for the project is slow, later ones answer at once
+    def route(query):
+        if len(api.hits("/v2/project/abc")) == 1:
+            time.sleep(1)
+        return 200, {"id": "abc"}
+
+    api.routes["/v2/project/abc"] = route
+    return f"{api.url}/v2/project/abc"
+
+
+def test_slow_get_is_hedged_on_another_connection(slow_first):
+    hedger = primed(latency=0.05)
+    set_hedger(hedger)
+    assert endpoint_template(slow_first) == ENDPOINT
+    started = time.monotonic()
+    assert asyncio.run(request_async(slow_first)) == ({"id": "abc"}, 200)
+    assert time.monotonic() - started < 0.9
+    assert hedger.hedge_wins == 1
+
+
+def test_hedge_timer_starts_after_the_rate_limiter_wait(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    hedger = primed(latency=0.05)
+    set_hedger(hedger)
+    limiter = RateLimiter(limit=1, period=0.3, headroom=0)
+    set_rate_limiter(limiter)
+    # the only token is spent, so the request waits 0.3s for the next one
+    limiter.reserve()
+    url = f"{api.url}/v2/project/abc"
+    assert asyncio.run(request_async(url)) == ({"id": "abc"}, 200)
+    assert hedger.hedged == 0
+    assert len(api.hits("/v2/project/abc")) == 1
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils import API_Request
+from ModrinthAPI.utils.HTTP_Cache import HTTPCache, set_http_cache
+
+
+class Revalidating:
+    # a route answering 304 when the client sends the current ETag
+    def __init__(self, server, path: str, body):
+        self.server = server
+        self.path = path
+        self.body = body
+        self.etag = '"1"'
+
+    def __call__(self, query):
+        sent = self.server.hits(self.path)[-1].get("If-None-Match")
+        if self.etag is not None and sent == self.etag:
+            return 304, None, {"ETag": self.etag}
+        headers = {"ETag": self.etag} if self.etag is not None else {}
+        return 200, self.body, headers
+
+
+@pytest.fixture
+def cache():
+    cache = HTTPCache()
+    set_http_cache(cache)
+    return cache
+
+
+def test_unchanged_responses_are_revalidated(api, cache):
+    api.routes["/v2/project/abc"] = Revalidating(api, "/v2/project/abc", {"id": "abc"})
+    assert Projects.get("abc") == {"id": "abc"}
+    assert Projects.get("abc") == {"id": "abc"}
+    hits = api.hits("/v2/project/abc")
+    assert "If-None-Match" not in hits[0]
+    assert hits[1]["If-None-Match"] == '"1"'
+
+
+def test_revalidated_bodies_are_decoded_once(api, cache, monkeypatch):
+    api.routes["/v2/project/abc"] = Revalidating(api, "/v2/project/abc", {"id": "abc"})
+    decoded = []
+    loads = API_Request.loads
+    monkeypatch.setattr(
+        API_Request, "loads", lambda body: decoded.append(body) or loads(body)
+    )
+    results = [Projects.get("abc") for _ in range(4)]
+    assert results == [{"id": "abc"}] * 4
+    assert len(decoded) == 2
+    assert results[1] is results[3]
+
+
+def test_changed_responses_replace_the_entry(api, cache):
+    route = Revalidating(api, "/v2/project/abc", {"id": "abc", "downloads": 1})
+    api.routes["/v2/project/abc"] = route
+    Projects.get("abc")
+    Projects.get("abc")
+    route.etag, route.body = '"2"', {"id": "abc", "downloads": 2}
+    assert Projects.get("abc")["downloads"] == 2
+    assert Projects.get("abc")["downloads"] == 2
+    assert api.hits("/v2/project/abc")[-1]["If-None-Match"] == '"2"'
+
+
+def test_responses_without_validators_evict_the_entry(api, cache):
+    route = Revalidating(api, "/v2/project/abc", {"id": "abc"})
+    api.routes["/v2/project/abc"] = route
+    Projects.get("abc")
+    route.etag = None
+    Projects.get("abc")
+    assert cache.get(HTTPCache.key(f"{api.url}/v2/project/abc")) is None
+    Projects.get("abc")
+    assert "If-None-Match" not in api.hits("/v2/project/abc")[-1]
+
+
+def test_async_requests_are_revalidated(api, cache):
+    api.routes["/v2/project/abc"] = Revalidating(api, "/v2/project/abc", {"id": "abc"})
+
+    async def main():
+        return [await Projects_Async.get("abc") for _ in range(3)]
+
+    assert asyncio.run(main()) == [{"id": "abc"}] * 3
+    assert [hit.get("If-None-Match") for hit in api.hits("/v2/project/abc")] == [
+        None,
+        '"1"',
+        '"1"',
+    ]
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    HTTPCache(directory=tmp_path).store("key", {"ETag": '"1"'}, b"[1]")
+    entry = HTTPCache(directory=tmp_path).get("key")
+    assert entry.etag == '"1"' and entry.body == b"[1]"
+    HTTPCache(directory=tmp_path).store("key", {}, b"[2]")
+    assert HTTPCache(directory=tmp_path).get("key") is None
+
+
+def test_memory_tier_is_bounded():
+    cache = HTTPCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.store(key, {"Last-Modified": "yesterday"}, b"{}")
+    assert cache.get("a") is None
+    assert cache.get("c").validators() == {"If-Modified-Since": "yesterday"}
+
+
+def test_keys_separate_tokens_and_ignore_unset_parameters():
+    url = "https://api.modrinth.com/v2/project/abc"
+    assert HTTPCache.key(url, {"a": None}) == url
+    assert HTTPCache.key(url, {"b": 1, "a": 2}) == f"{url}?a=2&b=1"
+    first = HTTPCache.key(url, headers={"Authorization": "one"})
+    second = HTTPCache.key(url, headers={"Authorization": "two"})
+    assert len({url, first, second}) == 3
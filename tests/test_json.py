@@ -0,0 +1,55 @@
+import asyncio
+import importlib.util
+import json
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils.Json import DECODERS, get_json_decoder, loads, set_json_decoder
+
+BODY = json.dumps(
+    {"title": "Sodium ✓", "downloads": 12, "ratio": 0.5, "tags": [None, True]}
+).encode()
+
+
+@pytest.fixture(autouse=True)
+def restore_decoder():
+    yield
+    set_json_decoder(None)
+
+
+@pytest.mark.parametrize("name", list(DECODERS))
+def test_every_decoder_matches_the_standard_library(name):
+    pytest.importorskip(name)
+    set_json_decoder(name)
+    assert get_json_decoder() == name
+    assert loads(BODY) == json.loads(BODY)
+    assert loads(BODY.decode()) == json.loads(BODY)
+
+
+def test_default_is_the_first_installed_decoder():
+    installed = [name for name in DECODERS if importlib.util.find_spec(name)]
+    set_json_decoder("json")
+    set_json_decoder(None)
+    assert get_json_decoder() == installed[0]
+
+
+def test_unknown_decoder_is_rejected():
+    with pytest.raises(ValueError):
+        set_json_decoder("simdjson")
+
+
+def test_custom_decoder_parses_sync_and_async_responses(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    decoded = []
+
+    def decoder(body):
+        decoded.append(body)
+        return json.loads(body)
+
+    set_json_decoder(decoder)
+    assert get_json_decoder() == "custom"
+    assert Projects.get("abc") == {"id": "abc"}
+    assert asyncio.run(Projects_Async.get("abc")) == {"id": "abc"}
+    assert decoded == [b'{"id": "abc"}'] * 2
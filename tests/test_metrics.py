@@ -0,0 +1,153 @@
+import asyncio
+import os
+import socket
+
+import pytest
+import requests
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils.API_Request import request
+from ModrinthAPI.utils.Metrics import Metrics, endpoint_template, set_metrics
+from ModrinthAPI.utils.Retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    set_circuit_breaker,
+    set_retry_policy,
+)
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    set_metrics(metrics)
+    return metrics
+
+
+def samples(metrics: Metrics) -> dict[str, float]:
+    # the rendered samples by their name and labels
+    return {
+        line.rpartition(" ")[0]: float(line.rpartition(" ")[2])
+        for line in metrics.render().splitlines()
+        if not line.startswith("#")
+    }
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        ("https://api.modrinth.com/v2/project/AANobbMI", "/v2/project/{id}"),
+        (
+            "https://api.modrinth.com/v2/project/sodium/version",
+            "/v2/project/{id}/version",
+        ),
+        (
+            "https://api.modrinth.com/v2/version_file/abc123?algorithm=sha1",
+            "/v2/version_file/{hash}",
+        ),
+        ("https://api.modrinth.com/v2/projects?ids=[]", "/v2/projects"),
+        ("https://api.modrinth.com/v2/search", "/v2/search"),
+    ],
+)
+def test_endpoints_are_templated(url, template):
+    assert endpoint_template(url) == template
+
+
+def test_attempts_are_timed_into_cumulative_buckets(metrics):
+    for _ in range(3):
+        event = metrics.start("GET", "https://api.modrinth.com/v2/project/a")
+        metrics.finish(event, 200, size=10)
+    event = metrics.start("GET", "https://api.modrinth.com/v2/project/b")
+    metrics.finish(event, None, error=TimeoutError())
+    rendered = samples(metrics)
+    labels = 'method="GET",endpoint="/v2/project/{id}"'
+    assert rendered[f'modrinth_requests_total{{{labels},status="200"}}'] == 3
+    assert rendered[f'modrinth_requests_total{{{labels},status="error"}}'] == 1
+    assert rendered[f"modrinth_response_bytes_total{{{labels}}}"] == 30
+    assert (
+        rendered[f'modrinth_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 4
+    )
+    assert rendered[f"modrinth_request_duration_seconds_count{{{labels}}}"] == 4
+    buckets = [
+        value
+        for name, value in rendered.items()
+        if name.startswith("modrinth_request_duration_seconds_bucket")
+    ]
+    assert buckets == sorted(buckets)
+
+
+def test_hooks_see_every_attempt(metrics):
+    before, after = [], []
+    metrics.add_hook(before=before.append, after=after.append)
+    event = metrics.start("GET", "https://api.modrinth.com/v2/user/jelly", attempt=2)
+    metrics.finish(event, 404, size=5)
+    assert before[0].status is None and before[0].attempt == 2
+    assert (after[0].endpoint, after[0].status, after[0].size) == (
+        "/v2/user/{id}",
+        404,
+        5,
+    )
+    assert after[0].elapsed >= 0
+
+
+def test_counters_and_reset(metrics):
+    metrics.add_hook(after=lambda event: None)
+    metrics.count("retries", "/v2/search")
+    metrics.count("rate_limit_wait_seconds", "/v2/search", 1.5)
+    rendered = samples(metrics)
+    assert rendered['modrinth_retries_total{endpoint="/v2/search"}'] == 1
+    assert (
+        rendered['modrinth_rate_limit_wait_seconds_total{endpoint="/v2/search"}'] == 1.5
+    )
+    metrics.reset()
+    assert not any(name.startswith("modrinth_retries") for name in samples(metrics))
+    assert len(metrics.after_hooks) == 1
+
+
+def test_labels_are_escaped(metrics):
+    metrics.count("retries", 'a"b\\c\nd')
+    assert 'modrinth_retries_total{endpoint="a\\"b\\\\c\\nd"} 1' in metrics.render()
+
+
+def test_components_are_rendered(metrics):
+    set_circuit_breaker(CircuitBreaker(failure_threshold=1))
+    rendered = samples(metrics)
+    assert rendered["modrinth_single_flight_shared_total"] == 0
+    assert rendered["modrinth_circuit_breaker_open"] == 0
+    assert rendered["modrinth_retry_budget_exhausted_total"] == 0
+
+
+def test_metrics_are_written_atomically(metrics, tmp_path):
+    path = tmp_path / "modrinth.prom"
+    path.write_text("stale")
+    metrics.count("hedges")
+    metrics.write(str(path))
+    assert path.read_text() == metrics.render()
+    assert os.listdir(tmp_path) == ["modrinth.prom"]
+
+
+def test_requests_are_recorded_with_their_retries(api, metrics):
+    set_retry_policy(RetryPolicy(backoff=0.01))
+    statuses = [503]
+    api.routes["/v2/project/abc"] = lambda query: (
+        (statuses.pop(), {}) if statuses else (200, {"id": "abc"})
+    )
+    assert Projects.get("abc") == {"id": "abc"}
+    assert asyncio.run(Projects_Async.get("abc")) == {"id": "abc"}
+    rendered = samples(metrics)
+    labels = 'method="GET",endpoint="/v2/project/{id}"'
+    assert rendered[f'modrinth_requests_total{{{labels},status="503"}}'] == 1
+    assert rendered[f'modrinth_requests_total{{{labels},status="200"}}'] == 2
+    assert rendered['modrinth_retries_total{endpoint="/v2/project/{id}"}'] == 1
+
+
+def test_failed_connections_are_recorded_as_errors(metrics):
+    set_retry_policy(None)
+    with socket.socket() as closed:
+        closed.bind(("127.0.0.1", 0))
+        port = closed.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        request(f"http://127.0.0.1:{port}/v2/project/abc", "GET")
+    rendered = samples(metrics)
+    labels = 'method="GET",endpoint="/v2/project/{id}",status="error"'
+    assert rendered[f"modrinth_requests_total{{{labels}}}"] == 1
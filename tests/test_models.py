@@ -0,0 +1,164 @@
+import asyncio
+import json
+import pickle
+
+import msgspec
+import pytest
+
+from ModrinthAPI import Projects, Teams, Versions
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils import Models
+from ModrinthAPI.utils.Json import set_json_decoder
+from ModrinthAPI.utils.Models import Project, TeamMember, User, Version
+
+PROJECT = {
+    "id": "AANobbMI",
+    "slug": "sodium",
+    "title": "Sodium",
+    "body": "A rendering engine.",
+    "downloads": 100,
+    "loaders": ["fabric", "quilt"],
+    "license": {"id": "LGPL-3.0-only", "name": "", "url": None},
+    "gallery": [{"url": "https://cdn.modrinth.com/1.png", "featured": True}],
+    "introduced_later": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def models():
+    Models.set_models(True)
+    yield
+    Models.set_models(False)
+    set_json_decoder(None)
+
+
+@pytest.fixture
+def project(api):
+    api.routes["/v2/project/sodium"] = lambda query: (200, PROJECT)
+    return api
+
+
+def test_models_are_read_only_mappings(project):
+    model = Projects.get("sodium")
+    assert isinstance(model, Project)
+    assert model.title == model["title"] == "Sodium"
+    assert model.loaders == ["fabric", "quilt"]
+    assert model.get("moderator_message") is None
+    with pytest.raises(KeyError):
+        model["moderator_message"]
+    assert list(model) == [
+        "id",
+        "slug",
+        "title",
+        "body",
+        "license",
+        "downloads",
+        "loaders",
+        "gallery",
+    ]
+    with pytest.raises(AttributeError):
+        model.title = "Iris"
+
+
+def test_undeclared_fields_are_skipped(project):
+    model = Projects.get("sodium")
+    expected = {
+        key: value for key, value in PROJECT.items() if key != "introduced_later"
+    }
+    assert "introduced_later" not in model
+    assert model == expected
+    assert model.to_dict() == expected
+
+
+def test_bodies_are_decoded_straight_into_models(project):
+    decoded = []
+
+    def decoder(body):
+        decoded.append(body)
+        return json.loads(body)
+
+    set_json_decoder(decoder)
+    assert isinstance(Projects.get("sodium"), Project)
+    assert isinstance(asyncio.run(Projects_Async.get("sodium")), Project)
+    assert decoded == []
+
+
+def test_models_are_off_by_default(project):
+    Models.set_models(False)
+    assert type(Projects.get("sodium")) is dict
+
+
+def test_nested_lists_and_models(api):
+    member = {
+        "team_id": "t1",
+        "role": "Owner",
+        "user": {"id": "u1", "username": "jelly"},
+    }
+    api.routes["/v2/team/t1/members"] = lambda query: (200, [[member], [member]])
+    teams = Teams.get_members_from_teams("t1")
+    assert [[type(item) for item in team] for team in teams] == [[TeamMember]] * 2
+    assert isinstance(teams[0][0].user, User)
+    assert teams[0][0].to_dict() == member
+
+
+def test_results_decoded_on_other_threads_are_converted(api):
+    api.routes["/v2/version_files"] = lambda body: (
+        200,
+        {file_hash: {"id": file_hash.upper()} for file_hash in body["hashes"]},
+    )
+    versions = Versions.get_from_hashes(["aa", "bb"])
+    assert list(versions) == ["aa", "bb"]
+    assert all(isinstance(version, Version) for version in versions.values())
+    assert versions["bb"].id == "BB"
+
+
+def test_unexpected_shapes_are_left_as_decoded(api):
+    api.routes["/v2/project/sodium"] = lambda query: (200, "sodium")
+    assert Projects.get("sodium") == "sodium"
+
+
+def test_models_can_be_pickled(project):
+    model = Projects.get("sodium")
+    copy = pickle.loads(pickle.dumps(model))
+    assert isinstance(copy, Project)
+    assert copy == model
+
+
+def test_models_need_msgspec(monkeypatch):
+    Models.set_models(False)
+    monkeypatch.setattr(Models, "msgspec", None)
+    with pytest.raises(ImportError):
+        Models.set_models(True)
+
+
+def test_lazy_heavy_fields_are_decoded_on_first_access(project):
+    Models.set_heavy_fields("lazy")
+    model = Projects.get("sodium")
+    assert isinstance(model._raw_body, msgspec.Raw)
+    assert isinstance(model._raw_gallery, msgspec.Raw)
+    # listing the fields does not decode them
+    assert "body" in model and "gallery" in list(model)
+    assert isinstance(model._raw_body, msgspec.Raw)
+    assert model.body == PROJECT["body"]
+    assert model["gallery"] == PROJECT["gallery"]
+    assert model.body is model.body
+    assert isinstance(asyncio.run(Projects_Async.get("sodium"))._raw_body, msgspec.Raw)
+
+
+def test_dropped_heavy_fields_are_absent(project):
+    Models.set_heavy_fields("drop")
+    model = Projects.get("sodium")
+    assert "body" not in model and model.get("gallery") is None
+    with pytest.raises(AttributeError):
+        model.body
+    assert model["title"] == "Sodium"
+
+
+def test_heavy_field_modes_need_models():
+    Models.set_heavy_fields("drop")
+    Models.set_models(False)
+    assert Models.heavy_fields == "eager"
+    for mode in ("lazy", "drop"):
+        with pytest.raises(ValueError):
+            Models.set_heavy_fields(mode)
+    Models.set_heavy_fields("eager")
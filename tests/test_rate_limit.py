@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils import Rate_Limit
+from ModrinthAPI.utils.Rate_Limit import RateLimiter, set_rate_limiter
+
+
+class Clock:
+    # stands in for the time module of Rate_Limit
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(Rate_Limit, "time", clock)
+    return clock
+
+
+def window(remaining: int, reset: float, limit: int = 300) -> dict:
+    return {
+        "X-Ratelimit-Limit": str(limit),
+        "X-Ratelimit-Remaining": str(remaining),
+        "X-Ratelimit-Reset": str(reset),
+    }
+
+
+def drain(limiter: RateLimiter):
+    for _ in range(limiter.capacity):
+        assert limiter.reserve() == 0
+
+
+def test_bucket_allows_a_burst_then_refills_at_the_rate(clock):
+    limiter = RateLimiter(limit=10, period=9, headroom=1)
+    assert [limiter.reserve() for _ in range(9)] == [0.0] * 9
+    assert limiter.reserve() == pytest.approx(1.0)
+    assert limiter.reserve() == pytest.approx(2.0)
+    clock.now += 9
+    assert limiter.reserve() == 0.0
+
+
+def test_exhausted_window_waits_for_the_reset_without_a_429(clock):
+    limiter = RateLimiter()
+    drain(limiter)
+    limiter.update(window(remaining=0, reset=40), 200)
+    waits = [limiter.reserve() for _ in range(5)]
+    assert all(wait == pytest.approx(40, abs=0.1) for wait in waits)
+
+
+def test_remaining_requests_are_spread_over_the_window(clock):
+    limiter = RateLimiter()
+    drain(limiter)
+    limiter.update(window(remaining=11, reset=10), 200)
+    waits = [limiter.reserve() for _ in range(10)]
+    assert waits == pytest.approx([index + 1.0 for index in range(10)], abs=0.05)
+    # the window is spent; the next request goes when it resets
+    assert limiter.reserve() == pytest.approx(10.0, abs=0.05)
+
+
+def test_a_window_with_requests_left_does_not_throttle_a_burst(clock):
+    limiter = RateLimiter()
+    limiter.update(window(remaining=200, reset=30), 200)
+    assert [limiter.reserve() for _ in range(100)] == [0.0] * 100
+
+
+def test_full_budget_returns_after_the_window_resets(clock):
+    limiter = RateLimiter(limit=10, headroom=1)
+    limiter.update(window(remaining=0, reset=5, limit=10), 200)
+    assert limiter.reserve() == pytest.approx(5.0)
+    clock.now += 5
+    # one token of the new window was already promised to the queued request
+    assert [limiter.reserve() for _ in range(8)] == [0.0] * 8
+    assert limiter.reserve() > 0
+
+
+def test_429_pauses_for_retry_after(clock):
+    limiter = RateLimiter()
+    limiter.update({"Retry-After": "7"}, 429)
+    assert limiter.reserve() == pytest.approx(7.0)
+    clock.now += 7
+    assert limiter.reserve() == 0.0
+
+
+def test_429_with_a_zero_retry_after_does_not_pause(clock):
+    limiter = RateLimiter()
+    limiter.update({"Retry-After": "0"}, 429)
+    assert limiter.reserve() == 0.0
+
+
+def test_429_without_headers_pauses_for_a_period(clock):
+    limiter = RateLimiter(period=60)
+    limiter.update({}, 429)
+    assert limiter.reserve() == pytest.approx(60.0)
+
+
+def test_429_without_retry_after_pauses_until_the_reset(clock):
+    limiter = RateLimiter()
+    limiter.update(window(remaining=0, reset=12), 429)
+    assert limiter.reserve() == pytest.approx(12.0, abs=0.1)
+
+
+def test_limit_header_sets_the_capacity(clock):
+    limiter = RateLimiter(limit=300, headroom=1)
+    limiter.update({"X-Ratelimit-Limit": "60"}, 200)
+    assert limiter.capacity == 59
+    assert limiter.rate == pytest.approx(59 / 60)
+
+
+def test_invalid_headers_are_ignored(clock):
+    limiter = RateLimiter()
+    limiter.update({"X-Ratelimit-Remaining": "soon", "X-Ratelimit-Reset": ""}, 200)
+    assert limiter.reserve() == 0.0
+
+
+def test_acquire_sleeps_for_the_wait(clock):
+    limiter = RateLimiter()
+    drain(limiter)
+    limiter.update(window(remaining=0, reset=3), 200)
+    started = clock.now
+    assert limiter.acquire() == pytest.approx(3.0, abs=0.01)
+    assert clock.now - started == pytest.approx(3.0, abs=0.01)
+
+
+def test_requests_wait_for_an_exhausted_window(api):
+    set_rate_limiter(RateLimiter())
+    api.routes["/v2/project/abc"] = lambda query: (
+        200,
+        {"id": "abc"},
+        window(remaining=0, reset=0.5),
+    )
+    Projects.get("abc")
+    started = time.monotonic()
+    Projects.get("abc")
+    assert time.monotonic() - started >= 0.45
+
+    async def main():
+        started = time.monotonic()
+        await Projects_Async.get("abc")
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) >= 0.45
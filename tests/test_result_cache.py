@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils.Result_Cache import (
+    ResultCache,
+    cached,
+    mark_incomplete,
+    set_result_cache,
+)
+
+
+@pytest.fixture
+def cache(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    api.routes["/v2/search"] = lambda query: (
+        200,
+        {"hits": [{"slug": "abc"}], "offset": 0, "limit": 5, "total_hits": 1},
+    )
+    cache = ResultCache(ttls={"projects.get": 0.2})
+    set_result_cache(cache)
+    return cache
+
+
+def test_results_are_cached_per_arguments(api, cache):
+    assert Projects.get("abc") == {"id": "abc"}
+    assert Projects.get(project_id="abc") == {"id": "abc"}
+    assert len(api.hits("/v2/project/abc")) == 1
+    assert cache.stats()["projects.get"] == {"hits": 1, "misses": 1}
+
+
+def test_results_expire_after_their_ttl(api, cache):
+    Projects.get("abc")
+    Projects.get("abc")
+    time.sleep(0.3)
+    Projects.get("abc")
+    assert len(api.hits("/v2/project/abc")) == 2
+
+
+def test_ttl_of_zero_disables_caching(api, cache):
+    cache.ttls["projects.get"] = 0
+    Projects.get("abc")
+    Projects.get("abc")
+    assert len(api.hits("/v2/project/abc")) == 2
+
+
+def test_errors_are_not_cached(api, cache):
+    assert Projects.get("missing") is None
+    assert Projects.get("missing") is None
+    assert len(api.hits("/v2/project/missing")) == 2
+
+
+def test_sync_and_async_functions_do_not_share_entries(api, cache):
+    sync_result = Projects.search("abc")
+    async_result = asyncio.run(Projects_Async.search("abc"))
+    assert len(api.hits("/v2/search")) == 2
+    assert Projects.search("abc") == sync_result
+    assert asyncio.run(Projects_Async.search("abc")) == async_result
+    assert len(api.hits("/v2/search")) == 2
+
+
+def test_partial_multi_get_results_are_not_cached(api, cache):
+    def projects(query):
+        ids = json.loads(query["ids"][0])
+        if "broken" in ids:
+            return 400, {"error": "invalid_input"}
+        return 200, [{"id": id, "slug": id} for id in ids]
+
+    api.routes["/v2/projects"] = projects
+    # long IDs so that the request is split into several chunks
+    ids = [f"{index:03d}" + "x" * 600 for index in range(20)]
+    partial = ids[:10] + ["broken"] + ids[10:]
+
+    assert len(Projects.get_multiple(partial)) < len(ids)
+    Projects.get_multiple(partial)
+    assert len(Projects.get_multiple(ids)) == len(ids)
+    Projects.get_multiple(ids)
+    assert cache.stats()["projects.get_multiple"] == {"hits": 1, "misses": 3}
+
+
+def test_incomplete_inner_call_marks_the_outer_call(cache):
+    calls = []
+
+    @cached("inner")
+    def inner():
+        calls.append("inner")
+        mark_incomplete()
+        return "partial"
+
+    @cached("outer")
+    def outer():
+        calls.append("outer")
+        return inner()
+
+    outer()
+    outer()
+    assert calls == ["outer", "inner"] * 2
+
+
+def test_async_results_are_cached(api, cache):
+    async def main():
+        return [await Projects_Async.get("abc") for _ in range(3)]
+
+    assert asyncio.run(main()) == [{"id": "abc"}] * 3
+    assert len(api.hits("/v2/project/abc")) == 1
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from ModrinthAPI.Async.utils.API_Request_Async import request_async
+from ModrinthAPI.utils import Retry
+from ModrinthAPI.utils.API_Request import request
+from ModrinthAPI.utils.Retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    set_circuit_breaker,
+    set_retry_policy,
+)
+
+
+class Clock:
+    # stands in for the time module of Retry
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(Retry, "time", clock)
+    return clock
+
+
+class Flaky:
+    # answers with each of `statuses` in turn, then with 200
+    def __init__(self, *statuses, headers: dict | None = None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+
+    def __call__(self, query_or_body):
+        if self.statuses:
+            return self.statuses.pop(0), {"error": "unavailable"}, self.headers
+        return 200, {"id": "abc"}
+
+
+def test_only_idempotent_methods_and_transient_statuses_are_retried():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", 0, 503) is not None
+    assert policy.should_retry("get", 0) is not None
+    assert policy.should_retry("POST", 0, 503) is None
+    assert policy.should_retry("GET", 0, 404) is None
+    assert policy.should_retry("GET", 3, 503) is None
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(backoff=1, max_backoff=5, min_retries=100)
+    for attempt, cap in ((0, 1), (1, 2), (2, 4)):
+        delays = [policy.should_retry("GET", attempt, 500) for _ in range(20)]
+        assert all(0 <= delay <= cap for delay in delays)
+    policy.max_attempts = 10
+    assert all(policy.should_retry("GET", 8, 500) <= 5 for _ in range(20))
+
+
+def test_retry_after_is_honored_in_seconds_and_as_a_date():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", 0, 429, {"Retry-After": "7"}) == 7
+    date = formatdate(time.time() + 30, usegmt=True)
+    delay = policy.should_retry("GET", 0, 503, {"Retry-After": date})
+    assert delay == pytest.approx(30, abs=2)
+    assert policy.should_retry("GET", 0, 429, {"Retry-After": "600"}) is None
+
+
+def test_retry_budget_limits_retries_per_period(clock):
+    policy = RetryPolicy(min_retries=2, retry_ratio=0.5, budget_period=10)
+    for _ in range(4):
+        policy.record_request()
+    delays = [policy.should_retry("GET", 0, 503) for _ in range(6)]
+    # two retries plus half of the four requests
+    assert [delay is not None for delay in delays] == [True] * 4 + [False] * 2
+    assert (policy.retries, policy.exhausted) == (4, 2)
+    clock.now += 10
+    assert policy.should_retry("GET", 0, 503) is not None
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_time=30)
+    breaker.record(False)
+    breaker.record(False)
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(False)
+    breaker.check()
+    breaker.record(False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.rejected == 1
+
+
+def test_half_open_circuit_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=30)
+    breaker.record(False)
+    clock.now += 30
+    breaker.check()
+    assert breaker.state == "half-open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record(False)
+    assert breaker.state == "open"
+    clock.now += 30
+    breaker.check()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_transient_failures_are_retried(api):
+    set_retry_policy(RetryPolicy(backoff=0.01))
+    api.routes["/v2/project/abc"] = Flaky(503, 502)
+    url = f"{api.url}/v2/project/abc"
+    assert request(url, "GET") == ({"id": "abc"}, 200)
+    assert len(api.hits("/v2/project/abc")) == 3
+
+    api.routes["/v2/project/abc"] = Flaky(429, headers={"Retry-After": "0"})
+    assert asyncio.run(request_async(url)) == ({"id": "abc"}, 200)
+    assert len(api.hits("/v2/project/abc")) == 5
+
+
+def test_posts_are_not_retried(api):
+    set_retry_policy(RetryPolicy(backoff=0.01))
+    api.routes["/v2/version_files"] = Flaky(503)
+    response, status = request(f"{api.url}/v2/version_files", "POST", data={})
+    assert status == 503
+    assert len(api.hits("/v2/version_files")) == 1
+
+
+def test_open_circuit_fails_fast_without_sending(api):
+    set_retry_policy(None)
+    set_circuit_breaker(CircuitBreaker(failure_threshold=2))
+    api.routes["/v2/project/abc"] = Flaky(*[500] * 10)
+    url = f"{api.url}/v2/project/abc"
+    assert request(url, "GET")[1] == 500
+    assert asyncio.run(request_async(url))[1] == 500
+    for response, status in (request(url, "GET"), asyncio.run(request_async(url))):
+        assert isinstance(response, CircuitOpenError) and status is None
+    assert len(api.hits("/v2/project/abc")) == 2
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+
+
+class Search:
+    # GET /search over `total` projects, honouring offset and limit
+    def __init__(self, total: int):
+        self.total = total
+        self.queries = []
+        self.fail_at = None
+        self.gate = None
+
+    def __call__(self, query):
+        self.queries.append(query)
+        offset = int(query["offset"][0])
+        limit = int(query["limit"][0])
+        if self.gate is not None and offset > 0:
+            self.gate.wait(5)
+        if offset == self.fail_at:
+            return 400, {"error": "invalid_input"}
+        hits = [
+            {"slug": f"p{index}"}
+            for index in range(offset, min(offset + limit, self.total))
+        ]
+        return 200, {
+            "hits": hits,
+            "offset": offset,
+            "limit": limit,
+            "total_hits": self.total,
+        }
+
+
+@pytest.fixture
+def search(api):
+    search = api.routes["/v2/search"] = Search(total=250)
+    return search
+
+
+def slugs(count: int) -> list[str]:
+    return [f"p{index}" for index in range(count)]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_every_result_is_returned_once(search, prefetch):
+    results = list(Projects.search_all("sodium", page_size=100, prefetch=prefetch))
+    assert [hit["slug"] for hit in results] == slugs(250)
+    assert [query["offset"] for query in search.queries] == [["0"], ["100"], ["200"]]
+    assert all(query["query"] == ["sodium"] for query in search.queries)
+
+
+def test_max_results_limits_the_last_request(search):
+    results = list(Projects.search_all(page_size=40, max_results=90))
+    assert [hit["slug"] for hit in results] == slugs(90)
+    assert [query["limit"][0] for query in search.queries] == ["40", "40", "10"]
+
+
+def test_options_are_sent_with_every_page(search):
+    facets = [["categories:fabric"]]
+    list(Projects.search_all(facets=facets, index="downloads", max_results=150))
+    assert len(search.queries) == 2
+    for query in search.queries:
+        assert json.loads(query["facets"][0]) == facets
+        assert query["index"] == ["downloads"]
+
+
+def test_page_size_is_capped_at_the_api_maximum(search):
+    list(Projects.search_all(page_size=500, max_results=150))
+    assert [query["limit"][0] for query in search.queries] == ["100", "50"]
+
+
+def test_stopping_early_requests_no_further_pages(search):
+    results = Projects.search_all(page_size=10, prefetch=False)
+    assert [next(results)["slug"] for _ in range(15)] == slugs(15)
+    results.close()
+    assert len(search.queries) == 2
+
+
+def test_next_page_is_fetched_while_the_current_one_is_consumed(search):
+    search.gate = threading.Event()
+    results = Projects.search_all(page_size=100)
+    assert next(results)["slug"] == "p0"
+    deadline = time.monotonic() + 5
+    while len(search.queries) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # the second page was requested before the caller reached its end
+    assert [query["offset"] for query in search.queries] == [["0"], ["100"]]
+    search.gate.set()
+    assert len(list(results)) == 249
+
+
+def test_without_prefetch_pages_are_fetched_on_demand(search):
+    results = Projects.search_all(page_size=100, prefetch=False)
+    for _ in range(100):
+        next(results)
+    time.sleep(0.05)
+    assert len(search.queries) == 1
+    next(results)
+    assert len(search.queries) == 2
+
+
+def test_a_failed_page_ends_the_iteration(search, capsys):
+    search.fail_at = 100
+    results = list(Projects.search_all(page_size=100))
+    assert len(results) == 100
+    assert "Error" in capsys.readouterr().out
+
+
+def test_empty_search(api):
+    api.routes["/v2/search"] = Search(total=0)
+    assert list(Projects.search_all()) == []
+
+
+def collect(iterator) -> list:
+    async def main():
+        return [hit async for hit in iterator]
+
+    return asyncio.run(main())
+
+
+class SlowSearch(Search):
+    # a search whose pages take a while, recording how many are requested at once
+    def __init__(self, total: int):
+        super().__init__(total)
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, query):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        # later pages answer first
+        time.sleep(0.05 if int(query["offset"][0]) < 300 else 0.01)
+        with self.lock:
+            self.running -= 1
+        return super().__call__(query)
+
+
+def test_async_pages_are_fetched_concurrently_in_order(api):
+    search = api.routes["/v2/search"] = SlowSearch(total=1000)
+    results = collect(Projects_Async.search_all(page_size=100, concurrency=3))
+    assert [hit["slug"] for hit in results] == slugs(1000)
+    assert len(search.queries) == 10
+    assert 1 < search.peak <= 3
+
+
+def test_async_unordered_pages_are_yielded_as_they_arrive(api):
+    api.routes["/v2/search"] = SlowSearch(total=500)
+    results = collect(Projects_Async.search_all(page_size=100, ordered=False))
+    assert sorted(hit["slug"] for hit in results) == sorted(slugs(500))
+    assert [hit["slug"] for hit in results] != slugs(500)
+
+
+def test_async_max_results(search):
+    results = collect(Projects_Async.search_all(page_size=40, max_results=90))
+    assert [hit["slug"] for hit in results] == slugs(90)
+    assert sorted(query["limit"][0] for query in search.queries) == ["10", "40", "40"]
+
+
+def test_async_failed_pages_are_skipped(search, capsys):
+    search.fail_at = 100
+    results = collect(Projects_Async.search_all(page_size=100))
+    assert [hit["slug"] for hit in results] == slugs(100) + slugs(250)[200:]
+    assert "Error" in capsys.readouterr().out
+
+
+def test_async_failed_first_page_returns_nothing(search):
+    search.fail_at = 0
+    assert collect(Projects_Async.search_all()) == []
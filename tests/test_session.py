@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ModrinthAPI import Projects
+from ModrinthAPI.utils import Session as Session_Module
+from ModrinthAPI.utils.Session import Session, close_session, get_session, set_session
+
+
+def test_requests_reuse_one_pooled_connection(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    with Session():
+        for _ in range(5):
+            assert Projects.get("abc") == {"id": "abc"}
+    assert len(api.hits("/v2/project/abc")) == 5
+    assert len(api.connections) == 1
+
+
+def test_threads_share_the_pool(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    with Session(pool_maxsize=4):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: Projects.get("abc"), range(40)))
+    assert results == [{"id": "abc"}] * 40
+    # each thread holds at most one connection at a time, and returns it to the pool
+    assert len(api.connections) <= 4
+
+
+def test_context_manager_activates_and_restores_the_session():
+    previous = get_session()
+    with Session() as session:
+        assert get_session() is session
+    assert get_session() is previous
+
+
+def test_set_session_returns_the_previous_session():
+    first = Session()
+    previous = set_session(first)
+    try:
+        assert set_session(previous) is first
+    finally:
+        first.close()
+
+
+def test_close_session_creates_a_new_default_session():
+    session = get_session()
+    close_session()
+    assert Session_Module._session is None
+    assert get_session() is not session
+
+
+def test_timeout_is_applied_to_every_request(api, monkeypatch):
+    seen = []
+    session = Session(timeout=3)
+    monkeypatch.setattr(
+        session.http, "request", lambda method, url, **kwargs: seen.append(kwargs)
+    )
+    session.request("GET", api.url)
+    session.request("GET", api.url, timeout=1)
+    assert [kwargs["timeout"] for kwargs in seen] == [3, 1]
@@ -0,0 +1,77 @@
+import asyncio
+
+from ModrinthAPI.Async import Projects_Async, SessionAsync, close_default_session_async
+from ModrinthAPI.Async.utils.Session_Async import default_session_async
+
+
+def test_requests_without_a_session_share_the_loop_default(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+
+    async def main():
+        first = await default_session_async()
+        await Projects_Async.get("abc")
+        await Projects_Async.get("abc")
+        assert await default_session_async() is first
+        return first
+
+    client = asyncio.run(main())
+    # closed when asyncio.run shut the loop down
+    assert client._session is None
+    assert len(api.hits("/v2/project/abc")) == 2
+
+
+def test_each_loop_has_its_own_default_session():
+    async def main():
+        return await default_session_async()
+
+    assert asyncio.run(main()) is not asyncio.run(main())
+
+
+def test_default_session_can_be_closed_explicitly():
+    async def main():
+        client = await default_session_async()
+        client.session
+        await close_default_session_async()
+        return client, await default_session_async()
+
+    closed, replacement = asyncio.run(main())
+    assert closed._session is None and replacement is not closed
+
+
+def test_active_session_takes_precedence(api):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+
+    async def main():
+        async with SessionAsync() as client:
+            await Projects_Async.get("abc")
+            return client._session is not None
+
+    assert asyncio.run(main())
+
+
+def test_connector_is_tuned_from_the_session_options():
+    async def main():
+        async with SessionAsync(
+            limit=7, limit_per_host=3, keepalive_timeout=5, timeout=2
+        ) as client:
+            session = client.session
+            return session.connector, session.timeout.total
+
+    connector, timeout = asyncio.run(main())
+    assert (connector.limit, connector.limit_per_host, timeout) == (7, 3, 2)
+
+
+def test_requests_reuse_pooled_connections(api):
+    for id in ("abc", "def"):
+        api.routes[f"/v2/project/{id}"] = lambda query, id=id: (200, {"id": id})
+
+    async def main():
+        async with SessionAsync(limit_per_host=2):
+            for _ in range(3):
+                await asyncio.gather(
+                    Projects_Async.get("abc"), Projects_Async.get("def")
+                )
+
+    asyncio.run(main())
+    assert len(api.hits("/v2/project/abc")) == len(api.hits("/v2/project/def")) == 3
+    assert len(api.connections) <= 2
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async import Projects_Async
+from ModrinthAPI.utils.Single_Flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, "key", function) for _ in range(5)]
+        while flight.shared < 4:
+            time.sleep(0.01)
+        release.set()
+        assert [future.result() for future in futures] == ["result"] * 5
+    assert len(calls) == 1
+
+
+def test_exception_is_shared_and_the_key_released():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flight.do, "key", failing) for _ in range(3)]
+        while flight.shared < 2:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_async_calls_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def function():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("key", function) for _ in range(5))
+        )
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1 and flight.shared == 4
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def function():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("key", function))
+        second = asyncio.ensure_future(flight.do_async("key", function))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(main()) == ("result", True)
+
+
+def test_identical_requests_are_sent_once(api):
+    def slow(query):
+        time.sleep(0.2)
+        return 200, {"id": "abc"}
+
+    api.routes["/v2/project/abc"] = slow
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: Projects.get("abc"), range(5)))
+    assert results == [{"id": "abc"}] * 5
+    assert len(api.hits("/v2/project/abc")) == 1
+
+    async def main():
+        return await asyncio.gather(*(Projects_Async.get("abc") for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"id": "abc"}] * 5
+    assert len(api.hits("/v2/project/abc")) == 2
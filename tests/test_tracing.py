@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ModrinthAPI import Projects
+from ModrinthAPI.Async.utils.API_Request_Async import request_async
+from ModrinthAPI.utils import Tracing
+from ModrinthAPI.utils.Tracing import (
+    Span,
+    Tracer,
+    current_span,
+    propagate,
+    set_tracer,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    set_tracer(tracer)
+    return tracer
+
+
+def by_name(tracer: Tracer) -> dict[str, Span]:
+    return {span.name: span for span in tracer.spans}
+
+
+def test_spans_nest_and_restore_their_parent(tracer):
+    with tracer.span("outer", kind="test") as outer:
+        with tracer.span("inner") as inner:
+            assert current_span() is inner
+        assert current_span() is outer
+    assert current_span() is None
+    assert inner.parent is outer and outer.parent is None
+    assert outer.attributes == {"kind": "test"}
+    assert [span.name for span in tracer.spans] == ["inner", "outer"]
+    assert outer.duration >= inner.duration >= 0
+
+
+def test_errors_are_recorded(tracer):
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError("boom")
+    assert tracer.spans[0].attributes["error"] == "ValueError('boom')"
+
+
+def test_traced_functions_are_spans_only_while_tracing():
+    @traced("sync")
+    def sync():
+        return current_span()
+
+    @traced("async")
+    async def run_async():
+        return current_span()
+
+    assert sync() is None and asyncio.run(run_async()) is None
+    tracer = Tracer()
+    set_tracer(tracer)
+    assert sync().name == "sync"
+    assert asyncio.run(run_async()).name == "async"
+    assert len(tracer.spans) == 2
+
+
+def test_spans_on_worker_threads_keep_their_parent(tracer):
+    with tracer.span("batch") as batch:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            work = propagate(lambda index: tracer.span(f"item {index}").__enter__())
+            children = list(executor.map(work, range(2)))
+    assert all(child.parent is batch for child in children)
+
+
+def test_request_phases_are_derived_from_the_marks():
+    span = Span("GET /v2/search", "request", None, {})
+    span.start = 10.0
+    span.end = 10.5
+    span.marks = {
+        "dns_start": 10.0,
+        "dns_end": 10.05,
+        "connect_start": 10.0,
+        "connect_end": 10.15,
+        "headers_sent": 10.2,
+        "response_start": 10.4,
+    }
+    timings = span.timings()
+    assert timings["blocked"] == -1
+    # the connection started before the lookup, so the DNS time is taken out of it
+    assert timings["dns"] == pytest.approx(0.05)
+    assert timings["connect"] == pytest.approx(0.1)
+    assert timings["send"] == pytest.approx(0.05)
+    assert timings["wait"] == pytest.approx(0.2)
+    assert timings["receive"] == pytest.approx(0.1)
+
+
+def test_concurrent_spans_get_their_own_rows(tracer):
+    first = tracer.start("first")
+    # `second` is not started inside `first`, so it must not be drawn nested in it
+    Tracing._current_span.set(None)
+    second = tracer.start("second")
+    child = tracer.start("child")
+    time.sleep(0.001)
+    for span in (child, second, first):
+        tracer.finish(span)
+    events = {event["name"]: event for event in tracer.chrome_trace()["traceEvents"]}
+    assert events["first"]["tid"] != events["second"]["tid"]
+    assert events["child"]["tid"] == events["second"]["tid"]
+    assert events["child"]["dur"] <= events["second"]["dur"]
+
+
+def test_sync_requests_are_traced_and_exported(api, tracer, tmp_path):
+    api.routes["/v2/projects"] = lambda query: (
+        200,
+        [{"id": id} for id in json.loads(query["ids"][0])],
+    )
+    assert Projects.get_multiple(["a", "b"]) == [{"id": "a"}, {"id": "b"}]
+    spans = by_name(tracer)
+    request = spans["GET /v2/projects"]
+    assert request.parent is spans["request_chunked"]
+    assert request.attributes["status"] == 200
+    assert spans["decode"].attributes["size"] == request.attributes["size"]
+
+    tracer.write_har(str(tmp_path / "trace.har"))
+    (entry,) = json.loads((tmp_path / "trace.har").read_text())["log"]["entries"]
+    assert entry["request"]["url"] == f"{api.url}/v2/projects"
+    assert entry["response"]["status"] == 200
+    assert entry["response"]["content"]["size"] == request.attributes["size"]
+    assert entry["timings"]["wait"] >= 0 and entry["timings"]["dns"] == -1
+
+    tracer.write_chrome_trace(str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {"request_chunked", "GET /v2/projects", "decode"} <= {
+        event["name"] for event in events
+    }
+
+
+def test_async_requests_report_their_connection_phases(api, tracer):
+    api.routes["/v2/project/abc"] = lambda query: (200, {"id": "abc"})
+    url = f"{api.url}/v2/project/abc"
+    assert asyncio.run(request_async(url)) == ({"id": "abc"}, 200)
+    request = by_name(tracer)["GET /v2/project/{id}"]
+    assert {"connect_start", "connect_end", "headers_sent", "response_start"} <= set(
+        request.marks
+    )
+    timings = request.timings()
+    assert timings["connect"] >= 0 and timings["wait"] >= 0
+    (entry,) = tracer.har()["log"]["entries"]
+    assert entry["timings"]["connect"] >= 0
+    events = tracer.chrome_trace()["traceEvents"]
+    assert "wait" in {event["name"] for event in events}
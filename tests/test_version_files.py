@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from ModrinthAPI import Versions
+from ModrinthAPI.Async import Versions_Async
+from ModrinthAPI.utils.Hash_Store import HashStore, set_hash_store
+
+KNOWN = {f"{index:04x}": {"id": f"v{index}"} for index in range(0, 50, 2)}
+
+
+class VersionFiles:
+    # POST /version_files, answering the hashes in KNOWN and recording each request body
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.bodies = []
+
+    def __call__(self, body):
+        self.bodies.append(body)
+        if self.status != 200:
+            return self.status, {"error": "server_error"}
+        return 200, {
+            file_hash: KNOWN[file_hash]
+            for file_hash in body["hashes"]
+            if file_hash in KNOWN
+        }
+
+
+@pytest.fixture
+def store():
+    store = HashStore(":memory:")
+    set_hash_store(store)
+    yield store
+    set_hash_store(None)
+    store.close()
+
+
+def test_hashes_are_looked_up_in_chunks_and_returned_in_order(api):
+    route = api.routes["/v2/version_files"] = VersionFiles()
+    hashes = [f"{index:04x}" for index in range(50)][::-1]
+    versions = Versions.get_from_hashes(hashes, algorithm="sha512", chunk_size=10)
+    assert list(versions) == [file_hash for file_hash in hashes if file_hash in KNOWN]
+    assert versions["0002"] == {"id": "v2"}
+    assert len(route.bodies) == 5
+    assert all(body["algorithm"] == "sha512" for body in route.bodies)
+    assert sorted(h for body in route.bodies for h in body["hashes"]) == sorted(hashes)
+
+
+def test_store_answers_known_and_unknown_hashes(api, store):
+    route = api.routes["/v2/version_files"] = VersionFiles()
+    hashes = ["0000", "0001", "0002"]
+    assert Versions.get_from_hashes(hashes) == {
+        "0000": KNOWN["0000"],
+        "0002": KNOWN["0002"],
+    }
+    assert store.get_many(hashes) == {
+        "0000": KNOWN["0000"],
+        "0001": None,
+        "0002": KNOWN["0002"],
+    }
+    assert list(Versions.get_from_hashes(hashes + ["0004"])) == ["0000", "0002", "0004"]
+    # only the hash the store has never seen is sent
+    assert [body["hashes"] for body in route.bodies] == [hashes, ["0004"]]
+
+
+def test_failed_lookups_are_not_remembered_as_unknown(api, store):
+    api.routes["/v2/version_files"] = VersionFiles(status=500)
+    assert Versions.get_from_hashes(["0000", "0001"]) == {}
+    assert store.get_many(["0000", "0001"]) == {}
+
+
+def test_async_lookup_uses_the_store(api, store):
+    route = api.routes["/v2/version_files"] = VersionFiles()
+    hashes = [f"{index:04x}" for index in range(6)]
+
+    async def main():
+        first = await Versions_Async.get_from_hashes(hashes, chunk_size=2)
+        second = await Versions_Async.get_from_hashes(hashes, chunk_size=2)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second == {h: KNOWN[h] for h in ("0000", "0002", "0004")}
+    assert len(route.bodies) == 3
+
+
+class Updates:
+    # POST /version_files/update: hashes 0000-0009 have a newer version, 0010-0019 are up to date
+    def __init__(self):
+        self.bodies = []
+
+    def __call__(self, body):
+        self.bodies.append(body)
+        latest = {}
+        for file_hash in body["hashes"]:
+            index = int(file_hash, 16)
+            if index < 10:
+                latest[file_hash] = {"id": f"new{index}", "files": []}
+            elif index < 20:
+                files = [{"hashes": {body["algorithm"]: file_hash}}]
+                latest[file_hash] = {"id": f"v{index}", "files": files}
+        return 200, latest
+
+
+def test_latest_versions_are_checked_in_bulk(api):
+    route = api.routes["/v2/version_files/update"] = Updates()
+    hashes = [f"{index:04x}" for index in (25, 12, 3)]
+    latest = Versions.get_latest_from_hashes(
+        hashes, loaders=["fabric"], game_versions=["1.20.1"], chunk_size=2
+    )
+    assert list(latest) == ["000c", "0003"]
+    assert latest["0003"]["id"] == "new3"
+    assert len(route.bodies) == 2
+    assert all(body["loaders"] == ["fabric"] for body in route.bodies)
+    assert all(body["game_versions"] == ["1.20.1"] for body in route.bodies)
+
+
+def test_filters_are_only_sent_when_given(api):
+    route = api.routes["/v2/version_files/update"] = Updates()
+    Versions.get_latest_from_hashes(["0001"], algorithm="sha512")
+    assert route.bodies == [{"algorithm": "sha512", "hashes": ["0001"]}]
+
+
+def test_outdated_only_leaves_out_files_already_in_their_latest_version(api):
+    api.routes["/v2/version_files/update"] = Updates()
+    hashes = [f"{index:04x}" for index in range(5, 15)]
+    outdated = Versions.get_latest_from_hashes(hashes, outdated_only=True)
+    assert list(outdated) == hashes[:5]
+
+
+def test_failed_chunks_are_reported_and_skipped(api, capsys):
+    def flaky(body):
+        if "0001" in body["hashes"]:
+            return 400, {"error": "invalid_input"}
+        return Updates()(body)
+
+    api.routes["/v2/version_files/update"] = flaky
+    latest = Versions.get_latest_from_hashes(["0001", "0002"], chunk_size=1)
+    assert list(latest) == ["0002"]
+    assert "Error" in capsys.readouterr().out
+
+
+def test_async_latest_versions(api):
+    route = api.routes["/v2/version_files/update"] = Updates()
+    hashes = [f"{index:04x}" for index in range(20)]
+
+    async def main():
+        return await Versions_Async.get_latest_from_hashes(
+            hashes, chunk_size=5, outdated_only=True
+        )
+
+    assert list(asyncio.run(main())) == hashes[:10]
+    assert len(route.bodies) == 4